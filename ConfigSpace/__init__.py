@@ -30,8 +30,9 @@ from ConfigSpace.__version__ import __version__
 __authors__ = ["Matthias Feurer", "Katharina Eggensperger",
                "Jost Tobias Springenberg", "Marius Lindauer"]
 
-from ConfigSpace.configuration_space import Configuration, \
-    ConfigurationSpace
+from ConfigSpace.configuration_space import Configuration, ConfigurationSet, \
+    ConfigurationSpace, register_configuration_space, \
+    unregister_configuration_space
 from ConfigSpace.hyperparameters import CategoricalHyperparameter, \
     UniformFloatHyperparameter, UniformIntegerHyperparameter, Constant, \
     UnParametrizedHyperparameter, OrdinalHyperparameter
@@ -142,6 +142,30 @@ class AbstractCondition(ConditionComponent):
             raise ValueError("Parent vector id should not be None when calling evaluate vector")
         return self._evaluate_vector(instantiated_vector[self.parent_vector_id])
 
+    def evaluate_vectors(self, instantiated_vectors: np.ndarray) -> np.ndarray:
+        """Evaluate the condition for each row of a matrix of vectors.
+
+        Gives the same result as calling ``evaluate_vector()`` on each row,
+        but evaluates every distinct value of the parent only once.
+
+        Parameters
+        ----------
+        instantiated_vectors : np.ndarray
+            Matrix with one vector representation per row.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean array with one entry per row.
+        """
+        if self.parent_vector_id is None:
+            raise ValueError("Parent vector id should not be None when calling evaluate vector")
+        values = instantiated_vectors[:, self.parent_vector_id]
+        unique, inverse = np.unique(values, return_inverse=True)
+        outcomes = np.array([bool(self._evaluate_vector(value))
+                             for value in unique], dtype=bool)
+        return outcomes[inverse]
+
     @abstractmethod
     def _evaluate(self, instantiated_parent_hyperparameter: Union[str, int, float]) -> bool:
         pass
@@ -238,6 +262,15 @@ class AbstractConjunction(ConditionComponent):
 
         return self._evaluate(evaluations)
 
+    def evaluate_vectors(self, instantiated_vectors: np.ndarray) -> np.ndarray:
+        """Evaluate the conjunction for each row of a matrix of vectors,
+        see ``AbstractCondition.evaluate_vectors()``."""
+        # The outcomes of the components are boolean arrays, which
+        # _evaluate() combines element-wise
+        evaluations = [component.evaluate_vectors(instantiated_vectors)
+                       for component in self.components]
+        return self._evaluate(evaluations)
+
     @abstractmethod
     def _evaluate(self, evaluations: List[bool]) -> bool:
         pass
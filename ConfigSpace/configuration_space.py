@@ -26,22 +26,332 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from collections import defaultdict, deque, OrderedDict
+from collections import defaultdict, deque, namedtuple, OrderedDict
 import copy
+import hashlib
 from itertools import chain
+from operator import itemgetter
 
 import numpy as np
 import io
 
 import ConfigSpace.nx
-from ConfigSpace.hyperparameters import Hyperparameter, Constant, FloatHyperparameter
+from ConfigSpace.hyperparameters import Hyperparameter, Constant, \
+    UnParametrizedHyperparameter, FloatHyperparameter, IntegerHyperparameter, \
+    UniformFloatHyperparameter, NormalFloatHyperparameter, \
+    UniformIntegerHyperparameter, NormalIntegerHyperparameter, \
+    CategoricalHyperparameter, OrdinalHyperparameter
 from ConfigSpace.conditions import ConditionComponent, \
-    AbstractCondition, AbstractConjunction, EqualsCondition
-from ConfigSpace.forbidden import AbstractForbiddenComponent
-from typing import Union, List, Any, Dict, Iterable, Set, Tuple
+    AbstractCondition, AbstractConjunction, EqualsCondition, InCondition, \
+    AndConjunction
+from ConfigSpace.forbidden import AbstractForbiddenComponent, \
+    CompiledForbiddenClauses, ForbiddenEqualsClause, ForbiddenInClause, \
+    ForbiddenAndConjunction
+from typing import Union, List, Any, Dict, Iterable, Set, Tuple, Callable
 from ConfigSpace.exceptions import ForbiddenValueError
 
 
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+_MISSING = object()
+
+
+def _canonical_vector_bytes(vector: np.ndarray,
+                            decimals: Union[None, int] = None) -> bytes:
+    """Return a byte string which identifies a vector representation.
+
+    All NaNs are mapped to the same bit pattern and negative zeros to
+    positive zeros, such that vectors which are equal in the configuration
+    space also have the same byte representation. If decimals is given, the
+    vector is rounded first.
+    """
+    vector = np.asarray(vector, dtype=np.float64)
+    if decimals is not None:
+        # Faster than np.round() for short vectors
+        vector = np.rint(vector * 10.0 ** decimals)
+    vector = vector + 0.0
+    vector[np.isnan(vector)] = np.NaN
+    return vector.tobytes()
+
+
+class _LRUCache(object):
+    """Size-bounded mapping which evicts the least recently used entry."""
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 1:
+            raise ValueError("The size of a cache must be at least one, "
+                             "but is %d." % maxsize)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # type: OrderedDict[Any, Any]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Any, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize,
+                         len(self._data))
+
+
+class _ValueDecoder(object):
+    """Transform many vector representations to values at once.
+
+    The hyperparameters are grouped by their type and each group is
+    transformed with one numpy operation per step of the hyperparameters'
+    ``_transform()``, which yields exactly the same values. Values which
+    ``Configuration.__getitem__`` can not transform (for example inactive
+    hyperparameters) are omitted.
+    """
+
+    def __init__(self, configuration_space: 'ConfigurationSpace') -> None:
+        hyperparameters = configuration_space.get_hyperparameters()
+        self.names = [hp.name for hp in hyperparameters]
+
+        # Numerical hyperparameters, the integer hyperparameters are
+        # transformed by their float counterparts first
+        numerical = []  # type: List[Tuple[int, Hyperparameter, Hyperparameter]]
+        self.choices = []  # type: List[Tuple[int, List[Any]]]
+        self.constants = []  # type: List[Tuple[int, Any]]
+        self.others = []  # type: List[Tuple[int, Hyperparameter]]
+        for idx, hp in enumerate(hyperparameters):
+            if type(hp) in (UniformFloatHyperparameter,
+                            NormalFloatHyperparameter):
+                numerical.append((idx, hp, hp))
+            elif type(hp) is UniformIntegerHyperparameter:
+                numerical.append((idx, hp, hp.ufhp))
+            elif type(hp) is NormalIntegerHyperparameter:
+                numerical.append((idx, hp, hp.nfhp))
+            elif type(hp) is CategoricalHyperparameter:
+                self.choices.append((idx, list(hp.choices)))
+            elif type(hp) is OrdinalHyperparameter:
+                self.choices.append((idx, list(hp.sequence)))
+            elif type(hp) in (Constant, UnParametrizedHyperparameter):
+                self.constants.append((idx, hp.value))
+            else:
+                self.others.append((idx, hp))
+
+        # Values which the codes of decode_columns() refer to
+        self.categories = OrderedDict()  # type: OrderedDict[str, List[Any]]
+        categories = self.choices + [(idx, [value])
+                                     for idx, value in self.constants]
+        for idx, choices in sorted(categories, key=lambda t: t[0]):
+            self.categories[self.names[idx]] = choices
+
+        self.choices_idx = np.array([idx for idx, _ in self.choices],
+                                    dtype=int)
+        self.num_choices = np.array([len(choices)
+                                     for _, choices in self.choices])
+        self.constants_idx = np.array([idx for idx, _ in self.constants],
+                                      dtype=int)
+        self.numerical_idx = np.array([idx for idx, _, _ in numerical],
+                                      dtype=int)
+        floats = [float_hp for _, _, float_hp in numerical]
+        self.uniform = np.array([type(float_hp) is UniformFloatHyperparameter
+                                 for float_hp in floats], dtype=bool)
+        self.offset = np.array([float_hp._lower if uniform else 0.
+                                for float_hp, uniform
+                                in zip(floats, self.uniform)])
+        self.scale = np.array([float_hp._upper - float_hp._lower if uniform
+                               else 1. for float_hp, uniform
+                               in zip(floats, self.uniform)])
+        self.lower = np.array([float_hp.lower if uniform else -np.inf
+                               for float_hp, uniform
+                               in zip(floats, self.uniform)])
+        self.upper = np.array([float_hp.upper if uniform else np.inf
+                               for float_hp, uniform
+                               in zip(floats, self.uniform)])
+        self.log = np.array([float_hp.log for float_hp in floats], dtype=bool)
+        self.quantized = np.array([float_hp.q is not None
+                                   for float_hp in floats], dtype=bool)
+        self.q = np.array([float_hp.q for float_hp in floats
+                           if float_hp.q is not None])
+        self.integer = np.array([hp is not float_hp
+                                 for _, hp, float_hp in numerical], dtype=bool)
+        # UniformIntegerHyperparameter quantizes twice
+        self.integer_quantized = np.array([
+            type(hp) is UniformIntegerHyperparameter and hp.q is not None
+            for _, hp, _ in numerical], dtype=bool)
+        self.integer_q = np.array([hp.q for _, hp, _ in numerical
+                                   if type(hp) is UniformIntegerHyperparameter
+                                   and hp.q is not None], dtype=int)
+
+    def _transform_numerical(self, vectors: np.ndarray) \
+            -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Returns the float values of all numerical hyperparameters, the
+        # integer values of the integer hyperparameters and which vector
+        # values are finite. Values which are not finite are transformed as
+        # if they were zero.
+        matrix = vectors[:, self.numerical_idx]
+        finite = np.isfinite(matrix)
+        matrix[~finite] = 0
+        uniform = self.uniform
+        matrix[:, uniform] = matrix[:, uniform] * self.scale[uniform] + \
+            self.offset[uniform]
+        matrix[:, self.log] = np.exp(matrix[:, self.log])
+        matrix[:, self.quantized] = np.round(
+            matrix[:, self.quantized] / self.q, 0) * self.q
+        matrix[:, uniform] = np.maximum(
+            self.lower[uniform],
+            np.minimum(self.upper[uniform], matrix[:, uniform]))
+
+        integers = np.round(matrix[:, self.integer], 0).astype(int)
+        if np.any(self.integer_quantized):
+            quantized = self.integer_quantized[self.integer]
+            integers[:, quantized] = np.round(
+                matrix[:, self.integer][:, quantized] /
+                self.integer_q, 0).astype(int) * self.integer_q
+        return matrix, integers, finite
+
+    def decode(self, vectors: np.ndarray) -> List[Dict[str, Any]]:
+        """Return the values of each row of a matrix of vectors."""
+        vectors = np.asarray(vectors, dtype=np.float64)
+        num_vectors = vectors.shape[0]
+        # For each hyperparameter a list of values, _MISSING marks the values
+        # which are omitted
+        columns = [None] * len(self.names)  # type: List[List[Any]]
+
+        if len(self.numerical_idx) > 0:
+            matrix, integers, finite = self._transform_numerical(vectors)
+            floats = iter(matrix[:, ~self.integer].T.tolist())
+            integers = iter(integers.T.tolist())
+            for idx, integer, column_finite in zip(
+                    self.numerical_idx, self.integer, finite.T.tolist()):
+                values = next(integers) if integer else next(floats)
+                columns[idx] = [value if is_finite else _MISSING
+                                for value, is_finite
+                                in zip(values, column_finite)]
+
+        if self.choices:
+            matrix = vectors[:, self.choices_idx]
+            with np.errstate(invalid='ignore'):
+                # Also excludes NaN and infinite values, much faster than
+                # checking np.mod() on matrices with many NaNs
+                legal = (np.floor(matrix) == matrix) & \
+                    (matrix >= -self.num_choices) & (matrix < self.num_choices)
+            codes = np.where(legal, matrix, 0).astype(int).T.tolist()
+            for (idx, choices), column_codes, column_legal in zip(
+                    self.choices, codes, legal.T.tolist()):
+                columns[idx] = [choices[code] if is_legal else _MISSING
+                                for code, is_legal
+                                in zip(column_codes, column_legal)]
+
+        if self.constants:
+            finite = np.isfinite(vectors[:, self.constants_idx]).T.tolist()
+            for (idx, value), column_finite in zip(self.constants, finite):
+                columns[idx] = [value if is_finite else _MISSING
+                                for is_finite in column_finite]
+
+        for idx, hp in self.others:
+            column = []
+            for vector_value in vectors[:, idx]:
+                value = _MISSING
+                if np.isfinite(vector_value):
+                    try:
+                        value = hp._transform(vector_value)
+                        if isinstance(hp, FloatHyperparameter):
+                            value = float(value)
+                    except Exception:
+                        value = _MISSING
+                column.append(value)
+            columns[idx] = column
+
+        named_columns = list(zip(self.names, columns))
+        return [{name: column[i] for name, column in named_columns
+                 if column[i] is not _MISSING} for i in range(num_vectors)]
+
+    def decode_columns(self, vectors: np.ndarray) \
+            -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """Return the values of each hyperparameter in all rows of a matrix
+        of vectors as one array, together with a mask of the values which
+        ``decode()`` omits. Categorical, ordinal and constant hyperparameters
+        are returned as codes into ``self.categories``."""
+        vectors = np.asarray(vectors, dtype=np.float64)
+        num_vectors = vectors.shape[0]
+        columns = [None] * len(self.names)  # type: List[np.ndarray]
+        masks = [None] * len(self.names)  # type: List[np.ndarray]
+
+        if len(self.numerical_idx) > 0:
+            matrix, integers, finite = self._transform_numerical(vectors)
+            matrix[~finite] = np.nan
+            for idx, column, mask in zip(self.numerical_idx[~self.integer],
+                                         matrix[:, ~self.integer].T,
+                                         ~finite[:, ~self.integer].T):
+                columns[idx] = column.copy()
+                masks[idx] = mask
+            integers[~finite[:, self.integer]] = 0
+            for idx, column, mask in zip(self.numerical_idx[self.integer],
+                                         integers.T,
+                                         ~finite[:, self.integer].T):
+                columns[idx] = column.astype(np.int64)
+                masks[idx] = mask
+
+        if self.choices:
+            matrix = vectors[:, self.choices_idx]
+            with np.errstate(invalid='ignore'):
+                legal = (np.floor(matrix) == matrix) & \
+                    (matrix >= -self.num_choices) & (matrix < self.num_choices)
+            # Negative codes count from the end, just like in decode()
+            codes = np.where(legal, matrix, 0).astype(np.int64) % \
+                self.num_choices
+            for (idx, _), column, mask in zip(self.choices, codes.T,
+                                              ~legal.T):
+                columns[idx] = column.copy()
+                masks[idx] = mask
+
+        if self.constants:
+            finite = np.isfinite(vectors[:, self.constants_idx])
+            for (idx, _), mask in zip(self.constants, ~finite.T):
+                columns[idx] = np.zeros(num_vectors, dtype=np.int64)
+                masks[idx] = mask
+
+        for idx, hp in self.others:
+            column = []
+            for vector_value in vectors[:, idx]:
+                value = _MISSING
+                if np.isfinite(vector_value):
+                    try:
+                        value = hp._transform(vector_value)
+                    except Exception:
+                        value = _MISSING
+                column.append(value)
+            masks[idx] = np.array([value is _MISSING for value in column],
+                                  dtype=bool)
+            if isinstance(hp, FloatHyperparameter):
+                columns[idx] = np.array([np.nan if value is _MISSING
+                                         else value for value in column],
+                                        dtype=np.float64)
+            elif isinstance(hp, IntegerHyperparameter):
+                columns[idx] = np.array([0 if value is _MISSING else value
+                                         for value in column],
+                                        dtype=np.int64)
+            else:
+                columns[idx] = np.array([None if value is _MISSING
+                                         else value for value in column],
+                                        dtype=object)
+
+        return columns, masks
+
+
 class ConfigurationSpace(object):
     # TODO add comments to both the configuration space and single
     # hyperparameters!
@@ -51,7 +361,8 @@ class ConfigurationSpace(object):
     """Represent a configuration space.
     """
 
-    def __init__(self, seed: Union[int, None] = None) -> None:
+    def __init__(self, seed: Union[int, None] = None,
+                 validation_cache_size: int = 0) -> None:
         self._hyperparameters = OrderedDict()  # type: OrderedDict[str, Hyperparameter]
         self._hyperparameter_idx = dict()  # type: Dict[str, int]
         self._idx_to_hyperparameter = dict()  # type: Dict[int, str]
@@ -69,6 +380,9 @@ class ConfigurationSpace(object):
         #  no guarantee that the parent of a condition was evaluated before
         self._conditionals = set()   # type: Set[str]
         self.forbidden_clauses = []  # type: List['AbstractForbiddenComponent']
+        # Inverted index from the index of a hyperparameter to the positions
+        # of the forbidden clauses (in forbidden_clauses) which involve it
+        self._forbidden_clauses_of_idx = dict()  # type: Dict[int, List[int]]
         self.random = np.random.RandomState(seed)
 
         self._children['__HPOlib_configuration_space_root__'] = OrderedDict()
@@ -79,6 +393,243 @@ class ConfigurationSpace(object):
         self._parents_of = dict()
         self._children_of = dict()
 
+        # Transitive descendants of each hyperparameter, they are (re-)built
+        # lazily by _build_index_tables() after the configuration space changed
+        self._descendants_idx = None  # type: Union[None, List[np.ndarray]]
+        # Vector values of the defaults of all hyperparameters, also built by
+        # _build_index_tables()
+        self._default_vector = None  # type: Union[None, np.ndarray]
+        # Parents and conditions of each hyperparameter, also built by
+        # _build_index_tables()
+        self._activation = None  # type: Union[None, List[Union[None, Tuple[np.ndarray, List[ConditionComponent]]]]]
+        # Lookup table for forbidden clauses over categorical hyperparameters,
+        # built lazily by _get_compiled_forbidden_clauses()
+        self._compiled_forbidden_clauses = None  # type: Union[None, CompiledForbiddenClauses]
+        # Names of the hyperparameters in their sorted order, shared by all
+        # configurations, see _get_hyperparameter_names()
+        self._hyperparameter_names = None  # type: Union[None, List[str]]
+        # Content digest, see get_fingerprint()
+        self._fingerprint = None  # type: Union[None, str]
+        # Built lazily by get_dictionaries()
+        self._value_decoder = None  # type: Union[None, _ValueDecoder]
+
+        # Outcomes of checking vectors, see set_validation_cache_size()
+        self._validation_cache = None  # type: Union[None, _LRUCache]
+        self.set_validation_cache_size(validation_cache_size)
+
+    def set_validation_cache_size(self, size: int) -> None:
+        """Cache the outcome of validating configuration vectors.
+
+        Repeatedly checking the same configuration (for example an incumbent
+        and its neighbors) only costs a dictionary lookup once its outcome
+        is cached. The cache is emptied whenever the configuration space is
+        modified.
+
+        Parameters
+        ----------
+        size : int
+            Maximal number of vectors for which the outcome is stored. The
+            least recently used outcomes are evicted first. A size of zero
+            disables the cache.
+        """
+        if size > 0:
+            self._validation_cache = _LRUCache(size)
+        else:
+            self._validation_cache = None
+
+    def get_validation_cache_info(self) -> Union[None, CacheInfo]:
+        """Return hits, misses, maximal size and current size of the
+        validation cache, or None if the cache is disabled."""
+        if self._validation_cache is None:
+            return None
+        return self._validation_cache.info()
+
+    def _invalidate_caches(self) -> None:
+        self._descendants_idx = None
+        self._default_vector = None
+        self._activation = None
+        self._compiled_forbidden_clauses = None
+        self._hyperparameter_names = None
+        self._fingerprint = None
+        self._value_decoder = None
+        if self._validation_cache is not None:
+            self._validation_cache.clear()
+
+    def _build_index_tables(self) -> None:
+        num_hyperparameters = len(self._hyperparameters)
+
+        # Hyperparameters are sorted topologically, visiting them in reverse
+        # order makes sure that the descendants of all children are known
+        descendants = [None] * num_hyperparameters  # type: List[np.ndarray]
+        for hp_name in reversed(self._hyperparameters):
+            hp_descendants = set()  # type: Set[int]
+            for child in self._children_of[hp_name]:
+                child_idx = self._hyperparameter_idx[child.name]
+                hp_descendants.add(child_idx)
+                hp_descendants.update(descendants[child_idx])
+            descendants[self._hyperparameter_idx[hp_name]] = np.array(
+                sorted(hp_descendants), dtype=int)
+        self._descendants_idx = descendants
+
+        self._default_vector = np.array(
+            [hp._inverse_transform(hp.default)
+             for hp in self._hyperparameters.values()], dtype=np.float64)
+
+        # For each conditional hyperparameter the indices of its parents and
+        # its distinct parent conditions (a conjunction is listed once per
+        # parent in _parent_conditions_of)
+        activation = [None] * num_hyperparameters  # type: List[Union[None, Tuple[List[int], List[ConditionComponent]]]]
+        for hp_name in self._conditionals:
+            conditions = []  # type: List[ConditionComponent]
+            for condition in self._parent_conditions_of[hp_name]:
+                if not any(condition is other for other in conditions):
+                    conditions.append(condition)
+            parents_idx = sorted(set(
+                self._hyperparameter_idx[parent.name]
+                for parent in self._parents_of[hp_name]))
+            activation[self._hyperparameter_idx[hp_name]] = \
+                (parents_idx, conditions)
+        self._activation = activation
+
+    def get_fingerprint(self) -> str:
+        """Return a digest of the hyperparameters, conditions and forbidden
+        clauses of the configuration space.
+
+        Two configuration spaces with the same content have the same
+        fingerprint, also across processes and Python versions. It is
+        computed once and recomputed after the configuration space was
+        modified.
+
+        Returns
+        -------
+        str
+            Hexadecimal SHA-256 digest.
+        """
+        if self._fingerprint is None:
+            description = io.StringIO()
+            description.write(self.__repr__())
+            # The representation of the choices of categorical and ordinal
+            # hyperparameters does not show their type
+            for hp_name in sorted(self._hyperparameters):
+                hyperparameter = self._hyperparameters[hp_name]
+                if isinstance(hyperparameter, CategoricalHyperparameter):
+                    description.write("%s: %s\n" % (
+                        hp_name, repr(hyperparameter.choices)))
+                elif isinstance(hyperparameter, OrdinalHyperparameter):
+                    description.write("%s: %s\n" % (
+                        hp_name, repr(hyperparameter.sequence)))
+            self._fingerprint = hashlib.sha256(
+                description.getvalue().encode('utf-8')).hexdigest()
+        return self._fingerprint
+
+    def get_dictionaries(self, vectors: np.ndarray) \
+            -> List[Dict[str, Union[str, float, int]]]:
+        """Convert vector representations to dictionaries of values.
+
+        Gives the same result as calling ``get_dictionary()`` on a
+        configuration of each vector, but transforms all vectors at once.
+
+        Parameters
+        ----------
+        vectors : np.ndarray
+            Matrix with one vector representation per row.
+
+        Returns
+        -------
+        list
+            One dictionary per row, which omits inactive hyperparameters.
+        """
+        if self._value_decoder is None:
+            self._value_decoder = _ValueDecoder(self)
+        return self._value_decoder.decode(vectors)
+
+    def to_columns(self, configurations: Union[Iterable['Configuration'], np.ndarray],
+                   structured: bool = False) \
+            -> Tuple[Union[Dict[str, np.ndarray], np.ma.MaskedArray],
+                     Dict[str, List[Any]]]:
+        """Convert configurations to one array of values per hyperparameter.
+
+        Parameters
+        ----------
+        configurations : iterable or np.ndarray
+            Configurations of this configuration space (for example a list or
+            a :class:`~ConfigSpace.configuration_space.ConfigurationSet`) or a
+            matrix with one vector representation per row.
+
+        structured : bool (default=False)
+            Return a single structured array with one field per
+            hyperparameter instead of a dictionary of arrays.
+
+        Returns
+        -------
+        columns : OrderedDict or np.ma.MaskedArray
+            For each hyperparameter (in the order of the configuration space)
+            the values in all configurations. Float hyperparameters are
+            float arrays which are NaN where the hyperparameter is inactive.
+            Integer hyperparameters are masked integer arrays and
+            categorical, ordinal and constant hyperparameters are masked
+            arrays of integer codes into ``categories``, where inactive
+            values are masked. If ``structured`` is True, these arrays are the
+            fields of a masked structured array.
+
+        categories : OrderedDict
+            The choices, the sequence or the value which the codes of each
+            categorical, ordinal and constant hyperparameter refer to.
+        """
+        if isinstance(configurations, np.ndarray):
+            vectors = configurations
+        elif isinstance(configurations, ConfigurationSet):
+            vectors = configurations.get_array()
+        else:
+            vectors = np.array([configuration.get_array()
+                                for configuration in configurations],
+                               dtype=np.float64)
+            vectors = vectors.reshape((-1, len(self._hyperparameters)))
+
+        if self._value_decoder is None:
+            self._value_decoder = _ValueDecoder(self)
+        values, masks = self._value_decoder.decode_columns(vectors)
+        names = self._value_decoder.names
+        categories = self._value_decoder.categories.copy()
+
+        if structured:
+            dtype = np.dtype([(name, column.dtype)
+                              for name, column in zip(names, values)])
+            data = np.empty(vectors.shape[0], dtype=dtype)
+            mask = np.empty(vectors.shape[0],
+                            dtype=np.ma.make_mask_descr(dtype))
+            for name, column, column_mask in zip(names, values, masks):
+                data[name] = column
+                mask[name] = column_mask
+            return np.ma.MaskedArray(data, mask=mask), categories
+
+        columns = OrderedDict()  # type: OrderedDict[str, np.ndarray]
+        for name, column, column_mask in zip(names, values, masks):
+            if column.dtype == np.float64:
+                columns[name] = column
+            else:
+                columns[name] = np.ma.MaskedArray(column, mask=column_mask)
+        return columns, categories
+
+    def _get_hyperparameter_names(self) -> List[str]:
+        if self._hyperparameter_names is None:
+            self._hyperparameter_names = list(self._hyperparameters.keys())
+        return self._hyperparameter_names
+
+    def _get_compiled_forbidden_clauses(self) -> CompiledForbiddenClauses:
+        if self._compiled_forbidden_clauses is None:
+            self._compiled_forbidden_clauses = CompiledForbiddenClauses(
+                self.forbidden_clauses)
+        return self._compiled_forbidden_clauses
+
+    def _index_forbidden_clause(self, position: int,
+                                clause: AbstractForbiddenComponent) -> None:
+        vector_ids = set(dlc.vector_id for dlc in
+                         clause.get_descendant_literal_clauses())
+        for vector_id in vector_ids:
+            self._forbidden_clauses_of_idx.setdefault(vector_id, []).append(
+                position)
+
     def generate_all_continuous_from_bounds(self, bounds: List[List[Any]]) -> None:
         for i, (l, u) in enumerate(bounds):
             hp = ConfigSpace.UniformFloatHyperparameter('x%d' % i, l, u)
@@ -358,8 +909,12 @@ class ConfigurationSpace(object):
             condition.set_vector_idx(self._hyperparameter_idx)
 
         # forbidden clauses
-        for clause in self.forbidden_clauses:
+        self._forbidden_clauses_of_idx = dict()
+        for position, clause in enumerate(self.forbidden_clauses):
             clause.set_vector_idx(self._hyperparameter_idx)
+            self._index_forbidden_clause(position, clause)
+
+        self._invalidate_caches()
 
     def _update_cache(self):
         self._parent_conditions_of = dict()
@@ -368,10 +923,18 @@ class ConfigurationSpace(object):
         self._children_of = dict()
 
         for hp_name in self._hyperparameters:
-            self._parent_conditions_of[hp_name] = self._get_parent_conditions_of(hp_name)
-            self._child_conditions_of[hp_name] = self._get_child_conditions_of(hp_name)
-            self._parents_of[hp_name] = self.get_parents_of(hp_name)
-            self._children_of[hp_name] = self.get_children_of(hp_name)
+            parent_conditions = self._get_parent_conditions_of(hp_name)
+            child_conditions = self._get_child_conditions_of(hp_name)
+            self._parent_conditions_of[hp_name] = parent_conditions
+            self._child_conditions_of[hp_name] = child_conditions
+            self._parents_of[hp_name] = [
+                parent for condition in parent_conditions
+                for parent in condition.get_parents()]
+            self._children_of[hp_name] = [
+                child for condition in child_conditions
+                for child in condition.get_children()]
+
+        self._invalidate_caches()
 
     def _create_tmp_dag(self) -> ConfigSpace.nx.DiGraph:
         tmp_dag = ConfigSpace.nx.DiGraph()
@@ -400,6 +963,8 @@ class ConfigurationSpace(object):
                             "ConfigSpace.forbidden.AbstractForbiddenComponent.")
         clause.set_vector_idx(self._hyperparameter_idx)
         self.forbidden_clauses.append(clause)
+        self._index_forbidden_clause(len(self.forbidden_clauses) - 1, clause)
+        self._invalidate_caches()
         self._check_default_configuration()
         return clause
 
@@ -411,9 +976,222 @@ class ConfigurationSpace(object):
                                 "ConfigSpace.forbidden.AbstractForbiddenComponent." %
                                 str(clause))
             self.forbidden_clauses.append(clause)
+            self._index_forbidden_clause(len(self.forbidden_clauses) - 1,
+                                         clause)
+        self._invalidate_caches()
         self._check_default_configuration()
         return clauses
 
+    def optimize_forbiddens(self, allow_inactive_with_values: bool = False) \
+            -> Dict[str, int]:
+        """Simplify the forbidden clauses without changing which
+        configurations are forbidden.
+
+        * Literals on the same hyperparameter inside a conjunction are merged.
+        * Duplicate clauses are removed.
+        * Clauses which can never be violated because a conjunction requires
+          two different values of a hyperparameter are removed.
+        * Clauses which can never be violated because the hyperparameters
+          they involve are never active together are removed. This is the
+          case if the ``EqualsCondition`` and ``InCondition`` which activate
+          them require two different values of a hyperparameter. The rule
+          assumes that inactive hyperparameters have no value, and is
+          skipped if ``allow_inactive_with_values`` is set.
+        * Clauses which are subsumed by a more general clause are removed.
+        * Clauses which only differ in the values of a single hyperparameter
+          are merged into a single clause using a ``ForbiddenInClause``.
+
+        Parameters
+        ----------
+        allow_inactive_with_values : bool, optional
+            Whether configurations with values for inactive hyperparameters
+            (see :class:`Configuration`) are checked against the forbidden
+            clauses. If set, clauses on hyperparameters which are never
+            active together are kept. Default: False.
+
+        Returns
+        -------
+        dict
+            Number of clauses and literal clauses (the clauses which are
+            evaluated when checking a configuration) before and after the
+            simplification, and the number of clauses removed or merged by
+            each rule. ``'unsatisfiable'`` counts the clauses which require
+            two different values of a hyperparameter, ``'inactive'`` the
+            clauses whose hyperparameters are never active together (always
+            0 if ``allow_inactive_with_values`` is set).
+        """
+        report = OrderedDict([
+            ('clauses_before', len(self.forbidden_clauses)),
+            ('clauses_after', 0),
+            ('literals_before', 0),
+            ('literals_after', 0),
+            ('duplicates', 0),
+            ('unsatisfiable', 0),
+            ('inactive', 0),
+            ('subsumed', 0),
+            ('merged', 0),
+        ])
+        requirements = self._get_activation_requirements()
+
+        # Each clause is represented as a mapping from hyperparameter names to
+        # the set of forbidden values, together with the original clause if
+        # it can be kept as it is
+        clauses = []  # type: List[Tuple[Dict[str, frozenset], Union[None, AbstractForbiddenComponent]]]
+        seen = set()  # type: Set[frozenset]
+        for clause in self.forbidden_clauses:
+            dlcs = clause.get_descendant_literal_clauses()
+            report['literals_before'] += len(dlcs)
+            literals = dict()  # type: Dict[str, frozenset]
+            for dlc in dlcs:
+                name = dlc.hyperparameter.name
+                if isinstance(dlc, ForbiddenEqualsClause):
+                    values = frozenset([dlc.value])
+                else:
+                    values = frozenset(dlc.values)
+                literals[name] = literals.get(name, values) & values
+            if len(literals) < len(dlcs):
+                clause = None
+
+            if not all(literals.values()):
+                report['unsatisfiable'] += 1
+                continue
+            if not allow_inactive_with_values:
+                # Values which are required by the activation of the
+                # hyperparameters the clause involves
+                required = dict(literals)
+                for name in literals:
+                    for parent, values in requirements[name].items():
+                        required[parent] = required.get(parent, values) & \
+                            values
+                if not all(required.values()):
+                    report['inactive'] += 1
+                    continue
+
+            key = frozenset(literals.items())
+            if key in seen:
+                report['duplicates'] += 1
+                continue
+            seen.add(key)
+            clauses.append((literals, clause))
+
+        changed = True
+        while changed:
+            changed = False
+
+            # Remove clauses which are subsumed by a clause which involves a
+            # subset of the hyperparameters and forbids a superset of values
+            kept = []  # type: List[Tuple[Dict[str, frozenset], Union[None, AbstractForbiddenComponent]]]
+            for i, (literals, clause) in enumerate(clauses):
+                for j, (other, _) in enumerate(clauses):
+                    if i == j or len(other) > len(literals):
+                        continue
+                    if all(name in literals and literals[name] <= values
+                           for name, values in other.items()):
+                        # Of two identical clauses, only remove the later one
+                        if other == literals and j > i:
+                            continue
+                        report['subsumed'] += 1
+                        break
+                else:
+                    kept.append((literals, clause))
+            clauses = kept
+
+            # Merge clauses which only differ in the values of one
+            # hyperparameter, they share the values of all others
+            merged = dict()  # type: Dict[Tuple[str, frozenset], int]
+            kept = []
+            for literals, clause in clauses:
+                for name in literals:
+                    others = frozenset(item for item in literals.items()
+                                       if item[0] != name)
+                    i = merged.get((name, others))
+                    # The clause may have changed since it was registered
+                    if i is not None and len(kept[i][0]) == len(literals) \
+                            and others <= frozenset(kept[i][0].items()):
+                        merged_literals = dict(others)
+                        merged_literals[name] = kept[i][0][name] | \
+                            literals[name]
+                        kept[i] = (merged_literals, None)
+                        report['merged'] += 1
+                        changed = True
+                        break
+                else:
+                    for name in literals:
+                        others = frozenset(item for item in literals.items()
+                                           if item[0] != name)
+                        merged[name, others] = len(kept)
+                    kept.append((literals, clause))
+            clauses = kept
+
+        forbidden_clauses = []  # type: List[AbstractForbiddenComponent]
+        for literals, clause in clauses:
+            report['literals_after'] += len(literals)
+            if clause is None:
+                clause = self._create_forbidden_clause(literals)
+            forbidden_clauses.append(clause)
+        report['clauses_after'] = len(forbidden_clauses)
+
+        self.forbidden_clauses = forbidden_clauses
+        self._forbidden_clauses_of_idx = dict()
+        for position, clause in enumerate(self.forbidden_clauses):
+            clause.set_vector_idx(self._hyperparameter_idx)
+            self._index_forbidden_clause(position, clause)
+        self._invalidate_caches()
+        return report
+
+    def _get_activation_requirements(self) -> Dict[str, Dict[str, frozenset]]:
+        # For each hyperparameter, the values its ancestors must take for it
+        # to be active. Only EqualsCondition and InCondition restrict the
+        # values, and nothing is required by an OrConjunction
+        def get_required_conditions(condition):
+            if isinstance(condition, AbstractCondition):
+                return [condition]
+            elif isinstance(condition, AndConjunction):
+                return [dlc for component in condition.components
+                        for dlc in get_required_conditions(component)]
+            return []
+
+        requirements = dict()  # type: Dict[str, Dict[str, frozenset]]
+        # Parents are visited before their children
+        for hp_name in self._hyperparameters:
+            required = dict()  # type: Dict[str, frozenset]
+            for condition in self._parent_conditions_of[hp_name]:
+                for dlc in get_required_conditions(condition):
+                    parent = dlc.parent.name
+                    parent_requirements = list(requirements[parent].items())
+                    if isinstance(dlc, EqualsCondition):
+                        parent_requirements.append(
+                            (parent, frozenset([dlc.value])))
+                    elif isinstance(dlc, InCondition):
+                        parent_requirements.append(
+                            (parent, frozenset(dlc.values)))
+                    for name, values in parent_requirements:
+                        required[name] = required.get(name, values) & values
+            requirements[hp_name] = required
+        return requirements
+
+    def _create_forbidden_clause(self, literals: Dict[str, frozenset]) \
+            -> AbstractForbiddenComponent:
+        components = []
+        for name in sorted(literals, key=self._hyperparameter_idx.get):
+            hyperparameter = self._hyperparameters[name]
+            if isinstance(hyperparameter, CategoricalHyperparameter):
+                values = [value for value in hyperparameter.choices
+                          if value in literals[name]]
+            elif isinstance(hyperparameter, OrdinalHyperparameter):
+                values = [value for value in hyperparameter.sequence
+                          if value in literals[name]]
+            else:
+                values = sorted(literals[name])
+            if len(values) == 1:
+                components.append(ForbiddenEqualsClause(hyperparameter,
+                                                        values[0]))
+            else:
+                components.append(ForbiddenInClause(hyperparameter, values))
+        if len(components) == 1:
+            return components[0]
+        return ForbiddenAndConjunction(*components)
+
     def add_configuration_space(self, prefix: str, configuration_space: 'ConfigurationSpace',
                                 delimiter: str=":", parent_hyperparameter: Hyperparameter=None) -> 'ConfigurationSpace':
         if not isinstance(configuration_space, ConfigurationSpace):
@@ -674,6 +1452,31 @@ class ConfigurationSpace(object):
 
     def _check_configuration(self, vector: np.ndarray,
                              allow_inactive_with_values: bool = False) -> None:
+        if self._validation_cache is None:
+            self._check_configuration_vector(vector, allow_inactive_with_values)
+        else:
+            self._check_cached(self._check_configuration_vector, vector,
+                               allow_inactive_with_values)
+
+    def _check_cached(self, check: Callable[[np.ndarray, bool], None],
+                      vector: np.ndarray,
+                      allow_inactive_with_values: bool) -> None:
+        key = (check.__name__, allow_inactive_with_values,
+               _canonical_vector_bytes(vector))
+        outcome = self._validation_cache.get(key, _MISSING)
+        if outcome is _MISSING:
+            try:
+                check(vector, allow_inactive_with_values)
+                outcome = None
+            except ValueError as e:
+                outcome = e
+            self._validation_cache.put(key, outcome)
+        if outcome is not None:
+            # Raise a fresh exception to not accumulate tracebacks
+            raise outcome.__class__(*outcome.args)
+
+    def _check_configuration_vector(self, vector: np.ndarray,
+                                    allow_inactive_with_values: bool = False) -> None:
         unconditional_hyperparameters = self.get_all_unconditional_hyperparameters()
         to_visit = deque()
         to_visit.extendleft(unconditional_hyperparameters)
@@ -753,7 +1556,15 @@ class ConfigurationSpace(object):
     def _check_configuration_rigorous(self, configuration: 'Configuration',
                                       allow_inactive_with_values: bool = False) -> None:
         vector = configuration.get_array()
+        if self._validation_cache is None:
+            self._check_configuration_vector_rigorous(
+                vector, allow_inactive_with_values)
+        else:
+            self._check_cached(self._check_configuration_vector_rigorous,
+                               vector, allow_inactive_with_values)
 
+    def _check_configuration_vector_rigorous(self, vector: np.ndarray,
+                                             allow_inactive_with_values: bool = False) -> None:
         for hp_name, hyperparameter in self._hyperparameters.items():
             hp_value = vector[self._hyperparameter_idx[hp_name]]
 
@@ -794,20 +1605,368 @@ class ConfigurationSpace(object):
                                  (hp_name, hp_value))
         self._check_forbidden(vector)
 
-    def _check_forbidden(self, vector: np.ndarray) -> None:
-        for clause in self.forbidden_clauses:
+    def check_configuration_delta(self, old_vector: np.ndarray,
+                                  new_vector: np.ndarray, changed_idx: int,
+                                  allow_inactive_with_values: bool = False) -> None:
+        """Check a vector which was obtained by changing a single value of a
+        legal vector.
+
+        Changing a hyperparameter can only (de-)activate its descendants and
+        only violate the forbidden clauses which involve it or one of the
+        descendants whose value changed. Only these hyperparameters and
+        clauses are checked, which is much cheaper than checking the whole
+        configuration with ``_check_configuration``.
+
+        Parameters
+        ----------
+        old_vector : np.ndarray
+            Vector representation of a legal configuration.
+
+        new_vector : np.ndarray
+            Vector representation of the configuration to check. It must only
+            differ from ``old_vector`` in the hyperparameter ``changed_idx``
+            and in its descendants.
+
+        changed_idx : int
+            Index of the hyperparameter whose value was changed.
+
+        allow_inactive_with_values : bool (default=False)
+            Whether an Exception will be raised if a value for an inactive
+            hyperparameter is given.
+        """
+        if self._descendants_idx is None:
+            self._build_index_tables()
+
+        to_check = [changed_idx]
+        to_check.extend(self._descendants_idx[changed_idx].tolist())
+        active = dict()  # type: Dict[int, bool]
+        touched = set()  # type: Set[int]
+
+        for hp_idx in to_check:
+            hp_name = self._idx_to_hyperparameter[hp_idx]
+            hyperparameter = self._hyperparameters[hp_name]
+            hp_value = new_vector[hp_idx]
+            old_value = old_vector[hp_idx]
+            if hp_value != old_value and \
+                    not (hp_value != hp_value and old_value != old_value):
+                touched.add(hp_idx)
+
+            if not np.isnan(hp_value) and not hyperparameter.is_legal_vector(hp_value):
+                raise ValueError("Hyperparameter instantiation '%s' "
+                                 "(type: %s) is illegal for hyperparameter %s" %
+                                 (hp_value, str(type(hp_value)),
+                                  hyperparameter))
+
+            # A hyperparameter is active if its conditions are fulfilled and
+            # at least one of its parents is active (parents which are
+            # not checked here did not change and are active if they have a
+            # value)
+            hp_active = True
+            conditions = self._parent_conditions_of[hp_name]
+            if conditions:
+                hp_active = False
+                for parent in self._parents_of[hp_name]:
+                    parent_idx = self._hyperparameter_idx[parent.name]
+                    parent_active = active.get(parent_idx)
+                    if parent_active is None:
+                        parent_active = new_vector[parent_idx] == new_vector[parent_idx]
+                    if parent_active:
+                        hp_active = True
+                        break
+                if hp_active:
+                    for condition in conditions:
+                        if not condition.evaluate_vector(new_vector):
+                            hp_active = False
+                            break
+            active[hp_idx] = hp_active
+
+            if hp_active and np.isnan(hp_value):
+                raise ValueError("Active hyperparameter '%s' not specified!" %
+                                 hyperparameter.name)
+
+            if not allow_inactive_with_values and not hp_active and \
+                    not np.isnan(hp_value):
+                raise ValueError("Inactive hyperparameter '%s' must not be "
+                                 "specified, but has the vector value: '%s'." %
+                                 (hp_name, hp_value))
+
+        if touched:
+            self._check_forbidden(new_vector, touched)
+
+    def _change_vector(self, vector: np.ndarray,
+                       changes: Dict[str, Union[str, float, int]],
+                       allow_inactive_with_values: bool = False) -> np.ndarray:
+        """Return a legal vector with some values changed.
+
+        Children which become active are set to their default value and
+        descendants which become inactive are removed. Only these
+        hyperparameters and the forbidden clauses which involve a changed
+        value are checked.
+
+        Parameters
+        ----------
+        vector : np.ndarray
+            Vector representation of a legal configuration. It is not
+            modified.
+
+        changes : dict
+            New values by hyperparameter name.
+
+        allow_inactive_with_values : bool (default=False)
+            Whether an Exception will be raised if a value for an inactive
+            hyperparameter is given.
+
+        Returns
+        -------
+        np.ndarray
+            A new vector, or the given vector if no value changed.
+        """
+        if self._descendants_idx is None:
+            self._build_index_tables()
+
+        new_vector = None  # type: Union[None, np.ndarray]
+        changed = set()  # type: Set[int]
+        for hp_name, value in changes.items():
+            hyperparameter = self.get_hyperparameter(hp_name)
+            if not hyperparameter.is_legal(value):
+                raise ValueError("Illegal value %s for hyperparameter %s" %
+                                 (str(value), hp_name))
+            hp_idx = self._hyperparameter_idx[hp_name]
+            vector_value = hyperparameter._inverse_transform(value)
+            if vector_value == vector[hp_idx]:
+                continue
+            if new_vector is None:
+                new_vector = vector.copy()
+            new_vector[hp_idx] = vector_value
+            changed.add(hp_idx)
+        if new_vector is None:
+            return vector
+
+        to_visit = set(changed)
+        for hp_idx in changed:
+            to_visit.update(self._descendants_idx[hp_idx].tolist())
+        touched = set(changed)
+        active = dict()  # type: Dict[int, bool]
+
+        # Parents come before their children
+        for hp_idx in sorted(to_visit):
+            hp_name = self._idx_to_hyperparameter[hp_idx]
+            hp_active = True
+            conditions = self._parent_conditions_of[hp_name]
+            if conditions:
+                hp_active = False
+                for parent in self._parents_of[hp_name]:
+                    parent_idx = self._hyperparameter_idx[parent.name]
+                    parent_active = active.get(parent_idx)
+                    if parent_active is None:
+                        parent_active = new_vector[parent_idx] == new_vector[parent_idx]
+                    if parent_active:
+                        hp_active = True
+                        break
+                if hp_active:
+                    for condition in conditions:
+                        if not condition.evaluate_vector(new_vector):
+                            hp_active = False
+                            break
+            active[hp_idx] = hp_active
+
+            hp_value = new_vector[hp_idx]
+            if hp_idx in changed:
+                if not hp_active and not allow_inactive_with_values:
+                    raise ValueError("Inactive hyperparameter '%s' must not "
+                                     "be specified, but has the vector value: "
+                                     "'%s'." % (hp_name, hp_value))
+            elif hp_active and np.isnan(hp_value):
+                new_vector[hp_idx] = self._default_vector[hp_idx]
+                touched.add(hp_idx)
+            elif not hp_active and not np.isnan(hp_value):
+                new_vector[hp_idx] = np.NaN
+                touched.add(hp_idx)
+
+        self._check_forbidden(new_vector, touched)
+        return new_vector
+
+    def _repair_vectors(self, vectors: np.ndarray,
+                        changed_idx: int) -> np.ndarray:
+        """Repair the activity of the descendants of one hyperparameter in
+        many vectors at once.
+
+        The vectors are legal vectors in which only the value of the
+        hyperparameter ``changed_idx`` was changed. Descendants which become
+        active are set to their default value and descendants which become
+        inactive are set to NaN, just like ``_change_vector()`` does. The
+        forbidden clauses are not checked.
+
+        Parameters
+        ----------
+        vectors : np.ndarray
+            Matrix with one vector representation per row, which is modified
+            in place.
+
+        changed_idx : int
+            Index of the changed hyperparameter.
+
+        Returns
+        -------
+        np.ndarray
+            The repaired matrix.
+        """
+        if self._descendants_idx is None:
+            self._build_index_tables()
+
+        # Only descendants with a parent whose value changed in at least one
+        # vector have to be evaluated
+        changed = [False] * vectors.shape[1]
+        changed[changed_idx] = True
+
+        # Parents come before their children
+        for hp_idx in self._descendants_idx[changed_idx].tolist():
+            parents_idx, conditions = self._activation[hp_idx]
+            if not any(changed[parent_idx] for parent_idx in parents_idx):
+                continue
+            active = ~np.all(np.isnan(vectors[:, parents_idx]), axis=1)
+            for condition in conditions:
+                if not np.any(active):
+                    break
+                active &= condition.evaluate_vectors(vectors)
+            column = vectors[:, hp_idx]
+            inactive = np.isnan(column)
+            activated = active & inactive
+            deactivated = ~active & ~inactive
+            column[activated] = self._default_vector[hp_idx]
+            column[deactivated] = np.NaN
+            changed[hp_idx] = bool(activated.any() or deactivated.any())
+        return vectors
+
+    def _repair_vector(self, vector: np.ndarray, changed_idx: int) -> np.ndarray:
+        """Repair the activity of the descendants of one hyperparameter in a
+        single vector.
+
+        Same as ``_repair_vectors()`` for a single vector, which is modified
+        in place and returned.
+        """
+        if self._descendants_idx is None:
+            self._build_index_tables()
+
+        changed = [False] * len(vector)
+        changed[changed_idx] = True
+
+        # Parents come before their children
+        for hp_idx in self._descendants_idx[changed_idx].tolist():
+            parents_idx, conditions = self._activation[hp_idx]
+            if not any(changed[parent_idx] for parent_idx in parents_idx):
+                continue
+            active = False
+            for parent_idx in parents_idx:
+                if vector[parent_idx] == vector[parent_idx]:
+                    active = True
+                    break
+            if active:
+                for condition in conditions:
+                    if not condition.evaluate_vector(vector):
+                        active = False
+                        break
+            value = vector[hp_idx]
+            if active and value != value:
+                vector[hp_idx] = self._default_vector[hp_idx]
+                changed[hp_idx] = True
+            elif not active and value == value:
+                vector[hp_idx] = np.NaN
+                changed[hp_idx] = True
+        return vector
+
+    def _check_forbidden(self, vector: np.ndarray,
+                         hyperparameter_indices: Union[None, Iterable[int]] = None) -> None:
+        """Raise a ForbiddenValueError if the vector violates a forbidden clause.
+
+        Parameters
+        ----------
+        vector : np.ndarray
+
+        hyperparameter_indices : iterable of int, optional
+            Only check the forbidden clauses which involve at least one of
+            these hyperparameters, for example because only their values
+            changed. By default, all forbidden clauses are checked.
+        """
+        if not self.forbidden_clauses:
+            return
+
+        forbidden_clauses_of_idx = self._forbidden_clauses_of_idx
+        if hyperparameter_indices is None:
+            compiled = self._get_compiled_forbidden_clauses()
+            position = compiled.get_violated_clause(vector)
+            if position is not None:
+                raise ForbiddenValueError(
+                    "Given vector violates forbidden clause %s" % (
+                        str(self.forbidden_clauses[position])))
+            positions = compiled.residual_positions
+        else:
+            positions = set()
+            for hp_idx in hyperparameter_indices:
+                positions.update(forbidden_clauses_of_idx.get(hp_idx, ()))
+            positions = sorted(positions)
+        if not positions:
+            return
+
+        # A clause which involves an inactive hyperparameter can never be
+        # violated, skip all of them
+        skip = set()  # type: Set[int]
+        for hp_idx in np.nonzero(vector != vector)[0]:
+            skip.update(forbidden_clauses_of_idx.get(hp_idx, ()))
+
+        for position in positions:
+            if position in skip:
+                continue
+            clause = self.forbidden_clauses[position]
             if clause.is_forbidden_vector(vector, strict=False):
                 raise ForbiddenValueError("Given vector violates forbidden clause %s" % (str(clause)))
 
+    def _get_forbidden_mask(self, vectors: np.ndarray,
+                            hyperparameter_indices: Union[None, Iterable[int]] = None) -> np.ndarray:
+        """Return for each row of a matrix of vectors whether it violates a
+        forbidden clause.
+
+        The compiled forbidden clauses are checked for all rows at once, the
+        remaining clauses row by row.
+
+        Parameters
+        ----------
+        vectors : np.ndarray
+
+        hyperparameter_indices : iterable of int, optional
+            Only check the remaining clauses which involve at least one of
+            these hyperparameters, for example because only their values
+            changed. By default, all forbidden clauses are checked.
+        """
+        if not self.forbidden_clauses:
+            return np.zeros((vectors.shape[0], ), dtype=bool)
+
+        compiled = self._get_compiled_forbidden_clauses()
+        mask = compiled.get_forbidden_mask(vectors)
+        positions = compiled.residual_positions
+        if hyperparameter_indices is not None and positions:
+            targeted = set()  # type: Set[int]
+            for hp_idx in hyperparameter_indices:
+                targeted.update(self._forbidden_clauses_of_idx.get(hp_idx, ()))
+            positions = [position for position in positions
+                         if position in targeted]
+        residual_clauses = [self.forbidden_clauses[position]
+                            for position in positions]
+        if residual_clauses:
+            for i in np.nonzero(~mask)[0]:
+                for clause in residual_clauses:
+                    if clause.is_forbidden_vector(vectors[i], strict=False):
+                        mask[i] = True
+                        break
+        return mask
+
     # http://stackoverflow.com/a/25176504/4636294
     def __eq__(self, other: Any) -> bool:
         """Override the default Equals behavior"""
         if isinstance(other, self.__class__):
-            this_dict = self.__dict__.copy()
-            del this_dict['random']
-            other_dict = other.__dict__.copy()
-            del other_dict['random']
-            return this_dict == other_dict
+            if self is other:
+                return True
+            return self.get_fingerprint() == other.get_fingerprint()
         return NotImplemented
 
     def __ne__(self, other: Any) -> bool:
@@ -818,7 +1977,7 @@ class ConfigurationSpace(object):
 
     def __hash__(self) -> int:
         """Override the default hash behavior (that returns the id or the object)"""
-        return hash(self.__repr__())
+        return int(self.get_fingerprint()[:16], 16)
 
     def __repr__(self) -> str:
         retval = io.StringIO()
@@ -868,19 +2027,6 @@ class ConfigurationSpace(object):
         unconditional_hyperparameters = self.get_all_unconditional_hyperparameters()
         hyperparameters_with_children = list()
 
-        forbidden_clauses_unconditionals = []
-        forbidden_clauses_conditionals = []
-        for clause in self.forbidden_clauses:
-            based_on_conditionals = False
-            for subclause in clause.get_descendant_literal_clauses():
-                if subclause.hyperparameter.name not in unconditional_hyperparameters:
-                    based_on_conditionals = True
-                    break
-            if based_on_conditionals:
-                forbidden_clauses_conditionals.append(clause)
-            else:
-                forbidden_clauses_unconditionals.append(clause)
-
         for uhp in unconditional_hyperparameters:
             children = self._children_of[uhp]
             if len(children) > 0:
@@ -897,33 +2043,41 @@ class ConfigurationSpace(object):
                 vector[:, i] = hyperparameter._sample(self.random, missing)
 
             for i in range(missing):
-                try:
-                    for clause in forbidden_clauses_unconditionals:
-                        if clause.is_forbidden_vector(vector[i], strict=False):
-                            raise ForbiddenValueError(
-                                "Given vector violates forbidden clause %s" % (
-                                str(clause)))
-
-                    hps = deque()
-                    visited = set()
-                    hps.extendleft(hyperparameters_with_children)
-                    active = np.zeros((num_hyperparameters,), dtype=bool)
-
-                    for ch in unconditional_hyperparameters:
-                        active[self._hyperparameter_idx[ch]] = 1
-
-                    inactive = set()
-
-                    while len(hps) > 0:
-                        hp = hps.pop()
-                        visited.add(hp)
-                        children = self._children_of[hp]
-                        for child in children:
-                            child_name = child.name
-                            if child_name not in inactive:
-                                parents = self._parents_of[child_name]
-                                hyperparameter_idx = self._hyperparameter_idx[child_name]
-                                if len(parents) == 1:
+                hps = deque()
+                visited = set()
+                hps.extendleft(hyperparameters_with_children)
+                active = np.zeros((num_hyperparameters,), dtype=bool)
+
+                for ch in unconditional_hyperparameters:
+                    active[self._hyperparameter_idx[ch]] = 1
+
+                inactive = set()
+
+                while len(hps) > 0:
+                    hp = hps.pop()
+                    visited.add(hp)
+                    children = self._children_of[hp]
+                    for child in children:
+                        child_name = child.name
+                        if child_name not in inactive:
+                            parents = self._parents_of[child_name]
+                            hyperparameter_idx = self._hyperparameter_idx[child_name]
+                            if len(parents) == 1:
+                                conditions = self._parent_conditions_of[child_name]
+                                add = True
+                                for condition in conditions:
+                                    if not condition.evaluate_vector(vector[i]):
+                                        add = False
+                                        vector[i][hyperparameter_idx] = np.NaN
+                                        inactive.add(child_name)
+                                        break
+                                if add == True:
+                                    active[hyperparameter_idx] = 1
+                                    hps.appendleft(child_name)
+
+                            else:
+                                parent_names = set(p.name for p in parents)
+                                if parent_names.issubset(visited):  # make sure no parents are still unvisited
                                     conditions = self._parent_conditions_of[child_name]
                                     add = True
                                     for condition in conditions:
@@ -932,46 +2086,32 @@ class ConfigurationSpace(object):
                                             vector[i][hyperparameter_idx] = np.NaN
                                             inactive.add(child_name)
                                             break
+
                                     if add == True:
                                         active[hyperparameter_idx] = 1
                                         hps.appendleft(child_name)
 
                                 else:
-                                    parent_names = set(p.name for p in parents)
-                                    if parent_names.issubset(visited):  # make sure no parents are still unvisited
-                                        conditions = self._parent_conditions_of[child_name]
-                                        add = True
-                                        for condition in conditions:
-                                            if not condition.evaluate_vector(vector[i]):
-                                                add = False
-                                                vector[i][hyperparameter_idx] = np.NaN
-                                                inactive.add(child_name)
-                                                break
-
-                                        if add == True:
-                                            active[hyperparameter_idx] = 1
-                                            hps.appendleft(child_name)
-
-                                    else:
-                                        continue
-
-                    vector[i][~active] = np.NaN
-
-                    for clause in forbidden_clauses_conditionals:
-                        if clause.is_forbidden_vector(vector[i], strict=False):
-                            raise ForbiddenValueError(
-                                "Given vector violates forbidden clause %s" % (
-                                    str(clause)))
-
-                    configuration = Configuration(self, vector=vector[i])
-                    accepted_configurations.append(configuration)
-                except ForbiddenValueError as e:
+                                    continue
+
+                vector[i][~active] = np.NaN
+
+            # Check the forbidden clauses of all samples at once
+            forbidden = self._get_forbidden_mask(vector)
+            for i in range(missing):
+                if forbidden[i]:
                     iteration += 1
 
                     if iteration == size * 100:
                         raise ForbiddenValueError(
                             "Cannot sample valid configuration for "
                             "%s" % self)
+                else:
+                    # Copy the row, a view would keep the whole matrix alive
+                    configuration = Configuration(self,
+                                                  vector=vector[i].copy())
+                    configuration._owns_vector = True
+                    accepted_configurations.append(configuration)
 
             missing = size - len(accepted_configurations)
 
@@ -983,9 +2123,220 @@ class ConfigurationSpace(object):
     def seed(self, seed: int) -> None:
         self.random = np.random.RandomState(seed)
 
+    def __reduce__(self) -> Tuple:
+        # Only the definition of the configuration space is pickled, the
+        # mappings between its hyperparameters and all caches are derived
+        # from it and are rebuilt by __setstate__()
+        if self._validation_cache is None:
+            validation_cache_size = 0
+        else:
+            validation_cache_size = self._validation_cache.maxsize
+        state = {
+            'hyperparameters': list(self._hyperparameters.values()),
+            'conditions': self.get_conditions(),
+            'forbidden_clauses': self.forbidden_clauses,
+            'random_state': self.random.get_state(),
+            'validation_cache_size': validation_cache_size,
+        }
+        return (self.__class__, (), state)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        if 'hyperparameters' not in state:
+            self._setstate_from_dict(state)
+            return
+        self._add_definition(state['hyperparameters'], state['conditions'],
+                             state['forbidden_clauses'])
+        self.random.set_state(state['random_state'])
+        self.set_validation_cache_size(state['validation_cache_size'])
+
+    def _setstate_from_dict(self, state: Dict[str, Any]) -> None:
+        # Configuration spaces pickled by earlier versions store their whole
+        # __dict__. Attributes added since then get their initial value and
+        # the conditions and forbidden clauses are indexed again.
+        ConfigurationSpace.__init__(self)
+        self.__dict__.update(state)
+        for condition in self.get_conditions():
+            condition.set_vector_idx(self._hyperparameter_idx)
+        self._forbidden_clauses_of_idx = dict()
+        for position, clause in enumerate(self.forbidden_clauses):
+            clause.set_vector_idx(self._hyperparameter_idx)
+            self._index_forbidden_clause(position, clause)
+        self._invalidate_caches()
+
+    def _add_definition(self, hyperparameters: List[Hyperparameter],
+                        conditions: List[ConditionComponent],
+                        forbidden_clauses: List[AbstractForbiddenComponent]) -> None:
+        # Bulk construction of an empty configuration space from the
+        # definition of another one, see __reduce__(). The hyperparameters
+        # must be in the order of that configuration space, which is kept so
+        # that its vectors remain valid, and the conditions and forbidden
+        # clauses must already know the indices of their hyperparameters.
+        # Unlike add_hyperparameters() and friends, nothing is checked or
+        # sorted and every mapping is built in one pass.
+        root = '__HPOlib_configuration_space_root__'
+        names = [hyperparameter.name for hyperparameter in hyperparameters]
+        self._hyperparameters = OrderedDict(zip(names, hyperparameters))
+        self._hyperparameter_idx = dict(zip(names, range(len(names))))
+        self._idx_to_hyperparameter = dict(enumerate(names))
+
+        # Edges by the index of the child and by the index of the parent
+        parent_edges = [[] for _ in names]  # type: List[List[Tuple[int, ConditionComponent]]]
+        child_edges = [[] for _ in names]  # type: List[List[Tuple[int, ConditionComponent]]]
+        for condition in conditions:
+            for dlc in condition.get_descendant_literal_conditions():
+                parent_edges[dlc.child_vector_id].append(
+                    (dlc.parent_vector_id, condition))
+                child_edges[dlc.parent_vector_id].append(
+                    (dlc.child_vector_id, condition))
+
+        # Children and parents are ordered by their index, just like
+        # _sort_hyperparameters() does
+        unconditional = OrderedDict()  # type: OrderedDict[str, None]
+        self._children = OrderedDict([(root, unconditional)])
+        self._parents = OrderedDict()
+        self._conditionals = set()
+        self._parent_conditions_of = dict()
+        self._child_conditions_of = dict()
+        self._parents_of = dict()
+        self._children_of = dict()
+        # (Filling an empty OrderedDict is much faster than passing it a
+        # list of items)
+        for name, parents, children in zip(names, parent_edges, child_edges):
+            parent_order = OrderedDict()  # type: OrderedDict[str, Union[None, ConditionComponent]]
+            if parents:
+                if len(parents) > 1:
+                    parents.sort(key=itemgetter(0))
+                for idx, condition in parents:
+                    parent_order[names[idx]] = condition
+                parent_conditions = list(parent_order.values())
+                self._conditionals.add(name)
+                self._parents_of[name] = [
+                    parent for condition in parent_conditions
+                    for parent in condition.get_parents()]
+            else:
+                unconditional[name] = None
+                parent_order[root] = None
+                parent_conditions = []
+                self._parents_of[name] = []
+            self._parents[name] = parent_order
+            self._parent_conditions_of[name] = parent_conditions
+
+            child_order = OrderedDict()  # type: OrderedDict[str, ConditionComponent]
+            if children:
+                if len(children) > 1:
+                    children.sort(key=itemgetter(0))
+                for idx, condition in children:
+                    child_order[names[idx]] = condition
+                child_conditions = list(child_order.values())
+                self._children_of[name] = [
+                    child for condition in child_conditions
+                    for child in condition.get_children()]
+            else:
+                child_conditions = []
+                self._children_of[name] = []
+            self._children[name] = child_order
+            self._child_conditions_of[name] = child_conditions
+
+        self.forbidden_clauses = list(forbidden_clauses)
+        self._forbidden_clauses_of_idx = dict()
+        for position, clause in enumerate(self.forbidden_clauses):
+            self._index_forbidden_clause(position, clause)
+        self._invalidate_caches()
+
+
+# Configuration spaces against which pickled configurations are restored, by
+# fingerprint, see register_configuration_space()
+_registered_configuration_spaces = dict()  # type: Dict[str, ConfigurationSpace]
+
+
+def register_configuration_space(configuration_space: ConfigurationSpace) -> str:
+    """Register a configuration space in this process.
+
+    Configurations of a registered configuration space are pickled as the
+    fingerprint of their configuration space and their vector instead of
+    together with the whole configuration space. They can only be unpickled
+    in a process in which an equal configuration space is registered, for
+    example by registering it in every worker of a process pool.
+
+    A configuration space which is modified after registering it must be
+    registered again.
+
+    Parameters
+    ----------
+    configuration_space : ConfigurationSpace
+
+    Returns
+    -------
+    str
+        The fingerprint under which the configuration space is registered.
+    """
+    if not isinstance(configuration_space, ConfigurationSpace):
+        raise TypeError("Expected an instance of %s, but got '%s'." %
+                        (ConfigurationSpace, type(configuration_space)))
+    fingerprint = configuration_space.get_fingerprint()
+    _registered_configuration_spaces[fingerprint] = configuration_space
+    return fingerprint
+
+
+def unregister_configuration_space(configuration_space: ConfigurationSpace) -> None:
+    """Remove a configuration space from the registry of this process."""
+    _registered_configuration_spaces.pop(
+        configuration_space.get_fingerprint(), None)
+
+
+def _restore_configuration(fingerprint: str, vector: bytes,
+                           allow_inactive_with_values: bool,
+                           origin: Any) -> 'Configuration':
+    configuration_space = _registered_configuration_spaces.get(fingerprint)
+    if configuration_space is None:
+        raise ValueError("Cannot unpickle a configuration of the "
+                         "configuration space with fingerprint %s, which is "
+                         "not registered in this process." % fingerprint)
+    configuration = Configuration(
+        configuration_space, vector=_unpack_vector(
+            vector, len(configuration_space._hyperparameters)),
+        allow_inactive_with_values=allow_inactive_with_values,
+        origin=origin)
+    configuration._owns_vector = True
+    return configuration
+
+
+def _pack_vector(vector: np.ndarray) -> bytes:
+    # A bit mask of the inactive hyperparameters followed by the values of
+    # the active ones, which is much shorter than the vector if most
+    # hyperparameters are inactive
+    inactive = np.isnan(vector)
+    return np.packbits(inactive).tobytes() + \
+        np.asarray(vector[~inactive], dtype=np.float64).tobytes()
+
+
+def _unpack_vector(packed: bytes, num_hyperparameters: int) -> np.ndarray:
+    mask_length = (num_hyperparameters + 7) // 8
+    inactive = np.unpackbits(np.frombuffer(packed[:mask_length],
+                                           dtype=np.uint8))
+    inactive = inactive[:num_hyperparameters].astype(bool)
+    vector = np.empty((num_hyperparameters, ), dtype=np.float64)
+    vector[inactive] = np.NaN
+    vector[~inactive] = np.frombuffer(packed[mask_length:], dtype=np.float64)
+    return vector
+
 
 class Configuration(object):
     # TODO add a method to eliminate inactive hyperparameters from a configuration
+
+    # Configurations are created in large numbers, do not give each of them a
+    # __dict__. Everything which is the same for all configurations of a
+    # configuration space (such as the hyperparameter names) is stored in
+    # the configuration space.
+    __slots__ = ('configuration_space', 'allow_inactive_with_values',
+                 'origin', '_query_values', '_values', '_vector',
+                 '_owns_vector', '_hash')
+
+    # Number of decimals of the vector representation which are compared
+    # by __eq__ and __hash__. This makes a configuration created from values
+    # equal to one created from the vector the values were decoded from.
+    _vector_decimals = 10
+
     def __init__(self, configuration_space: ConfigurationSpace, values: Union[None,  Dict[str, Union[str, float, int]]] = None,
                  vector: Union[None, np.ndarray]=None, allow_inactive_with_values: bool=False, origin: Any=None)\
             -> None:
@@ -1017,9 +2368,13 @@ class Configuration(object):
         self.configuration_space = configuration_space
         self.allow_inactive_with_values = allow_inactive_with_values
         self._query_values = False
-        self._num_hyperparameters = len(self.configuration_space._hyperparameters)
         self.origin = origin
-        self._keys = None  # type: Union[None, List[str]]
+        # Decoded values, created once a value is accessed
+        self._values = None  # type: Union[None, Dict[str, Union[str, float, int]]]
+        self._hash = None  # type: Union[None, int]
+        # A vector passed by the caller may be shared, it is copied before
+        # it is modified for the first time
+        self._owns_vector = values is not None
 
         if values is not None and vector is not None:
             raise ValueError('Configuration specified both as dictionary and '
@@ -1061,7 +2416,6 @@ class Configuration(object):
 
 
         elif vector is not None:
-            self._values = dict()
             if not isinstance(vector, np.ndarray):
                 vector = np.array(vector, dtype=float)
             self._vector = vector
@@ -1069,12 +2423,18 @@ class Configuration(object):
             raise ValueError('Configuration neither specified as dictionary '
                              'or vector.')
 
+    @property
+    def _num_hyperparameters(self) -> int:
+        return len(self.configuration_space._hyperparameters)
+
     def is_valid_configuration(self) -> None:
         self.configuration_space._check_configuration(
             self._vector, allow_inactive_with_values=self.allow_inactive_with_values)
 
     def __getitem__(self, item: str) -> Any:
-        if self._query_values or item in self._values:
+        if self._values is None:
+            self._values = dict()
+        elif self._query_values or item in self._values:
             return self._values.get(item)
 
         hyperparameter = self.configuration_space._hyperparameters[item]
@@ -1084,10 +2444,9 @@ class Configuration(object):
             raise KeyError()
 
         value = hyperparameter._transform(self._vector[item_idx])
-        # Truncate the representation of the float to be of constant
-        # length for a python version
+        # Return a python float instead of a numpy float
         if isinstance(hyperparameter, FloatHyperparameter):
-            value = float(repr(value))
+            value = float(value)
         # TODO make everything faster, then it'll be possible to init all values
         # at the same time and use an OrderedDict instead of only a dict here to
         # support iterating that dict in the same order as the actual order of
@@ -1104,6 +2463,12 @@ class Configuration(object):
     def __setitem__(self, key, value):
         param = self.configuration_space.get_hyperparameter(key)
         if param.is_legal(value):
+            self._hash = None
+            if not self._owns_vector:
+                self._vector = self._vector.copy()
+                self._owns_vector = True
+            if self._values is None:
+                self._values = dict()
             self._values[key] = value
             self._vector[self.configuration_space._hyperparameter_idx[key]] = self.configuration_space.get_hyperparameter(key)._inverse_transform(self[key])
         else:
@@ -1113,14 +2478,53 @@ class Configuration(object):
         self._populate_values()
         return item in self._values
 
+    def with_values(self, **changes: Union[str, float, int]) -> 'Configuration':
+        """Return a new configuration with some values changed.
+
+        Hyperparameters which become active are set to their default value
+        and hyperparameters which become inactive are removed. The
+        configuration itself is not modified. Use
+        ``with_values(**{name: value})`` for names which are not valid
+        Python identifiers.
+
+        Parameters
+        ----------
+        **changes
+            New values by hyperparameter name.
+
+        Returns
+        -------
+        Configuration
+        """
+        vector = self.configuration_space._change_vector(
+            self._vector, changes, self.allow_inactive_with_values)
+        configuration = Configuration(
+            self.configuration_space, vector=vector,
+            allow_inactive_with_values=self.allow_inactive_with_values)
+        # Share the vector if nothing changed, both copy it on write.
+        # Otherwise the vector is a fresh copy owned by the new configuration.
+        if vector is self._vector:
+            configuration._owns_vector = False
+            self._owns_vector = False
+        else:
+            configuration._owns_vector = True
+        return configuration
+
     # http://stackoverflow.com/a/25176504/4636294
     def __eq__(self, other: Any) -> bool:
         """Override the default Equals behavior"""
         if isinstance(other, self.__class__):
-            self._populate_values()
-            other._populate_values()
-            return self._values == other._values and \
-                self.configuration_space == other.configuration_space
+            if self is other:
+                return True
+            if self.configuration_space is not other.configuration_space \
+                    and self.configuration_space != other.configuration_space:
+                return False
+            # The hashes are cached, which makes comparing many different
+            # configurations cheap
+            if hash(self) != hash(other):
+                return False
+            return self._get_canonical_vector() == \
+                other._get_canonical_vector()
         return NotImplemented
 
     def __ne__(self, other: Any) -> bool:
@@ -1131,13 +2535,48 @@ class Configuration(object):
 
     def __hash__(self) -> int:
         """Override the default hash behavior (that returns the id or the object)"""
-        self._populate_values()
-        return hash(self.__repr__())
+        # Only cache the hash of the vector, the configuration space can
+        # still be modified (its hash is cached by the space itself)
+        if self._hash is None:
+            self._hash = hash(self._get_canonical_vector())
+        return hash((self._hash, hash(self.configuration_space)))
+
+    def _get_canonical_vector(self) -> bytes:
+        return _canonical_vector_bytes(self._vector, self._vector_decimals)
+
+    def __reduce__(self) -> Tuple:
+        fingerprint = self.configuration_space.get_fingerprint()
+        if fingerprint in _registered_configuration_spaces:
+            return (_restore_configuration,
+                    (fingerprint, _pack_vector(self._vector),
+                     self.allow_inactive_with_values, self.origin))
+        return (Configuration,
+                (self.configuration_space, None, self._vector,
+                 self.allow_inactive_with_values, self.origin))
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Only configurations pickled by earlier versions, which store their
+        # whole __dict__, are restored with a state. The values are decoded
+        # from the vector again when they are accessed.
+        self.configuration_space = state['configuration_space']
+        self.allow_inactive_with_values = state['allow_inactive_with_values']
+        self.origin = state.get('origin')
+        self._vector = state['_vector']
+        self._owns_vector = True
+        self._values = None
+        self._query_values = False
+        self._hash = None
 
     def _populate_values(self) -> None:
         if self._query_values is False:
-            for hyperparameter in self.configuration_space.get_hyperparameters():
-                self.get(hyperparameter.name)
+            values = self.configuration_space.get_dictionaries(
+                self._vector.reshape((1, -1)))[0]
+            # Keep values which were already accessed or set
+            if self._values is not None:
+                for key, value in values.items():
+                    self._values.setdefault(key, value)
+            else:
+                self._values = values
             self._query_values = True
 
     def __repr__(self) -> str:
@@ -1166,10 +2605,9 @@ class Configuration(object):
         return iter(self.keys())
 
     def keys(self) -> List[str]:
-        # Cache the keys to speed up the process of retrieving the keys
-        if self._keys is None:
-            self._keys = list(self.configuration_space._hyperparameters.keys())
-        return self._keys
+        # The list of keys is shared by all configurations of a configuration
+        # space and must not be modified
+        return self.configuration_space._get_hyperparameter_names()
 
     def get_dictionary(self) -> Dict[str, Union[str, float, int]]:
         self._populate_values()
@@ -1186,21 +2624,174 @@ class Configuration(object):
         return self._vector
 
 
+class ConfigurationSet(object):
+    """A set of configurations of one configuration space.
 
+    Configurations are looked up by their canonical vector (through their
+    cached hash), i.e. two configurations are the same element of the set if
+    and only if they are equal. Adding a configuration which is already in
+    the set returns the configuration stored first, so that duplicates can be
+    replaced by a single shared object. The set keeps the order in which
+    configurations were added.
 
+    Configurations must not be modified while they are in a set.
 
+    Parameters
+    ----------
+    configuration_space : :class:`~ConfigSpace.configuration_space.ConfigurationSpace`
+        Configuration space of all configurations in the set.
 
+    configurations : iterable, optional
+        Configurations which are added to the set.
+    """
+    def __init__(self, configuration_space: ConfigurationSpace,
+                 configurations: Iterable[Configuration] = ()) -> None:
+        if not isinstance(configuration_space, ConfigurationSpace):
+            raise TypeError("ConfigurationSet expects an instance of %s, "
+                            "you provided '%s'" %
+                            (ConfigurationSpace, type(configuration_space)))
+        self.configuration_space = configuration_space
+        # Maps each configuration to itself to look up the stored object
+        self._configurations = OrderedDict()  # type: OrderedDict[Configuration, Configuration]
+        for configuration in configurations:
+            self.add(configuration)
 
+    def _get_key(self, configuration: Configuration) -> Configuration:
+        if not isinstance(configuration, Configuration):
+            raise TypeError("Expected an instance of %s, but got '%s'." %
+                            (Configuration, type(configuration)))
+        if configuration.configuration_space is not self.configuration_space \
+                and configuration.configuration_space != self.configuration_space:
+            raise ValueError("Configuration belongs to a different "
+                             "configuration space.")
+        return configuration
+
+    def add(self, configuration: Configuration) -> Configuration:
+        """Add a configuration unless an equal configuration is already in
+        the set.
 
+        Parameters
+        ----------
+        configuration : :class:`~ConfigSpace.configuration_space.Configuration`
 
+        Returns
+        -------
+        :class:`~ConfigSpace.configuration_space.Configuration`
+            The configuration stored in the set, which is either the given
+            configuration or an equal configuration added before.
+        """
+        return self._configurations.setdefault(self._get_key(configuration),
+                                               configuration)
 
+    def get(self, configuration: Configuration,
+            default: Any = None) -> Union[Configuration, Any]:
+        """Return the configuration in the set which equals the given
+        configuration, or ``default`` if there is none."""
+        return self._configurations.get(self._get_key(configuration), default)
 
+    def remove(self, configuration: Configuration) -> None:
+        """Remove a configuration, raise a KeyError if it is not in the set."""
+        del self._configurations[self._get_key(configuration)]
 
+    def discard(self, configuration: Configuration) -> None:
+        """Remove a configuration if it is in the set."""
+        self._configurations.pop(self._get_key(configuration), None)
 
+    def __contains__(self, configuration: Any) -> bool:
+        if not isinstance(configuration, Configuration):
+            return False
+        try:
+            key = self._get_key(configuration)
+        except ValueError:
+            return False
+        return key in self._configurations
+
+    def __len__(self) -> int:
+        return len(self._configurations)
+
+    def __iter__(self) -> Iterable[Configuration]:
+        return iter(self._configurations.values())
+
+    def _check_other(self, other: 'ConfigurationSet') -> None:
+        if self.configuration_space is not other.configuration_space \
+                and self.configuration_space != other.configuration_space:
+            raise ValueError("Cannot combine sets of configurations of "
+                             "different configuration spaces.")
+
+    def union(self, other: 'ConfigurationSet') -> 'ConfigurationSet':
+        """Return the configurations in either set. Configurations which are
+        in both sets are taken from this set."""
+        self._check_other(other)
+        result = ConfigurationSet(self.configuration_space)
+        result._configurations.update(self._configurations)
+        for key, configuration in other._configurations.items():
+            result._configurations.setdefault(key, configuration)
+        return result
+
+    def intersection(self, other: 'ConfigurationSet') -> 'ConfigurationSet':
+        """Return the configurations of this set which are also in the other
+        set."""
+        self._check_other(other)
+        result = ConfigurationSet(self.configuration_space)
+        for key, configuration in self._configurations.items():
+            if key in other._configurations:
+                result._configurations[key] = configuration
+        return result
+
+    def difference(self, other: 'ConfigurationSet') -> 'ConfigurationSet':
+        """Return the configurations of this set which are not in the other
+        set."""
+        self._check_other(other)
+        result = ConfigurationSet(self.configuration_space)
+        for key, configuration in self._configurations.items():
+            if key not in other._configurations:
+                result._configurations[key] = configuration
+        return result
+
+    def __or__(self, other: Any) -> 'ConfigurationSet':
+        if not isinstance(other, ConfigurationSet):
+            return NotImplemented
+        return self.union(other)
+
+    def __and__(self, other: Any) -> 'ConfigurationSet':
+        if not isinstance(other, ConfigurationSet):
+            return NotImplemented
+        return self.intersection(other)
+
+    def __sub__(self, other: Any) -> 'ConfigurationSet':
+        if not isinstance(other, ConfigurationSet):
+            return NotImplemented
+        return self.difference(other)
 
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, self.__class__):
+            if self.configuration_space is not other.configuration_space \
+                    and self.configuration_space != other.configuration_space:
+                return False
+            return self._configurations.keys() == other._configurations.keys()
+        return NotImplemented
 
+    def __ne__(self, other: Any) -> bool:
+        if isinstance(other, self.__class__):
+            return not self.__eq__(other)
+        return NotImplemented
 
+    __hash__ = None  # type: ignore
 
+    def __repr__(self) -> str:
+        return "ConfigurationSet of %d configurations" % len(self)
 
+    def get_array(self) -> np.ndarray:
+        """Return the vectors of all configurations as a matrix.
 
-
+        Returns
+        -------
+        numpy.ndarray
+            Matrix with one row per configuration, in the order in which the
+            configurations were added.
+        """
+        num_hyperparameters = len(self.configuration_space._hyperparameters)
+        array = np.empty((len(self), num_hyperparameters), dtype=np.float64)
+        for i, configuration in enumerate(self):
+            array[i] = configuration.get_array()
+        return array
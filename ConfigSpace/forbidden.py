@@ -27,6 +27,8 @@
 # SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from itertools import product
 import operator
 
 import numpy as np
@@ -35,8 +37,9 @@ import io
 from functools import reduce
 
 
-from ConfigSpace.hyperparameters import Hyperparameter
-from typing import List, Dict, Any, Union
+from ConfigSpace.hyperparameters import Hyperparameter, \
+    CategoricalHyperparameter, OrdinalHyperparameter
+from typing import List, Dict, Any, Union, Tuple
 
 class AbstractForbiddenComponent(object):
     __metaclass__ = ABCMeta
@@ -240,14 +243,26 @@ class AbstractForbiddenConjunction(AbstractForbiddenComponent):
                                     type(component)))
 
         self.components = args
+        # Collect the literal clauses once instead of on every evaluation
+        self.dlcs = tuple(self.get_descendant_literal_clauses())
+        self.vector_ids = None  # type: Union[None, Tuple[int, ...]]
 
     @abstractmethod
     def __repr__(self):
         pass
 
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        # Conjunctions pickled by earlier versions did not collect their
+        # literal clauses
+        if 'dlcs' not in state:
+            self.dlcs = tuple(self.get_descendant_literal_clauses())
+            self.vector_ids = tuple(dlc.vector_id for dlc in self.dlcs)
+
     def set_vector_idx(self, hyperparameter_to_idx: dict):
         for component in self.components:
             component.set_vector_idx(hyperparameter_to_idx)
+        self.vector_ids = tuple(dlc.vector_id for dlc in self.dlcs)
 
     # todo:recheck is return type should be AbstractForbiddenComponent or AbstractForbiddenConjunction or Hyperparameter
     def get_descendant_literal_clauses(self) -> List[AbstractForbiddenComponent]:
@@ -285,17 +300,17 @@ class AbstractForbiddenConjunction(AbstractForbiddenComponent):
 
     def is_forbidden_vector(self, instantiated_vector: np.ndarray,
                             strict: bool = True) -> bool:
-        dlcs = self.get_descendant_literal_clauses()
-        for dlc in dlcs:
-            if dlc.vector_id not in range(len(instantiated_vector)):
-                if strict:
-                    raise ValueError("Is_forbidden must be called with all "
-                                     "instanstatiated hyperparameters in the "
-                                     "and conjunction of forbidden clauses; "
-                                     "you are (at least) missing "
-                                     "'%s'" % dlc.vector_id)
-                else:
-                    return False
+        if self.vector_ids is None or \
+                max(self.vector_ids) >= len(instantiated_vector):
+            if strict:
+                for dlc in self.dlcs:
+                    if dlc.vector_id not in range(len(instantiated_vector)):
+                        raise ValueError("Is_forbidden must be called with all "
+                                         "instanstatiated hyperparameters in the "
+                                         "and conjunction of forbidden clauses; "
+                                         "you are (at least) missing "
+                                         "'%s'" % dlc.vector_id)
+            return False
 
         # Finally, call is_forbidden for all direct descendents and combine the
         # outcomes. Check only as many forbidden clauses as the actual
@@ -328,3 +343,174 @@ class ForbiddenAndConjunction(AbstractForbiddenConjunction):
             if not evaluation:
                 return False
         return True
+
+
+class CompiledForbiddenClauses(object):
+    def __init__(self, clauses: List[AbstractForbiddenComponent],
+                 max_keys_per_clause: int = 1000) -> None:
+        """Lookup table for forbidden clauses over categorical and ordinal
+        hyperparameters.
+
+        A ``ForbiddenEqualsClause``, a ``ForbiddenInClause`` or a
+        ``ForbiddenAndConjunction`` of such clauses, which only involves
+        categorical and ordinal hyperparameters, forbids a set of tuples of
+        value indices. Clauses are grouped by the hyperparameters they
+        involve and the tuples are packed into a single integer per group
+        (mixed radix, the radix being the number of values of a
+        hyperparameter). Checking a vector then only requires packing its
+        values once per group and looking up the packed values in a sorted
+        array, instead of evaluating each clause separately.
+
+        Parameters
+        ----------
+        clauses : list
+            Forbidden clauses whose vector indices are already set.
+
+        max_keys_per_clause : int (default=1000)
+            Clauses which forbid more tuples (because of large
+            ``ForbiddenInClause``s) are not compiled.
+
+        Clauses of groups whose packed values do not fit into the range of
+        exactly representable floats any more (because they involve many
+        hyperparameters with many values) are not compiled either.
+        """
+        # Maps the tuple of vector ids of a group to its packed keys and to
+        # the positions of its clauses
+        groups = OrderedDict()  # type: OrderedDict[Tuple[int, ...], Dict[int, int]]
+        group_positions = dict()  # type: Dict[Tuple[int, ...], List[int]]
+        sizes = dict()  # type: Dict[int, int]
+        for position, clause in enumerate(clauses):
+            literals = self._get_literal_values(clause)
+            if literals is None:
+                continue
+            vector_ids = tuple(sorted(literals))
+            num_keys = 1
+            for vector_id in vector_ids:
+                num_keys *= len(literals[vector_id][1])
+            if num_keys > max_keys_per_clause:
+                continue
+
+            strides = []
+            stride = 1
+            for vector_id in vector_ids:
+                strides.append(stride)
+                stride *= literals[vector_id][0]
+                sizes[vector_id] = literals[vector_id][0]
+
+            keys = groups.setdefault(vector_ids, dict())
+            for values in product(*[literals[vector_id][1]
+                                    for vector_id in vector_ids]):
+                key = sum(int(value) * stride_
+                          for value, stride_ in zip(values, strides))
+                keys.setdefault(key, position)
+            group_positions.setdefault(vector_ids, []).append(position)
+
+        # The packed values of all groups share one range of keys, keep them
+        # exactly representable as floats and leave the groups which do not
+        # fit any more to the regular evaluation
+        offsets = dict()  # type: Dict[Tuple[int, ...], int]
+        offset = 0
+        for vector_ids in list(groups):
+            stride = 1
+            for vector_id in vector_ids:
+                stride *= sizes[vector_id]
+            if offset + stride > 2 ** 52:
+                del groups[vector_ids]
+                continue
+            offsets[vector_ids] = offset
+            offset += stride
+
+        self.compiled_positions = sorted(
+            position for vector_ids in groups
+            for position in group_positions[vector_ids])
+        compiled = set(self.compiled_positions)
+        self.residual_positions = [position for position in range(len(clauses))
+                                   if position not in compiled]
+
+        num_groups = len(groups)
+        width = max([len(vector_ids) for vector_ids in groups] + [1])
+        self._columns = np.zeros((num_groups, width), dtype=int)
+        self._strides = np.zeros((num_groups, width))
+        self._sizes = np.ones((num_groups, width))
+        self._padding = np.ones((num_groups, width), dtype=bool)
+        self._offsets = np.zeros((num_groups, ))
+        key_to_position = dict()  # type: Dict[int, int]
+        for i, (vector_ids, keys) in enumerate(groups.items()):
+            stride = 1
+            for j, vector_id in enumerate(vector_ids):
+                self._columns[i, j] = vector_id
+                self._strides[i, j] = stride
+                self._sizes[i, j] = sizes[vector_id]
+                self._padding[i, j] = False
+                stride *= sizes[vector_id]
+            offset = offsets[vector_ids]
+            self._offsets[i] = offset
+            for key, position in keys.items():
+                key_to_position[offset + key] = position
+        self._keys = np.array(sorted(key_to_position), dtype=np.float64)
+        self._key_to_position = key_to_position
+
+    @staticmethod
+    def _get_literal_values(clause: AbstractForbiddenComponent) \
+            -> Union[None, Dict[int, Tuple[int, List[float]]]]:
+        # Return the number of values and the forbidden vector values per
+        # vector id, or None if the clause cannot be compiled
+        if isinstance(clause, ForbiddenAndConjunction):
+            dlcs = clause.dlcs
+        elif isinstance(clause, (ForbiddenEqualsClause, ForbiddenInClause)):
+            dlcs = (clause, )
+        else:
+            return None
+
+        literals = dict()  # type: Dict[int, Tuple[int, List[float]]]
+        for dlc in dlcs:
+            hyperparameter = dlc.hyperparameter
+            if isinstance(hyperparameter, CategoricalHyperparameter):
+                size = hyperparameter._num_choices
+            elif isinstance(hyperparameter, OrdinalHyperparameter):
+                size = hyperparameter._num_elements
+            else:
+                return None
+
+            if isinstance(dlc, ForbiddenEqualsClause):
+                values = [dlc.vector_value]
+            elif isinstance(dlc, ForbiddenInClause):
+                values = sorted(dlc.vector_values)
+            else:
+                return None
+
+            # Two literals for the same hyperparameter are left to the
+            # regular evaluation
+            if dlc.vector_id is None or dlc.vector_id in literals:
+                return None
+            literals[dlc.vector_id] = (size, values)
+        return literals
+
+    def get_forbidden_mask(self, vectors: np.ndarray) -> np.ndarray:
+        """Return for each row of a matrix of vectors whether it violates a
+        compiled clause."""
+        keys, legal = self._pack(vectors)
+        forbidden = np.isin(keys, self._keys) & legal
+        return np.any(forbidden, axis=1)
+
+    def get_violated_clause(self, vector: np.ndarray) -> Union[None, int]:
+        """Return the position of a compiled clause which is violated by the
+        vector, or None."""
+        keys, legal = self._pack(vector.reshape((1, -1)))
+        forbidden = np.isin(keys[0], self._keys) & legal[0]
+        if not np.any(forbidden):
+            return None
+        key = keys[0][np.argmax(forbidden)]
+        return self._key_to_position[int(key)]
+
+    def _pack(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        values = vectors[:, self._columns]
+        values[:, self._padding] = 0
+        # Values of inactive hyperparameters (NaN) and illegal values can
+        # never violate a clause
+        with np.errstate(invalid='ignore'):
+            legal = (values >= 0) & (values < self._sizes) & \
+                    (values == np.floor(values))
+        legal = np.all(legal, axis=2)
+        keys = np.sum(values * self._strides, axis=2) + self._offsets
+        return keys, legal
@@ -32,9 +32,14 @@ import warnings
 from collections import OrderedDict
 from typing import List, Any, Dict, Union, Tuple
 import io
+import math
 import numpy as np
 
 
+# math.erf() for arrays, numpy has no error function
+_erf = np.frompyfunc(math.erf, 1, 1)
+
+
 class Hyperparameter(object, metaclass=ABCMeta):
 
     @abstractmethod
@@ -111,6 +116,49 @@ class Hyperparameter(object, metaclass=ABCMeta):
     def get_neighbors(self, value, rs, number, transform=False):
         raise NotImplementedError()
 
+    def get_neighbors_vectors(self, values: np.ndarray, rs: np.random.RandomState,
+                              number: Union[None, int, np.ndarray] = None) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        """Return the neighbors of many vector values at once.
+
+        Subclasses draw the neighbors of all values together, this fallback
+        calls ``get_neighbors()`` for one value after the other.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Vector values.
+
+        rs : np.random.RandomState
+
+        number : int or np.ndarray, optional
+            Number of neighbors of each value, or of all values. Uses the
+            default of ``get_neighbors()`` if not given.
+
+        Returns
+        -------
+        np.ndarray
+            Vector values of the neighbors, grouped by value.
+
+        np.ndarray
+            For each neighbor the index of its value.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if number is not None:
+            number = np.zeros(len(values), dtype=int) + number
+        neighbors = []  # type: List[float]
+        owners = []  # type: List[int]
+        for i, value in enumerate(values.tolist()):
+            if number is None:
+                value_neighbors = self.get_neighbors(value, rs)
+            else:
+                value_neighbors = self.get_neighbors(value, rs,
+                                                     number=number[i])
+            neighbors.extend(value_neighbors)
+            owners.extend([i] * len(value_neighbors))
+        return np.array(neighbors, dtype=np.float64), \
+            np.array(owners, dtype=int)
+
     @abstractmethod
     def get_num_neighbors(self, value):
         raise NotImplementedError()
@@ -239,6 +287,223 @@ class IntegerHyperparameter(NumericalHyperparameter):
                              " %s." % (name, type(parameter), str(parameter)))
         return int(parameter)
 
+    def _get_integer_neighbors(self, value: float, rs: np.random.RandomState,
+                               number: int, scale: float, lower: float,
+                               upper: float, transform: bool,
+                               integer_range: Union[None, Tuple[int, int]] = None) \
+            -> List[Union[int, float]]:
+        """Draw neighbors which represent a different integer than ``value``.
+
+        Neighbors are proposed by a normal distribution around ``value`` with
+        standard deviation ``scale`` in the vector space, clipped to
+        ``[lower, upper]``. Instead of rejecting proposals of the current
+        integer one at a time, the probability mass of each integer close to
+        ``value`` is computed and the neighbors are drawn from these masses
+        directly. If many integers are close to ``value`` (or the integers
+        are quantized), proposals are rejected in batches instead, which
+        then accepts most proposals.
+
+        ``integer_range`` are the smallest and largest integer, if the
+        hyperparameter is bounded.
+        """
+        normalizer = scale * math.sqrt(2)
+
+        def cdf(vector: float) -> float:
+            if vector <= lower:
+                return 0.
+            elif vector >= upper:
+                return 1.
+            return 0.5 * (1 + math.erf((vector - value) / normalizer))
+
+        if integer_range is not None and \
+                integer_range[1] - integer_range[0] < 64:
+            window_lower, window_upper = integer_range
+        else:
+            window_lower = self._transform(max(lower, value - 8 * scale))
+            window_upper = self._transform(min(upper, value + 8 * scale))
+
+        if self.q is None and window_upper - window_lower < 64:
+            candidates = np.arange(window_lower, window_upper + 1)
+            # The clipped proposals (and the negligible mass outside of the
+            # window) belong to the first and last candidate
+            boundaries = self._inverse_transform(candidates[:-1] + 0.5)
+            cdfs = [0.] + [cdf(boundary) for boundary in boundaries] + [1.]
+            masses = np.diff(cdfs)
+            masses[np.searchsorted(boundaries, value)] = 0
+            # Draw on the cumulative masses themselves, their sum can differ
+            # in the last digit
+            cumulative = np.cumsum(masses)
+            if cumulative[-1] <= 0:
+                return []
+            indices = np.searchsorted(
+                cumulative, rs.random_sample(number) * cumulative[-1],
+                side='right')
+            # A draw rounded up to the total belongs to the last candidate
+            # with a positive mass
+            indices = np.minimum(indices, np.flatnonzero(masses)[-1])
+            neighbors = candidates[indices]
+        else:
+            current = self._transform(value)
+            step = 1 if self.q is None else self.q
+            with np.errstate(invalid='ignore', divide='ignore'):
+                current_lower = self._inverse_transform(current - step / 2)
+                current_upper = self._inverse_transform(current + step / 2)
+            if current_lower != current_lower:
+                current_lower = lower
+            acceptance = max(1 - cdf(current_upper) + cdf(current_lower), 1e-3)
+            neighbors = []
+            iteration = 0
+            while len(neighbors) < number:
+                iteration += 1
+                if iteration > 100:
+                    raise ValueError('Probably caught in an infinite loop.')
+                missing = number - len(neighbors)
+                samples = rs.normal(
+                    value, scale, size=int(math.ceil(1.5 * missing / acceptance)))
+                samples = np.clip(samples, lower, upper)
+                samples = samples[(samples < current_lower) |
+                                  (samples >= current_upper)]
+                for sample in samples[:missing]:
+                    new_value = self._transform(sample)
+                    # Guards against rounding at the boundaries
+                    if new_value != current:
+                        neighbors.append(new_value)
+            neighbors = np.array(neighbors)
+
+        if transform:
+            return neighbors.tolist()
+        return self._inverse_transform(neighbors.astype(float)).tolist()
+
+    def _get_integer_neighbors_vectors(self, values: np.ndarray,
+                                       rs: np.random.RandomState,
+                                       number: Union[int, np.ndarray],
+                                       scale: float, lower: float, upper: float,
+                                       integer_range: Union[None, Tuple[int, int]] = None) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        """Same as ``_get_integer_neighbors()`` for many vector values.
+
+        The masses of the integers close to each value are stacked into one
+        matrix (padded to the widest window) and all neighbors are drawn
+        from it with a single call of the random state. Values which need
+        rejection sampling draw their proposals together, round by round.
+        For a single value the neighbors equal those of
+        ``_get_integer_neighbors()``.
+
+        Returns
+        -------
+        np.ndarray
+            Vector values of the neighbors, grouped by value.
+
+        np.ndarray
+            For each neighbor the index of its value.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        number = np.zeros(len(values), dtype=int) + number
+        normalizer = scale * math.sqrt(2)
+
+        def cdf(vectors: np.ndarray, centers: np.ndarray) -> np.ndarray:
+            cdfs = 0.5 * (1 + _erf((vectors - centers) / normalizer).astype(float))
+            cdfs[vectors <= lower] = 0.
+            cdfs[vectors >= upper] = 1.
+            return cdfs
+
+        if integer_range is not None and \
+                integer_range[1] - integer_range[0] < 64:
+            window_lower = np.zeros(len(values), dtype=int) + integer_range[0]
+            window_upper = np.zeros(len(values), dtype=int) + integer_range[1]
+        else:
+            window_lower = self._transform_vectors(
+                np.maximum(lower, values - 8 * scale))
+            window_upper = self._transform_vectors(
+                np.minimum(upper, values + 8 * scale))
+        if self.q is None:
+            exact = window_upper - window_lower < 64
+        else:
+            exact = np.zeros(len(values), dtype=bool)
+
+        neighbors = [np.empty((0, ), dtype=int)]
+        owners = [np.empty((0, ), dtype=int)]
+
+        rows = np.nonzero(exact)[0]
+        if len(rows) > 0:
+            centers = values[rows].reshape((-1, 1))
+            width = int(np.max(window_upper[rows] - window_lower[rows])) + 1
+            candidates = window_lower[rows].reshape((-1, 1)) + np.arange(width)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                boundaries = self._inverse_transform(candidates[:, :-1] + 0.5)
+            # Boundaries behind the last candidate of a window
+            boundaries[candidates[:, 1:] >
+                       window_upper[rows].reshape((-1, 1))] = np.inf
+            cdfs = np.ones((len(rows), width + 1))
+            cdfs[:, 0] = 0.
+            with np.errstate(invalid='ignore'):
+                cdfs[:, 1:width] = cdf(boundaries, centers)
+            masses = np.diff(cdfs, axis=1)
+            masses[np.arange(len(rows)),
+                   np.sum(boundaries < centers, axis=1)] = 0
+            cumulative = np.cumsum(masses, axis=1)
+            last = width - 1 - np.argmax(masses[:, ::-1] > 0, axis=1)
+            counts = np.where(cumulative[:, -1] > 0, number[rows], 0)
+            draw_rows = np.repeat(np.arange(len(rows)), counts)
+            draws = rs.random_sample(len(draw_rows)) * \
+                cumulative[draw_rows, -1]
+            indices = np.sum(cumulative[draw_rows] <= draws.reshape((-1, 1)),
+                             axis=1)
+            indices = np.minimum(indices, last[draw_rows])
+            neighbors.append(candidates[draw_rows, indices])
+            owners.append(rows[draw_rows])
+
+        rows = np.nonzero(~exact)[0]
+        if len(rows) > 0:
+            centers = values[rows]
+            current = self._transform_vectors(centers)
+            step = 1 if self.q is None else self.q
+            with np.errstate(invalid='ignore', divide='ignore'):
+                current_lower = np.array(
+                    self._inverse_transform(current - step / 2), dtype=float)
+                current_upper = np.array(
+                    self._inverse_transform(current + step / 2), dtype=float)
+            current_lower[np.isnan(current_lower)] = lower
+            with np.errstate(invalid='ignore'):
+                acceptance = np.maximum(1 - cdf(current_upper, centers) +
+                                        cdf(current_lower, centers), 1e-3)
+            missing = number[rows].copy()
+            pending = np.nonzero(missing > 0)[0]
+            iteration = 0
+            while len(pending) > 0:
+                iteration += 1
+                if iteration > 100:
+                    raise ValueError('Probably caught in an infinite loop.')
+                sizes = np.ceil(1.5 * missing[pending] /
+                                acceptance[pending]).astype(int)
+                samples = rs.normal(np.repeat(centers[pending], sizes), scale)
+                sample_rows = np.repeat(pending, sizes)
+                samples = np.clip(samples, lower, upper)
+                outside = (samples < current_lower[sample_rows]) | \
+                          (samples >= current_upper[sample_rows])
+                samples = samples[outside]
+                sample_rows = sample_rows[outside]
+                # Only the first missing samples of each value are used
+                counts = np.bincount(sample_rows, minlength=len(rows))
+                starts = np.cumsum(counts) - counts
+                rank = np.arange(len(samples)) - starts[sample_rows]
+                used = rank < missing[sample_rows]
+                sample_rows = sample_rows[used]
+                new_values = self._transform_vectors(samples[used])
+                # Guards against rounding at the boundaries
+                differs = new_values != current[sample_rows]
+                neighbors.append(new_values[differs])
+                owners.append(rows[sample_rows[differs]])
+                missing -= np.bincount(sample_rows[differs],
+                                       minlength=len(rows))
+                pending = pending[missing[pending] > 0]
+
+        owners = np.concatenate(owners)
+        order = np.argsort(owners, kind='mergesort')
+        neighbors = np.concatenate(neighbors)[order].astype(float)
+        return np.array(self._inverse_transform(neighbors), dtype=float), \
+            owners[order]
+
 
 class UniformFloatHyperparameter(FloatHyperparameter):
     def __init__(self, name: str, lower: Union[int, float], upper: Union[int, float],
@@ -367,16 +632,65 @@ class UniformFloatHyperparameter(FloatHyperparameter):
         return vector
 
     def get_neighbors(self, value: Any, rs: np.random.RandomState, number: int = 4, transform: bool = False) -> List[float]:
-        neighbors = []  # type: List[float]
+        # Normal distribution around the value truncated to [0, 1]. Instead
+        # of drawing one sample after the other, draw enough samples to
+        # obtain all neighbors with high probability and reject the samples
+        # outside of [0, 1]. The neighbors are the same as with single
+        # draws, only more random numbers are consumed.
+        scale = 0.2 * math.sqrt(2)
+        acceptance = 0.5 * (math.erf((1 - value) / scale) -
+                            math.erf(-value / scale))
+        neighbors = np.empty((0, ))
         while len(neighbors) < number:
-            neighbor = rs.normal(value, 0.2)
-            if neighbor < 0 or neighbor > 1:
-                continue
-            if transform:
-                neighbors.append(self._transform(neighbor))
+            missing = number - len(neighbors)
+            samples = rs.normal(value, 0.2,
+                                size=int(math.ceil(1.5 * missing / acceptance)))
+            samples = samples[(samples >= 0) & (samples <= 1)]
+            if len(neighbors) == 0:
+                neighbors = samples
             else:
-                neighbors.append(neighbor)
-        return neighbors
+                neighbors = np.concatenate((neighbors, samples))
+        neighbors = neighbors[:number]
+        if transform:
+            return [self._transform(neighbor) for neighbor in neighbors]
+        else:
+            return neighbors.tolist()
+
+    def get_neighbors_vectors(self, values: np.ndarray, rs: np.random.RandomState,
+                              number: Union[int, np.ndarray] = 4) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        # Same as get_neighbors() for many vector values. Each round draws
+        # the samples of all values which still miss neighbors at once. For
+        # a single value the neighbors equal those of get_neighbors().
+        values = np.asarray(values, dtype=np.float64)
+        missing = np.zeros(len(values), dtype=int) + number
+        scale = 0.2 * math.sqrt(2)
+        acceptance = np.array([0.5 * (math.erf((1 - value) / scale) -
+                                      math.erf(-value / scale))
+                               for value in values.tolist()])
+        neighbors = [np.empty((0, ))]
+        owners = [np.empty((0, ), dtype=int)]
+        pending = np.nonzero(missing > 0)[0]
+        while len(pending) > 0:
+            sizes = np.ceil(1.5 * missing[pending] /
+                            acceptance[pending]).astype(int)
+            samples = rs.normal(np.repeat(values[pending], sizes), 0.2)
+            sample_owners = np.repeat(pending, sizes)
+            accepted = (samples >= 0) & (samples <= 1)
+            samples = samples[accepted]
+            sample_owners = sample_owners[accepted]
+            # Keep the first missing samples of each value
+            counts = np.bincount(sample_owners, minlength=len(values))
+            starts = np.cumsum(counts) - counts
+            rank = np.arange(len(samples)) - starts[sample_owners]
+            keep = rank < missing[sample_owners]
+            neighbors.append(samples[keep])
+            owners.append(sample_owners[keep])
+            missing -= np.minimum(counts, missing)
+            pending = pending[missing[pending] > 0]
+        owners = np.concatenate(owners)
+        order = np.argsort(owners, kind='mergesort')
+        return np.concatenate(neighbors)[order], owners[order]
 
 
 class NormalFloatHyperparameter(FloatHyperparameter):
@@ -469,10 +783,14 @@ class NormalFloatHyperparameter(FloatHyperparameter):
         return vector
 
     def get_neighbors(self, value: float, rs: np.random.RandomState, number: int = 4, transform: bool = False) -> List[float]:
-        neighbors = []
-        for i in range(number):
-            neighbors.append(rs.normal(value, self.sigma))
-        return neighbors
+        return rs.normal(value, self.sigma, size=number).tolist()
+
+    def get_neighbors_vectors(self, values: np.ndarray, rs: np.random.RandomState,
+                              number: Union[int, np.ndarray] = 4) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        # Same as get_neighbors() for many vector values at once
+        owners = np.repeat(np.arange(len(values)), number)
+        return rs.normal(np.asarray(values)[owners], self.sigma), owners
 
 
 class UniformIntegerHyperparameter(IntegerHyperparameter):
@@ -595,28 +913,30 @@ class UniformIntegerHyperparameter(IntegerHyperparameter):
 
     def get_neighbors(self, value: Union[int, float], rs: np.random.RandomState, number: int = 4, transform: bool = False) -> List[
         int]:
-        neighbors = []  # type: List[int]
-        while len(neighbors) < number:
-            rejected = True
-            iteration = 0
-            while rejected:
-                new_min_value = np.min([1, rs.normal(loc=value, scale=0.2)])
-                new_value = np.max((0, new_min_value))
-                int_value = self._transform(value)
-                new_int_value = self._transform(new_value)
-                if int_value != new_int_value:
-                    rejected = False
-                elif iteration > 100000:
-                    raise ValueError('Probably caught in an infinite loop.')
-
-            if transform:
-                neighbors.append(self._transform(new_value))
-            else:
-                new_value = self._transform(new_value)
-                new_value = self._inverse_transform(new_value)
-                neighbors.append(new_value)
-
-        return neighbors
+        return self._get_integer_neighbors(value, rs, number, 0.2, 0., 1.,
+                                           transform,
+                                           (self.lower, self.upper))
+
+    def get_neighbors_vectors(self, values: np.ndarray, rs: np.random.RandomState,
+                              number: Union[int, np.ndarray] = 4) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        return self._get_integer_neighbors_vectors(values, rs, number, 0.2,
+                                                   0., 1.,
+                                                   (self.lower, self.upper))
+
+    def _transform_vectors(self, vectors: np.ndarray) -> np.ndarray:
+        # Same as _transform() for an array of vector values without NaNs
+        ufhp = self.ufhp
+        vectors = vectors * (ufhp._upper - ufhp._lower) + ufhp._lower
+        if ufhp.log:
+            vectors = np.exp(vectors)
+        if ufhp.q is not None:
+            vectors = np.round(vectors / ufhp.q, 0) * ufhp.q
+        vectors = np.minimum(ufhp.upper, vectors)
+        vectors = np.maximum(ufhp.lower, vectors)
+        if self.q is not None:
+            vectors = np.round(vectors / self.q, 0) * self.q
+        return np.round(vectors, 0).astype(int)
 
 
 class NormalIntegerHyperparameter(IntegerHyperparameter):
@@ -724,25 +1044,23 @@ class NormalIntegerHyperparameter(IntegerHyperparameter):
 
     def get_neighbors(self, value: Union[int, float], rs: np.random.RandomState, number: int = 4, transform: bool = False) -> \
             List[Union[np.ndarray, float, int]]:
-        neighbors = []  # type: List[Union[np.ndarray, float, int]]
-        while len(neighbors) < number:
-            rejected = True
-            iteration = 0
-            while rejected:
-                iteration += 1
-                new_value = rs.normal(value, self.sigma)
-                int_value = self._transform(value)
-                new_int_value = self._transform(new_value)
-                if int_value != new_int_value:
-                    rejected = False
-                elif iteration > 100000:
-                    raise ValueError('Probably caught in an infinite loop.')
+        return self._get_integer_neighbors(value, rs, number, self.sigma,
+                                           -np.inf, np.inf, transform)
 
-            if transform:
-                neighbors.append(self._transform(new_value))
-            else:
-                neighbors.append(new_value)
-        return neighbors
+    def get_neighbors_vectors(self, values: np.ndarray, rs: np.random.RandomState,
+                              number: Union[int, np.ndarray] = 4) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        return self._get_integer_neighbors_vectors(values, rs, number,
+                                                   self.sigma, -np.inf, np.inf)
+
+    def _transform_vectors(self, vectors: np.ndarray) -> np.ndarray:
+        # Same as _transform() for an array of vector values without NaNs
+        nfhp = self.nfhp
+        if nfhp.log:
+            vectors = np.exp(vectors)
+        if nfhp.q is not None:
+            vectors = np.round(vectors / nfhp.q, 0) * nfhp.q
+        return np.round(vectors, 0).astype(int)
 
 
 class CategoricalHyperparameter(Hyperparameter):
@@ -824,23 +1142,27 @@ class CategoricalHyperparameter(Hyperparameter):
             List[Union[float, int, str]]:
         neighbors = []  # type: List[Union[float, int, str]]
         if number < len(self.choices):
-            while len(neighbors) < number:
-                rejected = True
-                index = int(value)
-                while rejected:
-                    neighbor_idx = rs.randint(0, self._num_choices)
-                    if neighbor_idx != index:
-                        rejected = False
-
+            # Draw distinct indices of all other choices at once and skip the
+            # current index by shifting the indices behind it. If only few
+            # of many choices are needed, independent draws are most likely
+            # distinct already and cheaper than a permutation of all choices.
+            index = int(value)
+            number = int(number)
+            neighbor_idx = None
+            if 4 * number * number < self._num_choices:
+                neighbor_idx = rs.randint(0, self._num_choices - 1,
+                                          size=number)
+                if len(set(neighbor_idx.tolist())) < number:
+                    neighbor_idx = None
+            if neighbor_idx is None:
+                neighbor_idx = rs.choice(self._num_choices - 1, size=number,
+                                         replace=False)
+            neighbor_idx[neighbor_idx >= index] += 1
+            for candidate_idx in neighbor_idx.tolist():
                 if transform:
-                    candidate = self._transform(neighbor_idx)
-                else:
-                    candidate = float(neighbor_idx)
-
-                if candidate in neighbors:
-                    continue
+                    neighbors.append(self._transform(candidate_idx))
                 else:
-                    neighbors.append(candidate)
+                    neighbors.append(float(candidate_idx))
         else:
             for candidate_idx, candidate_value in enumerate(self.choices):
                 if int(value) == candidate_idx:
@@ -855,6 +1177,26 @@ class CategoricalHyperparameter(Hyperparameter):
 
         return neighbors
 
+    def get_neighbors_vectors(self, values: np.ndarray, rs: np.random.RandomState,
+                              number: Union[int, float] = np.inf) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        # Same as get_neighbors() for many vector values. All other choices
+        # do not need random numbers. Fewer neighbors are drawn without
+        # replacement for each value at once, by sorting random keys, which
+        # consumes the random state differently than get_neighbors().
+        indices = np.asarray(values).astype(int)
+        if number < self._num_choices:
+            number = int(number)
+            keys = rs.random_sample((len(indices), self._num_choices - 1))
+            neighbors = np.argsort(keys, axis=1)[:, :number].ravel()
+        else:
+            number = self._num_choices - 1
+            neighbors = np.tile(np.arange(number), len(indices))
+        owners = np.repeat(np.arange(len(indices)), number)
+        # Skip the current choice
+        neighbors[neighbors >= indices[owners]] += 1
+        return neighbors.astype(float), owners
+
     def allow_greater_less_comparison(self) -> bool:
         raise ValueError("Parent hyperparameter in a > or < "
                          "condition must be a subclass of "
@@ -1044,5 +1386,15 @@ class OrdinalHyperparameter(Hyperparameter):
 
         return neighbors
 
+    def get_neighbors_vectors(self, values: np.ndarray, rs: None = None,
+                              number: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        # Same as get_neighbors() for many vector values, the previous and
+        # the next element of the sequence
+        values = np.asarray(values, dtype=np.float64)
+        neighbors = np.stack((values - 1, values + 1), axis=1).ravel()
+        owners = np.repeat(np.arange(len(values)), 2)
+        legal = (neighbors >= 0) & (neighbors < self._num_elements)
+        return neighbors[legal], owners[legal]
+
     def allow_greater_less_comparison(self) -> bool:
         return True
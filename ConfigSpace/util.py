@@ -27,16 +27,23 @@
 # SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from collections import deque
-import copy
-from typing import Union, List, Any, Dict
+from typing import Union, List, Any, Dict, Iterator, Tuple
 
 import numpy as np  # type: ignore
 from ConfigSpace import Configuration, ConfigurationSpace
-from ConfigSpace.exceptions import ForbiddenValueError
+from ConfigSpace.configuration_space import CacheInfo, _LRUCache, \
+    _canonical_vector_bytes
 from ConfigSpace.hyperparameters import CategoricalHyperparameter, \
     UniformFloatHyperparameter, UniformIntegerHyperparameter, Constant, \
     OrdinalHyperparameter
 
+
+# Neighbors of the hyperparameters with a finite number of neighbors by
+# configuration space fingerprint and vector, see
+# set_neighbourhood_cache_size()
+_neighbourhood_cache = None  # type: Union[None, _LRUCache]
+
+
 def impute_inactive_values(configuration: Configuration, strategy: Union[str, float]='default') -> Configuration:
     """Impute inactive parameters.
 
@@ -76,178 +83,529 @@ def impute_inactive_values(configuration: Configuration, strategy: Union[str, fl
 
 def check_neighbouring_config_vector(configuration: Configuration, new_array: np.array, neighbor_value: Union[int, float, str],
                               hp_name: str) -> np.array:
+    """Repair the activity of the hyperparameters below a changed value.
+
+    Descendants of ``hp_name`` which become active are set to their default
+    value, descendants which become inactive are set to NaN. Only
+    descendants with a parent whose value changed are evaluated.
+
+    Parameters
+    ----------
+    configuration : Configuration
+        The configuration the neighbor was derived from.
+
+    new_array : np.ndarray
+        Vector representation of the neighbor, which is modified in place.
+
+    neighbor_value : int, float or str
+        New value of the hyperparameter ``hp_name``. Unused, it is already
+        part of ``new_array``.
+
+    hp_name : str
+        Name of the changed hyperparameter.
+
+    Returns
+    -------
+    np.ndarray
+        The repaired vector.
+    """
     configuration_space = configuration.configuration_space
-    # Hyperparameters which are going to be set to inactive
-    disabled = []
-
-    # Activate hyperparameters if their parent node got activated
-    children = configuration_space._children_of[hp_name]
-    if len(children) > 0:
-        to_visit = deque()  # type: deque
-        to_visit.extendleft(children)
-        visited = set()  # type: Set[str]
-        activated_values = dict()  # type: Dict[str, Union[int, float, str]]
-
-        while len(to_visit) > 0:
-            current = to_visit.pop()
-            if current.name in visited:
-                continue
-            visited.add(current.name)
-            if current.name in disabled:
-                continue
+    hp_idx = configuration_space.get_idx_by_hyperparameter_name(hp_name)
+    return configuration_space._repair_vector(new_array, hp_idx)
 
-            current_idx = configuration_space.get_idx_by_hyperparameter_name(current.name)
-            current_value = new_array[current_idx]
 
-            conditions = configuration.configuration_space. \
-                _parent_conditions_of[current.name]
+def check_neighbouring_config_vectors(configuration: Configuration, new_arrays: np.ndarray,
+                                      hp_name: str) -> np.ndarray:
+    """Repair the activity of the hyperparameters below a changed value in
+    many neighbors at once.
 
-            active = True
-            for condition in conditions:
-                if not condition.evaluate_vector(new_array):
-                    active = False
-                    break
+    Batch form of :func:`check_neighbouring_config_vector` for neighbors which
+    all differ from ``configuration`` in the hyperparameter ``hp_name``.
 
-            if active and (current_value is None or
-                               not np.isfinite(current_value)):
-                default = current._inverse_transform(current.default)
-                new_array[current_idx] = default
-                children_ = configuration_space._children_of[current.name]
-                if len(children_) > 0:
-                    to_visit.extendleft(children_)
+    Parameters
+    ----------
+    configuration : Configuration
+        The configuration the neighbors were derived from.
 
-            # If the hyperparameter was made inactive,
-            # all its children need to be deactivade as well
-            if not active and (current_value is not None
-                               or np.isfinite(current_value)):
-                new_array[current_idx] = np.NaN
+    new_arrays : np.ndarray
+        Vector representations of the neighbors, one per row. The matrix is
+        modified in place.
 
-                children = configuration.configuration_space._children_of[current.name]
+    hp_name : str
+        Name of the changed hyperparameter.
 
-                if len(children) > 0:
-                    to_disable = set()
-                    for ch in children:
-                        to_disable.add(ch.name)
-                    while len(to_disable) > 0:
-                        child = to_disable.pop()
-                        child_idx = configuration.configuration_space. \
-                            get_idx_by_hyperparameter_name(child)
-                        disabled.append(child_idx)
-                        children = configuration.configuration_space._children_of[child]
+    Returns
+    -------
+    np.ndarray
+        The repaired matrix.
+    """
+    configuration_space = configuration.configuration_space
+    hp_idx = configuration_space.get_idx_by_hyperparameter_name(hp_name)
+    return configuration_space._repair_vectors(new_arrays, hp_idx)
 
-                        for ch in children:
-                            to_disable.add(ch.name)
 
-    for idx in disabled:
-        new_array[idx] = np.NaN
+def set_neighbourhood_cache_size(size: int) -> None:
+    """Cache the discrete part of one-exchange neighborhoods.
+
+    The neighbors obtained by changing a categorical or ordinal
+    hyperparameter do not depend on the random state. With the cache
+    enabled, they are stored by the fingerprint of the configuration space
+    and the vector of the configuration, so that asking for the
+    neighborhood of the same configuration again only draws the neighbors of
+    the numerical hyperparameters.
+
+    Parameters
+    ----------
+    size : int
+        Maximal number of configurations for which the neighbors are
+        stored. The least recently used entries are evicted first. A size of
+        zero disables the cache.
+    """
+    global _neighbourhood_cache
+    if size > 0:
+        _neighbourhood_cache = _LRUCache(size)
+    else:
+        _neighbourhood_cache = None
+
+
+def get_neighbourhood_cache_info() -> Union[None, CacheInfo]:
+    """Return hits, misses, maximal size and current size of the
+    neighbourhood cache, or None if the cache is disabled."""
+    if _neighbourhood_cache is None:
+        return None
+    return _neighbourhood_cache.info()
+
+
+class NeighbourhoodGenerator(object):
+    """Generate one-exchange neighborhoods of configurations of one
+    configuration space.
+
+    Everything which only depends on the configuration space is looked up
+    once when creating the generator, so that repeated calls for many
+    configurations only pay for proposing and checking the neighbors. The
+    configuration space must not be modified afterwards.
+
+    Parameters
+    ----------
+    configuration_space : ConfigurationSpace
+    """
+    def __init__(self, configuration_space: ConfigurationSpace) -> None:
+        self.configuration_space = configuration_space
+        self._hyperparameters = configuration_space.get_hyperparameters()
+        self._names = [hp.name for hp in self._hyperparameters]
+        self._has_neighbors = [hp.has_neighbors()
+                               for hp in self._hyperparameters]
+        # Only the number of neighbors of an ordinal hyperparameter depends
+        # on its value
+        self._num_neighbors = [
+            None if isinstance(hp, OrdinalHyperparameter)
+            else hp.get_num_neighbors()
+            for hp in self._hyperparameters
+        ]  # type: List[Union[None, int, float]]
+        self._movable_indices = np.nonzero(self._has_neighbors)[0]
+        self._discrete_indices = [
+            index for index, num_neighbors in enumerate(self._num_neighbors)
+            if self._has_neighbors[index] and
+            (num_neighbors is None or np.isfinite(num_neighbors))
+        ]
+        if configuration_space._descendants_idx is None:
+            configuration_space._build_index_tables()
+        # Changing a hyperparameter only changes the values of itself and of
+        # its descendants
+        self._changed_indices = [
+            [index] + descendants.tolist() for index, descendants
+            in enumerate(configuration_space._descendants_idx)
+        ]  # type: List[List[int]]
+
+    def _check_configuration(self, configuration: Configuration) -> None:
+        if configuration.configuration_space is not self.configuration_space \
+                and configuration.configuration_space != self.configuration_space:
+            raise ValueError("Configuration belongs to a different "
+                             "configuration space.")
+
+    def _get_neighbors(self, array: np.ndarray, index: int,
+                       random: np.random.RandomState) -> np.ndarray:
+        """Return the legal neighbors of a vector which differ in the
+        hyperparameter ``index`` as a matrix."""
+        hp = self._hyperparameters[index]
+        blocks = [np.empty((0, len(array)))]
+        if not np.isfinite(array[index]) or not self._has_neighbors[index]:
+            return blocks[0]
+        num_neighbors = self._num_neighbors[index]
+        if num_neighbors is None:
+            num_neighbors = hp.get_num_neighbors(hp._transform(array[index]))
+        if num_neighbors == 0:
+            return blocks[0]
+
+        number_of_sampled_neighbors = 0
+        iteration = 0
+        while True:
+            if np.isinf(num_neighbors):
+                # No infinite loops
+                if number_of_sampled_neighbors >= 4 or iteration > 100:
+                    break
+                neighbors = hp.get_neighbors(
+                    array[index], random,
+                    number=4 - number_of_sampled_neighbors)
+            else:
+                if iteration > 0:
+                    break
+                neighbors = hp.get_neighbors(array[index], random)
+            if len(neighbors) == 0:
+                break
+            # Count proposals and not only legal neighbors to not run into
+            # an infinite loop when a large amount of values is forbidden
+            iteration += len(neighbors)
+
+            block = np.tile(array, (len(neighbors), 1))
+            block[:, index] = neighbors
+            self.configuration_space._repair_vectors(block, index)
+            block = block[self._get_legal_mask(block, index)]
+            blocks.append(block)
+            number_of_sampled_neighbors += len(block)
+
+        return np.concatenate(blocks)
+
+    def _get_legal_mask(self, block: np.ndarray, index: int) -> np.ndarray:
+        """Return which repaired neighbors of a vector, which differ in the
+        hyperparameter ``index``, violate no forbidden clause."""
+        # The repair already made the activation legal. The compiled
+        # forbidden clauses are checked for the whole block, the others only
+        # if they involve a hyperparameter which can have changed.
+        return ~self.configuration_space._get_forbidden_mask(
+            block, self._changed_indices[index])
+
+    def _get_cached_neighbors(self, array: np.ndarray) -> Dict[int, np.ndarray]:
+        """Return the neighbors of all hyperparameters with a finite number
+        of neighbors by index, or nothing if the neighbourhood cache is
+        disabled."""
+        cache = _neighbourhood_cache
+        if cache is None:
+            return {}
+        key = (self.configuration_space.get_fingerprint(),
+               _canonical_vector_bytes(array))
+        neighbors = cache.get(key)
+        if neighbors is None:
+            neighbors = dict()
+            for index in self._discrete_indices:
+                # Does not draw random numbers
+                block = self._get_neighbors(array, index, None)
+                block.flags.writeable = False
+                neighbors[index] = block
+            cache.put(key, neighbors)
+        return neighbors
+
+    def neighbours(self, configuration: Configuration,
+                   random: Union[int, np.random.RandomState]) \
+            -> Iterator[Configuration]:
+        """Yield the configurations in the one-exchange neighborhood of a
+        configuration in random order.
+
+        Parameters
+        ----------
+        configuration : Configuration
+
+        random : int or np.random.RandomState
+            A random state, or a seed to create one.
+
+        Returns
+        -------
+        iterator of Configuration
+        """
+        self._check_configuration(configuration)
+        if not isinstance(random, np.random.RandomState):
+            random = np.random.RandomState(random)
+        return self._neighbours(configuration, random)
+
+    def _neighbours(self, configuration: Configuration,
+                    random: np.random.RandomState) -> Iterator[Configuration]:
+        configuration_space = self.configuration_space
+        array = configuration.get_array()
+        hyperparameters_list_length = len(self._names)
+        neighbors_to_return = dict()  # type: Dict[str, List[Configuration]]
+        hyperparameters_used = list()  # type: List[str]
+        number_of_usable_hyperparameters = sum(np.isfinite(array))
+        cached_neighbors = self._get_cached_neighbors(array)
+
+        while len(hyperparameters_used) != number_of_usable_hyperparameters:
+            index = random.randint(hyperparameters_list_length)
+            hp_name = self._names[index]
+            if hp_name in neighbors_to_return:
+                random.shuffle(neighbors_to_return[hp_name])
+                n_ = neighbors_to_return[hp_name].pop()
+                if len(neighbors_to_return[hp_name]) == 0:
+                    del neighbors_to_return[hp_name]
+                    hyperparameters_used.append(hp_name)
+                yield n_
+
+            else:
+                if not np.isfinite(array[index]):
+                    continue
+
+                neighbors = cached_neighbors.get(index)
+                if neighbors is None:
+                    neighbors = self._get_neighbors(array, index, random)
+                neighbourhood = [
+                    Configuration(configuration_space, vector=new_array.copy())
+                    for new_array in neighbors
+                ]
+
+                if len(neighbourhood) == 0:
+                    hyperparameters_used.append(hp_name)
+                else:
+                    if hp_name not in hyperparameters_used:
+                        neighbors_to_return[hp_name] = neighbourhood
+                        random.shuffle(neighbors_to_return[hp_name])
+                        n_ = neighbors_to_return[hp_name].pop()
+                        if len(neighbors_to_return[hp_name]) == 0:
+                            del neighbors_to_return[hp_name]
+                            hyperparameters_used.append(hp_name)
+                        yield n_
+
+    def neighbourhood_array(self, configuration: Configuration,
+                            random: Union[int, np.random.RandomState]) \
+            -> np.ndarray:
+        """Return the one-exchange neighborhood of a configuration as a
+        matrix.
+
+        Parameters
+        ----------
+        configuration : Configuration
+
+        random : int or np.random.RandomState
+            A random state, or a seed to create one.
+
+        Returns
+        -------
+        np.ndarray
+            Vector representations of the neighbors, one per row. They are
+            grouped by the changed hyperparameter in the order of the
+            configuration space.
+        """
+        self._check_configuration(configuration)
+        if not isinstance(random, np.random.RandomState):
+            random = np.random.RandomState(random)
+        array = configuration.get_array()
+        cached_neighbors = self._get_cached_neighbors(array)
+        return np.concatenate([
+            cached_neighbors[index] if index in cached_neighbors
+            else self._get_neighbors(array, index, random)
+            for index in range(len(self._names))
+        ])
+
+    def neighbourhood_arrays(self, vectors: np.ndarray,
+                             random: Union[int, np.random.RandomState]) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        """Return the one-exchange neighborhoods of many configurations at
+        once.
+
+        The neighbors of a hyperparameter are proposed for all
+        configurations in which it is active, then repaired and checked
+        against the forbidden clauses in a single batch. The proposals of
+        all configurations are drawn with one call of
+        ``get_neighbors_vectors()`` of the hyperparameter. For a single
+        configuration the result equals :meth:`neighbourhood_array`.
+
+        Parameters
+        ----------
+        vectors : np.ndarray
+            Vector representations of the configurations, one per row, for
+            example from :meth:`ConfigurationSet.get_array`.
+
+        random : int or np.random.RandomState
+            A random state, or a seed to create one.
 
-    return new_array
+        Returns
+        -------
+        np.ndarray
+            Vector representations of all neighbors, one per row. They are
+            grouped by the configuration they belong to and then by the
+            changed hyperparameter.
+
+        np.ndarray
+            For each neighbor the row of the configuration it belongs to.
+        """
+        if not isinstance(random, np.random.RandomState):
+            random = np.random.RandomState(random)
+        vectors = np.asarray(vectors, dtype=np.float64)
+        if vectors.ndim != 2 or vectors.shape[1] != len(self._names):
+            raise ValueError("Expected a matrix with %d columns, but got an "
+                             "array of shape %s." %
+                             (len(self._names), str(vectors.shape)))
+
+        configuration_space = self.configuration_space
+        blocks = [np.empty((0, vectors.shape[1]))]
+        owners = [np.empty((0, ), dtype=int)]
+
+        for index, hp in enumerate(self._hyperparameters):
+            if not self._has_neighbors[index]:
+                continue
+            num_neighbors = self._num_neighbors[index]
+            if num_neighbors == 0:
+                continue
+            # Ordinal hyperparameters (without a fixed number of neighbors)
+            # have a finite number of neighbors as well
+            infinite = num_neighbors is not None and np.isinf(num_neighbors)
+            values = vectors[:, index]
+            pending = np.nonzero(np.isfinite(values))[0]
+
+            number_of_sampled_neighbors = np.zeros(len(vectors), dtype=int)
+            iteration = np.zeros(len(vectors), dtype=int)
+            while len(pending) > 0:
+                # The proposals of all pending configurations at once
+                if infinite:
+                    proposals, proposal_owners = hp.get_neighbors_vectors(
+                        values[pending], random,
+                        4 - number_of_sampled_neighbors[pending])
+                else:
+                    proposals, proposal_owners = hp.get_neighbors_vectors(
+                        values[pending], random)
+                if len(proposals) == 0:
+                    break
+                proposal_owners = pending[proposal_owners]
+                # Count proposals and not only legal neighbors to not run
+                # into an infinite loop when many values are forbidden
+                np.add.at(iteration, proposal_owners, 1)
+
+                block = vectors[proposal_owners]
+                block[:, index] = proposals
+                configuration_space._repair_vectors(block, index)
+                legal = self._get_legal_mask(block, index)
+                blocks.append(block[legal])
+                owners.append(proposal_owners[legal])
+                if not infinite:
+                    break
 
+                # Draw again for configurations which got less than four
+                # legal neighbors, but do not run into an infinite loop
+                np.add.at(number_of_sampled_neighbors,
+                          proposal_owners[legal], 1)
+                # Configurations without any proposal are exhausted
+                pending = np.intersect1d(pending, proposal_owners)
+                pending = pending[(number_of_sampled_neighbors[pending] < 4) &
+                                  (iteration[pending] <= 100)]
+
+        neighbors = np.concatenate(blocks)
+        owners = np.concatenate(owners)
+        order = np.argsort(owners, kind='mergesort')
+        return neighbors[order], owners[order]
+
+    def random_neighbors_array(self, configuration: Configuration,
+                               random: Union[int, np.random.RandomState],
+                               number: int = 1) -> np.ndarray:
+        """Draw random neighbors of a configuration.
+
+        Each neighbor changes one active hyperparameter, drawn uniformly
+        from the active hyperparameters which have neighbors, to one of its
+        neighbors. Children which become active are set to their default
+        and children which become inactive are removed. Neighbors which
+        violate a forbidden clause are drawn again.
+
+        Parameters
+        ----------
+        configuration : Configuration
+
+        random : int or np.random.RandomState
+            A random state, or a seed to create one.
+
+        number : int, optional (default=1)
+            Number of neighbors to draw. The neighbors are drawn
+            independently and can therefore contain duplicates.
 
-def get_one_exchange_neighbourhood(configuration: Configuration, seed: int) -> List[Configuration]:
+        Returns
+        -------
+        np.ndarray
+            Vector representations of the neighbors, one per row.
+        """
+        self._check_configuration(configuration)
+        if not isinstance(random, np.random.RandomState):
+            random = np.random.RandomState(random)
+        array = configuration.get_array()
+        eligible = self._movable_indices[
+            np.isfinite(array[self._movable_indices])]
+        if len(eligible) == 0:
+            raise ValueError('Probably caught in an infinite loop.')
+
+        neighbors = np.empty((number, len(array)))
+        missing = np.arange(number)
+        iteration = 0
+        while len(missing) > 0:
+            iteration += 1
+            if iteration > 10000:
+                raise ValueError('Probably caught in an infinite loop.')
+            indices = random.choice(eligible, size=len(missing))
+            rejected = []  # type: List[np.ndarray]
+            for index in np.unique(indices).tolist():
+                positions = missing[indices == index]
+                hp = self._hyperparameters[index]
+                num_neighbors = self._num_neighbors[index]
+                if num_neighbors is not None and np.isinf(num_neighbors):
+                    values = hp.get_neighbors(array[index], random,
+                                              number=len(positions))
+                else:
+                    # Pick uniformly among all neighbors, the enumeration
+                    # itself does not depend on the random state
+                    candidates = hp.get_neighbors(array[index], random)
+                    if len(candidates) == 0:
+                        rejected.append(positions)
+                        continue
+                    values = np.asarray(candidates)[
+                        random.randint(len(candidates), size=len(positions))]
+                rejected.append(positions[len(values):])
+                positions = positions[:len(values)]
+
+                block = np.tile(array, (len(positions), 1))
+                block[:, index] = values
+                self.configuration_space._repair_vectors(block, index)
+                legal = self._get_legal_mask(block, index)
+                neighbors[positions[legal]] = block[legal]
+                rejected.append(positions[~legal])
+            missing = np.sort(np.concatenate(rejected + [missing[:0]]))
+        return neighbors
+
+
+def get_one_exchange_neighbourhood(configuration: Configuration, seed: int) -> Iterator[Configuration]:
     """Return all configurations in a one-exchange neighborhood.
 
     The method is implemented as defined by:
     Frank Hutter, Holger H. Hoos and Kevin Leyton-Brown
     Sequential Model-Based Optimization for General Algorithm Configuration
     In: Proceedings of the conference on Learning and Intelligent OptimizatioN (LION 5)
+
+    Use a :class:`NeighbourhoodGenerator` to generate the neighborhoods of
+    many configurations of the same configuration space.
     """
-    random = np.random.RandomState(seed)
-    hyperparameters_list = list(configuration.keys())
-    hyperparameters_list_length = len(hyperparameters_list)
-    neighbors_to_return = dict()
-    hyperparameters_used = list()
-    number_of_usable_hyperparameters = sum(np.isfinite(configuration.get_array()))
-    configuration_space = configuration.configuration_space
+    generator = NeighbourhoodGenerator(configuration.configuration_space)
+    return generator.neighbours(configuration, seed)
 
-    while len(hyperparameters_used) != number_of_usable_hyperparameters:
-        index = random.randint(hyperparameters_list_length)
-        hp_name = hyperparameters_list[index]
-        if hp_name in neighbors_to_return:
-            random.shuffle(neighbors_to_return[hp_name])
-            n_ = neighbors_to_return[hp_name].pop()
-            if len(neighbors_to_return[hp_name]) == 0:
-                del neighbors_to_return[hp_name]
-                hyperparameters_used.append(hp_name)
-            yield n_
-
-        else:
-            neighbourhood = []
-            number_of_sampled_neighbors = 0
-            array = configuration.get_array()
-
-            if not np.isfinite(array[index]):
-                continue
 
-            iteration = 0
-            while True:
-                hp = configuration_space.get_hyperparameter(hp_name)
-                configuration._populate_values()
-                num_neighbors = hp.get_num_neighbors(configuration.get(hp_name))
+def get_one_exchange_neighbourhood_array(configuration: Configuration, seed: int) -> np.ndarray:
+    """Return the one-exchange neighborhood of a configuration as a matrix.
 
-                # Obtain neigbors differently for different possible numbers of
-                # neighbors
-                if num_neighbors == 0:
-                    break
-                # No infinite loops
-                elif iteration > 100:
-                    break
-                elif np.isinf(num_neighbors):
-                    if number_of_sampled_neighbors >= 4:
-                        break
-                    num_samples_to_go = 4 - number_of_sampled_neighbors
-                    neighbors = hp.get_neighbors(array[index], random,
-                                                 number=num_samples_to_go)
-                else:
-                    if iteration > 0:
-                        break
-                    neighbors = hp.get_neighbors(array[index], random)
+    Contains the same kind of neighbors as
+    :func:`get_one_exchange_neighbourhood`: all neighbors of each active
+    hyperparameter with a finite number of neighbors and four random
+    neighbors of every other active hyperparameter, without the neighbors
+    which violate a forbidden clause. Instead of creating one configuration
+    after the other, the neighbors of each hyperparameter are proposed,
+    repaired and checked at once.
 
+    Parameters
+    ----------
+    configuration : Configuration
 
-                # Check all newly obtained neigbors
-                for neighbor in neighbors:
-                    new_array = array.copy()
-                    new_array[index] = neighbor
-                    neighbor_value = hp._transform(neighbor)
-                    new_array = check_neighbouring_config_vector(
-                     configuration, new_array, neighbor_value, hp_name)
+    seed : int
+        Used to generate a random state.
 
-                    try:
-                        # Populating a configuration from an array does not check
-                        #  if it is a legal configuration - check this (slow)
-                        new_configuration = Configuration(configuration_space, vector=new_array)
-                        # Only rigorously check every tenth configuration (
-                        # because moving around in the neighborhood should
-                        # just work!)
-                        if np.random.random() > 0.9:
-                            new_configuration.is_valid_configuration()
-                        else:
-                            configuration_space._check_forbidden(new_array)
-                        neighbourhood.append(new_configuration)
-                        number_of_sampled_neighbors += 1
-                    # todo: investigate why tests fail when ForbiddenValueError is caught here
-                    except ForbiddenValueError as e:
-                        pass
-
-                    # Count iterations to not run into an infinite loop when
-                    # sampling floats/ints and there is large amount of forbidden
-                    #  values; also to find out if we tried to get a neighbor for
-                    #  a categorical hyperparameter, and the only possible
-                    # neighbor is forbidden together with another active
-                    # value/default hyperparameter
-                    iteration += 1
-            if len(neighbourhood) == 0:
-                hyperparameters_used.append(hp_name)
-            else:
-                if hp_name not in hyperparameters_used:
-                    neighbors_to_return[hp_name] = neighbourhood
-                    random.shuffle(neighbors_to_return[hp_name])
-                    n_ = neighbors_to_return[hp_name].pop()
-                    if len(neighbors_to_return[hp_name]) == 0:
-                        del neighbors_to_return[hp_name]
-                        hyperparameters_used.append(hp_name)
-                    yield n_
-    # return neighbourhood
+    Returns
+    -------
+    np.ndarray
+        Vector representations of the neighbors, one per row. They are
+        grouped by the changed hyperparameter in the order of the
+        configuration space.
+    """
+    generator = NeighbourhoodGenerator(configuration.configuration_space)
+    return generator.neighbourhood_array(configuration, seed)
 
 
 def get_random_neighbor(configuration: Configuration, seed: int) -> Configuration:
@@ -258,10 +616,10 @@ def get_random_neighbor(configuration: Configuration, seed: int) -> Configuratio
       value.
     * If parameter is a float, draw a random sample
 
-    If changing a parameter activates new parameters or deactivates
-    previously active parameters, the configuration will be rejected. If more
-    than 10000 configurations were rejected, this function raises a
-    ValueError.
+    If changing a parameter activates new parameters, they are set to their
+    default values, and parameters which become inactive are removed. A
+    neighbor which violates a forbidden clause is rejected. If more than
+    10000 neighbors were rejected, this function raises a ValueError.
 
     Parameters
     ----------
@@ -276,49 +634,38 @@ def get_random_neighbor(configuration: Configuration, seed: int) -> Configuratio
         The new neighbor.
 
     """
-    random = np.random.RandomState(seed)
-    rejected = True
-    values = copy.deepcopy(configuration.get_dictionary())
+    return get_random_neighbors(configuration, seed, 1)[0]
 
-    while rejected:
-        # First, choose an active hyperparameter
-        active = False
-        iteration = 0
-        while not active:
-            iteration += 1
-            if configuration._num_hyperparameters > 1:
-                rand_idx = random.randint(0,
-                                          configuration._num_hyperparameters - 1)
-            else:
-                rand_idx = 0
 
-            value = configuration.get_array()[rand_idx]
-            if np.isfinite(value):
-                active = True
+def get_random_neighbors(configuration: Configuration, seed: int,
+                         number: int) -> List[Configuration]:
+    """Draw several random neighbors of a configuration at once.
 
-                hp_name = configuration.configuration_space \
-                    .get_hyperparameter_by_idx(rand_idx)
-                hp = configuration.configuration_space.get_hyperparameter(hp_name)
+    Each neighbor is drawn as by :func:`get_random_neighbor`, but the moves
+    are applied to copies of the vector of the configuration and all
+    neighbors which change the same hyperparameter are repaired and checked
+    together.
 
-                # Only choose if there is a possibility of finding a neigboor
-                if not hp.has_neighbors():
-                    active = False
+    Parameters
+    ----------
+    configuration : Configuration
 
-            if iteration > 10000:
-                raise ValueError('Probably caught in an infinite loop.')
-        # Get a neighboor and adapt the rest of the configuration if necessary
-        neighbor = hp.get_neighbors(value, random, number=1, transform=True)[0]
-        previous_value = values[hp.name]
-        values[hp.name] = neighbor
-
-        try:
-            new_configuration = Configuration(
-                configuration.configuration_space, values=values)
-            rejected = False
-        except ValueError as e:
-            values[hp.name] = previous_value
+    seed : int
+        Used to generate a random state.
 
-    return new_configuration
+    number : int
+        Number of neighbors to draw.
+
+    Returns
+    -------
+    List[Configuration]
+        The new neighbors.
+    """
+    configuration_space = configuration.configuration_space
+    generator = NeighbourhoodGenerator(configuration_space)
+    neighbors = generator.random_neighbors_array(configuration, seed, number)
+    return [Configuration(configuration_space, vector=vector)
+            for vector in neighbors]
 
 
 def deactivate_inactive_hyperparameters(configuration: dict,
@@ -0,0 +1,98 @@
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+import ConfigSpace
+import ConfigSpace.io.pcs as pcs_parser
+
+
+n_configs = 10000
+
+
+def measure(create):
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    configurations = create()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (end - start) / len(configurations), configurations
+
+
+def run_test(configuration_space_path):
+    with open(configuration_space_path) as fh:
+        cs = pcs_parser.read(fh)
+    cs.seed(1)
+    vectors = np.array([configuration.get_array() for configuration
+                        in cs.sample_configuration(n_configs)])
+    rows = [vector.copy() for vector in vectors]
+
+    print('###')
+    print(configuration_space_path, flush=True)
+    print('Number of hyperparameters', len(cs.get_hyperparameters()))
+
+    # Only the configuration objects, the vectors already exist
+    memory, configurations = measure(lambda: [
+        ConfigSpace.Configuration(cs, vector=vector) for vector in rows])
+    print('Bytes per configuration (vector only)', memory)
+
+    # Configurations whose values were accessed once
+    def create_and_query():
+        configurations = [ConfigSpace.Configuration(cs, vector=vector.copy())
+                          for vector in vectors]
+        for configuration in configurations:
+            configuration.get_dictionary()
+            configuration.keys()
+        return configurations
+    memory, configurations = measure(create_and_query)
+    print('Bytes per configuration (decoded values)', memory)
+
+    # Three overlapping collections (e.g. evaluated, running and queued
+    # configurations), each creating its own configuration objects
+    starts = [0, n_configs // 4, n_configs // 2]
+
+    def create_histories():
+        return [[ConfigSpace.Configuration(cs, vector=vector.copy())
+                 for vector in vectors[start:start + n_configs // 2]]
+                for start in starts]
+    n_entries = len(starts) * (n_configs // 2)
+    memory, histories = measure(create_histories)
+    print('Bytes per history entry (separate objects)',
+          memory * len(starts) / n_entries)
+
+    def create_interned_histories():
+        interned = ConfigSpace.ConfigurationSet(cs)
+        return [ConfigSpace.ConfigurationSet(cs, [
+                    interned.add(ConfigSpace.Configuration(
+                        cs, vector=vector.copy()))
+                    for vector in vectors[start:start + n_configs // 2]])
+                for start in starts]
+    memory, _ = measure(create_interned_histories)
+    print('Bytes per history entry (interned)',
+          memory * len(starts) / n_entries)
+
+    history = histories[0]
+    queries = histories[1][:100]
+    start_time = time.time()
+    for configuration in queries:
+        configuration in history
+    print('Average time of a membership test (list)',
+          (time.time() - start_time) / len(queries))
+    history = ConfigSpace.ConfigurationSet(cs, history)
+    start_time = time.time()
+    for configuration in queries:
+        configuration in history
+    print('Average time of a membership test (ConfigurationSet)',
+          (time.time() - start_time) / len(queries))
+
+
+this_file = os.path.abspath(__file__)
+this_directory = os.path.dirname(this_file)
+configuration_space_path = os.path.join(this_directory, '..',
+                                        "test", "test_searchspaces")
+configuration_space_path = os.path.abspath(configuration_space_path)
+
+for pcs_file in ['auto-sklearn_2017_04.pcs', 'spear-params.pcs']:
+    full_path = os.path.join(configuration_space_path, pcs_file)
+    run_test(full_path)
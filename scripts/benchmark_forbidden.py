@@ -0,0 +1,99 @@
+import os
+import time
+
+import numpy as np
+
+import ConfigSpace
+import ConfigSpace.io.pcs as pcs_parser
+from ConfigSpace.exceptions import ForbiddenValueError
+from ConfigSpace.forbidden import ForbiddenAndConjunction, \
+    ForbiddenEqualsClause
+
+
+n_configs = 500
+n_forbiddens = 500
+sat_spaces = ['SparrowToRiss-cssc14.pcs', 'clasp-3.1.4.pcs',
+              'lingeling-params.pcs', 'spear-params.pcs', 'satenstein.pcs']
+
+
+def add_random_forbiddens(cs, rs):
+    # Forbid random pairs of categorical values, but keep the default
+    # configuration legal
+    default = cs.get_default_configuration()
+    categoricals = [hp for hp in cs.get_hyperparameters()
+                    if isinstance(hp, ConfigSpace.CategoricalHyperparameter)]
+    clauses = []
+    while len(clauses) < n_forbiddens:
+        hp1, hp2 = rs.choice(categoricals, size=2, replace=False)
+        value1 = hp1.choices[rs.randint(len(hp1.choices))]
+        value2 = hp2.choices[rs.randint(len(hp2.choices))]
+        if default.get(hp1.name) == value1 and \
+                default.get(hp2.name) == value2:
+            continue
+        clauses.append(ForbiddenAndConjunction(
+            ForbiddenEqualsClause(hp1, value1),
+            ForbiddenEqualsClause(hp2, value2)))
+    cs.add_forbidden_clauses(clauses)
+
+
+def check_all_clauses(cs, vector):
+    for clause in cs.forbidden_clauses:
+        if clause.is_forbidden_vector(vector, strict=False):
+            raise ForbiddenValueError()
+
+
+def time_check(check, vectors):
+    start_time = time.time()
+    for vector in vectors:
+        try:
+            check(vector)
+        except ForbiddenValueError:
+            pass
+    return (time.time() - start_time) / len(vectors)
+
+
+def run_test(configuration_space_path):
+    with open(configuration_space_path) as fh:
+        cs = pcs_parser.read(fh)
+    rs = np.random.RandomState(1)
+    add_random_forbiddens(cs, rs)
+
+    print('###')
+    print(configuration_space_path, flush=True)
+    print('Number of forbidden clauses', len(cs.forbidden_clauses))
+
+    # Sample without forbidden clauses to also obtain forbidden vectors
+    vectors = []
+    for i in range(n_configs):
+        vector = cs.get_default_configuration().get_array().copy()
+        idx = rs.randint(len(vector))
+        hp = cs.get_hyperparameter(cs.get_hyperparameter_by_idx(idx))
+        if np.isfinite(vector[idx]):
+            vector[idx] = hp._sample(rs, 1)
+        vectors.append((vector, idx))
+
+    all_clauses = time_check(lambda v: check_all_clauses(cs, v[0]), vectors)
+    compiled = time_check(lambda v: cs._check_forbidden(v[0]), vectors)
+    targeted = time_check(lambda v: cs._check_forbidden(v[0], [v[1]]), vectors)
+
+    matrix = np.array([vector for vector, _ in vectors])
+    start_time = time.time()
+    cs._get_forbidden_mask(matrix)
+    batch = (time.time() - start_time) / len(vectors)
+
+    print('Average time checking all clauses', all_clauses)
+    print('Average time checking the compiled clauses', compiled)
+    print('Average time checking clauses of the changed hyperparameter',
+          targeted)
+    print('Average time checking the compiled clauses in a batch', batch)
+
+
+this_file = os.path.abspath(__file__)
+this_directory = os.path.dirname(this_file)
+configuration_space_path = os.path.join(this_directory, '..',
+                                        "test", "test_searchspaces")
+configuration_space_path = os.path.abspath(configuration_space_path)
+
+for pcs_file in sat_spaces:
+    full_path = os.path.join(configuration_space_path, pcs_file)
+    run_test(full_path)
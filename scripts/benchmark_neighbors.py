@@ -0,0 +1,86 @@
+import time
+
+import numpy as np
+
+from ConfigSpace.hyperparameters import UniformFloatHyperparameter, \
+    NormalFloatHyperparameter, UniformIntegerHyperparameter, \
+    CategoricalHyperparameter
+
+
+n_calls = 10000
+n_neighbors = 4
+values = [0., 0.001, 0.05, 0.5, 0.95, 0.999, 1.]
+
+
+def get_neighbors_one_by_one(value, rs, number):
+    # Previous implementation, one random number per call
+    neighbors = []
+    while len(neighbors) < number:
+        neighbor = rs.normal(value, 0.2)
+        if neighbor < 0 or neighbor > 1:
+            continue
+        neighbors.append(neighbor)
+    return neighbors
+
+
+def get_integer_neighbors_one_by_one(hp, value, rs, number):
+    # Previous implementation, rejects proposals of the current integer
+    neighbors = []
+    while len(neighbors) < number:
+        new_value = max(0, min(1, rs.normal(value, 0.2)))
+        if hp._transform(value) != hp._transform(new_value):
+            neighbors.append(hp._inverse_transform(hp._transform(new_value)))
+    return neighbors
+
+
+def get_categorical_neighbors_one_by_one(hp, value, rs, number):
+    # Previous implementation, rejects the current index and duplicates
+    neighbors = []
+    while len(neighbors) < number:
+        neighbor_idx = rs.randint(0, len(hp.choices))
+        if neighbor_idx != int(value) and neighbor_idx not in neighbors:
+            neighbors.append(float(neighbor_idx))
+    return neighbors
+
+
+def time_calls(get_neighbors, value, calls=n_calls):
+    rs = np.random.RandomState(1)
+    start_time = time.time()
+    for i in range(calls):
+        get_neighbors(value, rs, n_neighbors)
+    return (time.time() - start_time) / calls
+
+
+uniform_float = UniformFloatHyperparameter('uniform_float', 0, 1)
+normal_float = NormalFloatHyperparameter('normal_float', 0, 1)
+
+print('Average time to draw %d neighbors' % n_neighbors)
+for value in values:
+    print('UniformFloatHyperparameter, value %.3f' % value)
+    print('  one by one', time_calls(get_neighbors_one_by_one, value))
+    print('  batched   ', time_calls(uniform_float.get_neighbors, value))
+print('NormalFloatHyperparameter', time_calls(normal_float.get_neighbors, 0.))
+
+for lower, upper in [(1, 2), (1, 3), (1, 10), (1, 1000)]:
+    uniform_integer = UniformIntegerHyperparameter('uniform_integer',
+                                                   lower, upper)
+    value = uniform_integer._inverse_transform(lower)
+    print('UniformIntegerHyperparameter [%d, %d], value %d' %
+          (lower, upper, lower))
+    print('  one by one', time_calls(
+        lambda v, rs, n: get_integer_neighbors_one_by_one(
+            uniform_integer, v, rs, n), value))
+    print('  batched   ', time_calls(uniform_integer.get_neighbors, value))
+
+for num_choices in [5, 100, 1000]:
+    categorical = CategoricalHyperparameter('categorical',
+                                            list(range(num_choices)))
+    for number in [4, num_choices - 1]:
+        print('CategoricalHyperparameter, %d choices, %d neighbors' %
+              (num_choices, number))
+        print('  one by one', time_calls(
+            lambda v, rs, n: get_categorical_neighbors_one_by_one(
+                categorical, v, rs, number), 0., 100))
+        print('  batched   ', time_calls(
+            lambda v, rs, n: categorical.get_neighbors(v, rs, number), 0.,
+            100))
@@ -0,0 +1,74 @@
+import copyreg
+import os
+import pickle
+import time
+
+from ConfigSpace import ConfigurationSpace
+import ConfigSpace.io.pcs as pcs_parser
+
+
+n_repetitions = 20
+spaces = ['autoweka_original.pcs', 'auto-sklearn_2017_04.pcs',
+          'SparrowToRiss-cssc14.pcs', 'cplex12.6.pcs']
+
+# Attributes which earlier versions pickled as the __dict__ of a
+# configuration space
+old_attributes = ['_hyperparameters', '_hyperparameter_idx',
+                  '_idx_to_hyperparameter', '_children', '_parents',
+                  '_conditionals', 'forbidden_clauses', 'random',
+                  '_parent_conditions_of', '_child_conditions_of',
+                  '_parents_of', '_children_of']
+
+
+class OldFormat(object):
+    # Pickles a configuration space like earlier versions did, it is loaded
+    # by the compatibility branch of ConfigurationSpace.__setstate__()
+    def __init__(self, configuration_space):
+        self.configuration_space = configuration_space
+
+    def __reduce__(self):
+        state = {attribute: getattr(self.configuration_space, attribute)
+                 for attribute in old_attributes}
+        return (copyreg._reconstructor, (ConfigurationSpace, object, None),
+                state)
+
+
+def best_time(function):
+    times = []
+    for i in range(n_repetitions):
+        start_time = time.time()
+        function()
+        times.append(time.time() - start_time)
+    return min(times)
+
+
+def run_test(configuration_space_path):
+    with open(configuration_space_path) as fh:
+        cs = pcs_parser.read(fh)
+
+    print('###')
+    print(configuration_space_path, flush=True)
+
+    pickled = pickle.dumps(cs)
+    assert pickle.loads(pickled) == cs
+
+    old_pickled = pickle.dumps(OldFormat(cs))
+    assert pickle.loads(old_pickled) == cs
+
+    print('Size of the pickle (bytes)', len(pickled))
+    print('Size of the old pickle (bytes)', len(old_pickled))
+    print('Time pickling', best_time(lambda: pickle.dumps(cs)))
+    print('Time pickling old', best_time(lambda: pickle.dumps(OldFormat(cs))))
+    print('Time unpickling', best_time(lambda: pickle.loads(pickled)))
+    print('Time unpickling old', best_time(lambda: pickle.loads(old_pickled)))
+
+
+this_file = os.path.abspath(__file__)
+this_directory = os.path.dirname(this_file)
+configuration_space_path = os.path.join(this_directory, '..',
+                                        "test", "test_searchspaces")
+configuration_space_path = os.path.abspath(configuration_space_path)
+
+for pcs_file in spaces:
+    full_path = os.path.join(configuration_space_path, pcs_file)
+    run_test(full_path)
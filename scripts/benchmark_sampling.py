@@ -24,6 +24,7 @@ def run_test(configuration_space_path):
     sampling_time = []
     neighborhood_time = []
     validation_times = []
+    generator = ConfigSpace.util.NeighbourhoodGenerator(cs)
 
     # Sample a little bit
     for i in range(10):
@@ -37,8 +38,7 @@ def run_test(configuration_space_path):
             #c.is_valid_configuration()
 
             if i == 0:
-                neighborhood = ConfigSpace.util.get_one_exchange_neighbourhood(
-                    c, seed=i*j)
+                neighborhood = generator.neighbours(c, i*j)
 
                 start_time = time.time()
                 validation_time = []
@@ -0,0 +1,45 @@
+import gc
+import os
+import tracemalloc
+
+import ConfigSpace.io.pcs as pcs_parser
+
+
+n_configs = 1000
+n_kept = 5
+
+
+def run_test(configuration_space_path):
+    with open(configuration_space_path) as fh:
+        cs = pcs_parser.read(fh)
+    cs.seed(1)
+    # Build the caches of the configuration space before measuring
+    cs.sample_configuration(n_configs)
+    gc.collect()
+
+    print('###')
+    print(configuration_space_path, flush=True)
+
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    # Keep only a handful of the sampled configurations
+    kept = cs.sample_configuration(n_configs)[:n_kept]
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    vector_size = kept[0].get_array().nbytes
+    print('Bytes retained per kept configuration', (end - start) / n_kept)
+    print('Bytes of a vector', vector_size)
+    print('Bytes of the sampled matrix', vector_size * n_configs)
+
+
+this_file = os.path.abspath(__file__)
+this_directory = os.path.dirname(this_file)
+configuration_space_path = os.path.join(this_directory, '..',
+                                        "test", "test_searchspaces")
+configuration_space_path = os.path.abspath(configuration_space_path)
+
+for pcs_file in ['auto-sklearn_2017_04.pcs', 'spear-params.pcs']:
+    full_path = os.path.join(configuration_space_path, pcs_file)
+    run_test(full_path)
@@ -317,6 +317,37 @@ class TestConditions(unittest.TestCase):
                          "input3 == 1) && AND | input4 == 1 && AND | input5 "
                          "== 1)", str(conj3))
 
+    def test_evaluate_vectors(self):
+        hp1 = CategoricalHyperparameter("input1", [0, 1, 2])
+        hp2 = UniformFloatHyperparameter("input2", 0, 10)
+        hp3 = OrdinalHyperparameter("input3", ["low", "medium", "high"])
+        hp4 = Constant("AND", "True")
+
+        conditions = [
+            EqualsCondition(hp4, hp1, 1),
+            NotEqualsCondition(hp4, hp1, 1),
+            InCondition(hp4, hp1, [0, 2]),
+            LessThanCondition(hp4, hp2, 5),
+            GreaterThanCondition(hp4, hp3, "low"),
+        ]
+        conditions.append(AndConjunction(conditions[1], conditions[3]))
+        conditions.append(OrConjunction(conditions[0], conditions[4],
+                                        AndConjunction(conditions[2],
+                                                       conditions[3])))
+
+        vectors = np.array([[0, 0.1, 0, np.nan],
+                            [1, 0.7, 2, np.nan],
+                            [2, np.nan, 1, np.nan],
+                            [np.nan, 0.3, np.nan, np.nan],
+                            [1, 0.1, 1, np.nan]])
+        for condition in conditions:
+            condition.set_vector_idx({"input1": 0, "input2": 1,
+                                      "input3": 2, "AND": 3})
+            expected = [condition.evaluate_vector(vector)
+                        for vector in vectors]
+            np.testing.assert_array_equal(condition.evaluate_vectors(vectors),
+                                          expected)
+
     def test_all_components_have_the_same_child(self):
         hp1 = CategoricalHyperparameter("input1", [0, 1])
         hp2 = CategoricalHyperparameter("input2", [0, 1])
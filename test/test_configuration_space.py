@@ -27,19 +27,24 @@
 # SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from collections import OrderedDict
-from itertools import product
+from itertools import combinations, product
 import json
+import os
+import pickle
 import sys
 import unittest
 
 import numpy as np
 
-from ConfigSpace import ConfigurationSpace, \
-    Configuration, CategoricalHyperparameter, UniformIntegerHyperparameter, \
+from ConfigSpace import ConfigurationSpace, register_configuration_space, \
+    unregister_configuration_space, Configuration, ConfigurationSet, \
+    CategoricalHyperparameter, UniformIntegerHyperparameter, \
     Constant, EqualsCondition, NotEqualsCondition, InCondition, \
     AndConjunction, OrConjunction, ForbiddenEqualsClause, \
-    ForbiddenAndConjunction, UniformFloatHyperparameter
-from ConfigSpace.hyperparameters import NormalFloatHyperparameter
+    ForbiddenInClause, ForbiddenAndConjunction, UniformFloatHyperparameter
+from ConfigSpace.exceptions import ForbiddenValueError
+from ConfigSpace.hyperparameters import NormalFloatHyperparameter, \
+    NormalIntegerHyperparameter, OrdinalHyperparameter
 
 
 def byteify(input):
@@ -497,6 +502,236 @@ class TestConfigurationSpace(unittest.TestCase):
         self.assertRaisesRegexp(ValueError, "violates forbidden clause",
                                 cs._check_forbidden, configuration.get_array())
 
+    def test_forbidden_clause_index(self):
+        cs = ConfigurationSpace()
+        b = CategoricalHyperparameter("b", [0, 1])
+        c = CategoricalHyperparameter("c", [0, 1])
+        cs.add_hyperparameters([b, c])
+        forb1 = ForbiddenAndConjunction(ForbiddenEqualsClause(b, 1),
+                                        ForbiddenEqualsClause(c, 1))
+        cs.add_forbidden_clause(forb1)
+        self.assertEqual(cs._forbidden_clauses_of_idx, {0: [0], 1: [0]})
+
+        # Adding a hyperparameter which is sorted first changes the indices
+        a = CategoricalHyperparameter("a", [0, 1])
+        cs.add_hyperparameter(a)
+        cs.add_forbidden_clauses([ForbiddenEqualsClause(a, 1)])
+        self.assertEqual(cs._forbidden_clauses_of_idx,
+                         {0: [1], 1: [0], 2: [0]})
+
+        vector = np.array([0, 1, 1], dtype=float)
+        self.assertRaisesRegexp(ValueError, "violates forbidden clause "
+                                "\(Forbidden: b == 1 && Forbidden: c == 1\)",
+                                cs._check_forbidden, vector)
+        self.assertRaisesRegexp(ValueError, "violates forbidden clause",
+                                cs._check_forbidden, vector, [2])
+        # Clauses which do not involve a given hyperparameter are not checked
+        cs._check_forbidden(vector, [0])
+        cs._check_forbidden(vector, [])
+
+        vector = np.array([1, 0, 0], dtype=float)
+        self.assertRaisesRegexp(ValueError, "violates forbidden clause "
+                                "Forbidden: a == 1", cs._check_forbidden,
+                                vector)
+        cs._check_forbidden(np.array([np.NaN, 1, np.NaN]))
+
+    def test_forbidden_too_many_value_combinations(self):
+        cs = ConfigurationSpace(seed=1)
+        hps = [CategoricalHyperparameter(name, list(range(1000)))
+               for name in 'abcdef']
+        cs.add_hyperparameters(hps)
+        cs.add_forbidden_clause(ForbiddenEqualsClause(hps[0], 2))
+        # Each group of five hyperparameters packs 1000 ** 5 values, only
+        # four groups fit into the range of exactly representable floats
+        for subset in combinations(hps, 5):
+            cs.add_forbidden_clause(ForbiddenAndConjunction(
+                *[ForbiddenEqualsClause(hp, 1) for hp in subset]))
+        # Too many values for a single group
+        cs.add_forbidden_clause(ForbiddenAndConjunction(
+            *[ForbiddenEqualsClause(hp, 1) for hp in hps]))
+
+        compiled = cs._get_compiled_forbidden_clauses()
+        self.assertEqual(compiled.compiled_positions, [0, 1, 2, 3, 4])
+        self.assertEqual(compiled.residual_positions, [5, 6, 7])
+
+        vectors = np.array([[0, 0, 0, 0, 0, 0], [2, 0, 0, 0, 0, 0],
+                            [1, 1, 1, 1, 1, 0], [0, 1, 1, 1, 1, 1],
+                            [1, 1, 1, 1, 1, 1], [1, 1, 1, 0, 1, 1]],
+                           dtype=float)
+        np.testing.assert_array_equal(
+            cs._get_forbidden_mask(vectors),
+            [False, True, True, True, True, True])
+        self.assertRaises(ForbiddenValueError, cs._check_forbidden,
+                          vectors[3])
+        for configuration in cs.sample_configuration(10):
+            self.assertFalse(cs._get_forbidden_mask(
+                configuration.get_array().reshape((1, -1)))[0])
+
+    def test_validation_cache(self):
+        cs = ConfigurationSpace(validation_cache_size=2)
+        metric = CategoricalHyperparameter("metric", ["minkowski", "other"])
+        cs.add_hyperparameter(metric)
+        # Adding the hyperparameter checked the default configuration
+        self.assertEqual(cs.get_validation_cache_info(), (0, 1, 2, 0))
+
+        legal = np.zeros(1, dtype=float)
+        illegal = np.ones(1, dtype=float)
+        cs._check_configuration(legal)
+        cs._check_configuration(legal)
+        self.assertEqual(cs.get_validation_cache_info(), (1, 2, 2, 1))
+
+        # Modifying the space empties the cache (only the default
+        # configuration is checked again) and cached errors are raised again
+        cs.add_forbidden_clause(ForbiddenEqualsClause(metric, "other"))
+        self.assertEqual(cs.get_validation_cache_info(), (1, 3, 2, 1))
+        for i in range(2):
+            self.assertRaisesRegexp(ValueError, "violates forbidden clause",
+                                    cs._check_configuration, illegal)
+        self.assertEqual(cs.get_validation_cache_info(), (2, 4, 2, 2))
+
+        # The rigorous check is cached separately and the cache is bounded
+        cs._check_configuration_rigorous(Configuration(cs, vector=legal))
+        self.assertRaisesRegexp(ValueError, "Active hyperparameter 'metric' "
+                                "not specified!", cs._check_configuration,
+                                np.array([np.NaN]))
+        self.assertEqual(cs.get_validation_cache_info().currsize, 2)
+
+        cs.set_validation_cache_size(0)
+        self.assertIsNone(cs.get_validation_cache_info())
+
+    def test_check_configuration_delta(self):
+        cs = ConfigurationSpace(seed=1)
+        head = CategoricalHyperparameter('head', [0, 1, 2])
+        left = CategoricalHyperparameter('left', [0, 1])
+        right = CategoricalHyperparameter('right', [0, 1, 2])
+        bottom = CategoricalHyperparameter('bottom', [0, 1])
+        leaf = UniformFloatHyperparameter('leaf', 0, 1)
+        other = UniformIntegerHyperparameter('other', 0, 3)
+        cs.add_hyperparameters([head, left, right, bottom, leaf, other])
+        cs.add_condition(EqualsCondition(left, head, 0))
+        cs.add_condition(InCondition(right, head, [0, 1]))
+        cs.add_condition(OrConjunction(EqualsCondition(bottom, left, 1),
+                                       EqualsCondition(bottom, right, 1)))
+        cs.add_condition(EqualsCondition(leaf, bottom, 1))
+        cs.add_forbidden_clause(ForbiddenAndConjunction(
+            ForbiddenEqualsClause(right, 2), ForbiddenEqualsClause(other, 3)))
+        cs.add_forbidden_clause(ForbiddenEqualsClause(bottom, 0))
+
+        cs._build_index_tables()
+        rs = np.random.RandomState(1)
+        outcomes = set()
+        for configuration in cs.sample_configuration(100):
+            old_vector = configuration.get_array()
+            # The delta check requires a legal configuration to start from
+            try:
+                cs._check_configuration(old_vector)
+            except ValueError:
+                continue
+            for changed_idx in range(len(old_vector)):
+                new_vector = old_vector.copy()
+                hp = cs.get_hyperparameter(
+                    cs.get_hyperparameter_by_idx(changed_idx))
+                new_vector[changed_idx] = hp._sample(rs, 1)
+                # Randomly (de-)activate the descendants
+                for idx in cs._descendants_idx[changed_idx]:
+                    hp = cs.get_hyperparameter(cs.get_hyperparameter_by_idx(idx))
+                    if rs.rand() > 0.5:
+                        new_vector[idx] = hp._sample(rs, 1)
+                    else:
+                        new_vector[idx] = np.NaN
+
+                try:
+                    cs._check_configuration(new_vector)
+                    expected = None
+                except ValueError as e:
+                    expected = e.__class__
+                try:
+                    cs.check_configuration_delta(old_vector, new_vector,
+                                                 changed_idx)
+                    outcome = None
+                except ValueError as e:
+                    outcome = e.__class__
+                self.assertEqual(expected, outcome)
+                outcomes.add(outcome)
+        self.assertEqual(len(outcomes), 3)
+
+    def test_optimize_forbiddens(self):
+        cs = ConfigurationSpace(seed=1)
+        a = CategoricalHyperparameter('a', ['x', 'y', 'z'])
+        b = CategoricalHyperparameter('b', ['x', 'y', 'z'])
+        c = CategoricalHyperparameter('c', [0, 1, 2])
+        d = UniformIntegerHyperparameter('d', 0, 5)
+        cs.add_hyperparameters([a, b, c, d])
+        cs.add_condition(EqualsCondition(c, a, 'x'))
+        cs.add_condition(InCondition(d, a, ['y', 'z']))
+        # Sample from the space without forbidden clauses to also obtain
+        # forbidden configurations
+        vectors = np.array([configuration.get_array() for configuration
+                            in cs.sample_configuration(500)])
+
+        kept = ForbiddenEqualsClause(b, 'z')
+        cs.add_forbidden_clauses([
+            ForbiddenAndConjunction(ForbiddenEqualsClause(a, 'y'),
+                                    ForbiddenEqualsClause(b, 'y')),
+            # Duplicate
+            ForbiddenAndConjunction(ForbiddenEqualsClause(b, 'y'),
+                                    ForbiddenEqualsClause(a, 'y')),
+            # Merged with the first clause
+            ForbiddenAndConjunction(ForbiddenEqualsClause(a, 'z'),
+                                    ForbiddenEqualsClause(b, 'y')),
+            kept,
+            # Subsumed by the previous clause
+            ForbiddenAndConjunction(ForbiddenEqualsClause(b, 'z'),
+                                    ForbiddenEqualsClause(c, 1)),
+            # Inactive, c and d are never active together
+            ForbiddenAndConjunction(ForbiddenEqualsClause(c, 1),
+                                    ForbiddenEqualsClause(d, 3)),
+            # Inactive, c requires a == 'x'
+            ForbiddenAndConjunction(ForbiddenEqualsClause(a, 'y'),
+                                    ForbiddenEqualsClause(c, 2)),
+            # Unsatisfiable, a can not take two values
+            ForbiddenAndConjunction(ForbiddenEqualsClause(a, 'y'),
+                                    ForbiddenInClause(a, ['x', 'z'])),
+        ])
+        forbidden = cs._get_forbidden_mask(vectors)
+        self.assertTrue(np.any(forbidden))
+
+        # Inactive hyperparameters with values can violate the clauses on
+        # hyperparameters which are never active together
+        filled = vectors.copy()
+        filled[:, 2:] = np.where(np.isnan(filled[:, 2:]),
+                                 [c._inverse_transform(1),
+                                  d._inverse_transform(3)],
+                                 filled[:, 2:])
+        forbidden_filled = cs._get_forbidden_mask(filled)
+        inactive = pickle.loads(pickle.dumps(cs))
+        report = inactive.optimize_forbiddens(allow_inactive_with_values=True)
+        self.assertEqual(report['unsatisfiable'], 1)
+        self.assertEqual(report['inactive'], 0)
+        self.assertEqual(report['clauses_after'], 4)
+        np.testing.assert_array_equal(inactive._get_forbidden_mask(filled),
+                                      forbidden_filled)
+
+        report = cs.optimize_forbiddens()
+        self.assertEqual(dict(report), {
+            'clauses_before': 8, 'clauses_after': 2,
+            'literals_before': 15, 'literals_after': 3,
+            'duplicates': 1, 'unsatisfiable': 1, 'inactive': 2, 'subsumed': 1,
+            'merged': 1})
+        self.assertEqual(
+            str(cs.forbidden_clauses),
+            "[(Forbidden: a in {'y', 'z'} && Forbidden: b == 'y'), "
+            "Forbidden: b == 'z']")
+        self.assertIs(cs.forbidden_clauses[1], kept)
+        self.assertEqual(cs._forbidden_clauses_of_idx, {0: [0], 1: [0, 1]})
+        np.testing.assert_array_equal(cs._get_forbidden_mask(vectors),
+                                      forbidden)
+        self.assertFalse(np.array_equal(cs._get_forbidden_mask(filled),
+                                        forbidden_filled))
+
+        report = cs.optimize_forbiddens()
+        self.assertEqual(report['clauses_before'], report['clauses_after'])
+
     def test_eq(self):
         # Compare empty configuration spaces
         cs1 = ConfigurationSpace()
@@ -521,6 +756,212 @@ class TestConfigurationSpace(unittest.TestCase):
         cs1.add_hyperparameter(hp3)
         self.assertFalse(cs1 == cs2)
 
+    def test_get_dictionaries(self):
+        cs = ConfigurationSpace(seed=1)
+        cs.add_hyperparameters([
+            CategoricalHyperparameter("cat", ["a", 1, 2.5, True]),
+            OrdinalHyperparameter("ord", ["low", "high"]),
+            Constant("const", "value"),
+            UniformFloatHyperparameter("uf", 1, 100, log=True, q=0.5),
+            UniformFloatHyperparameter("uf2", -1, 1),
+            NormalFloatHyperparameter("nf", 0, 2, q=0.3),
+            UniformIntegerHyperparameter("ui", 1, 1000, log=True),
+            UniformIntegerHyperparameter("ui2", 0, 10, q=2),
+            NormalIntegerHyperparameter("ni", 10, 3),
+        ])
+        rs = np.random.RandomState(1)
+        vectors = np.array([[np.ravel(hp._sample(rs, 1))[0]
+                             for hp in cs.get_hyperparameters()]
+                            for i in range(50)])
+        # Values which can not be transformed are omitted
+        junk = vectors.copy()
+        mask = rs.rand(*junk.shape) < 0.2
+        junk[mask] = rs.choice([np.NaN, np.inf, -1, 0.5, 7], size=mask.sum())
+        vectors = np.vstack((vectors, junk))
+
+        dictionaries = cs.get_dictionaries(vectors)
+        self.assertEqual(len(dictionaries), 100)
+        for vector, dictionary in zip(vectors, dictionaries):
+            configuration = Configuration(cs, vector=vector.copy())
+            expected = OrderedDict()
+            for key in configuration:
+                value = configuration.get(key)
+                if key in configuration._values:
+                    expected[key] = value
+            self.assertEqual(list(dictionary.items()), list(expected.items()))
+            for key in dictionary:
+                self.assertIs(type(dictionary[key]), type(expected[key]))
+            self.assertEqual(Configuration(cs, vector=vector).get_dictionary(),
+                             dictionary)
+
+    def test_to_columns(self):
+        cs = ConfigurationSpace(seed=1)
+        cs.add_hyperparameters([
+            CategoricalHyperparameter("cat", ["a", 1, 2.5]),
+            OrdinalHyperparameter("ord", ["low", "high"]),
+            Constant("const", "value"),
+            UniformFloatHyperparameter("uf", 1, 100, log=True),
+            UniformIntegerHyperparameter("ui", 0, 10, q=2),
+        ])
+        cs.add_condition(EqualsCondition(cs.get_hyperparameter("uf"),
+                                         cs.get_hyperparameter("cat"), "a"))
+        # Sampling many quantized integers at once is broken
+        configurations = [cs.sample_configuration() for i in range(50)]
+        vectors = np.array([c.get_array() for c in configurations])
+        vectors[0, cs.get_idx_by_hyperparameter_name("ui")] = np.nan
+        vectors[1, cs.get_idx_by_hyperparameter_name("cat")] = 0.5
+
+        columns, categories = cs.to_columns(vectors)
+        self.assertEqual(list(columns), [hp.name for hp in cs.get_hyperparameters()])
+        self.assertEqual(categories, OrderedDict([
+            ("cat", ["a", 1, 2.5]), ("const", ["value"]),
+            ("ord", ["low", "high"])]))
+        self.assertIs(columns["uf"].dtype.type, np.float64)
+        self.assertNotIsInstance(columns["uf"], np.ma.MaskedArray)
+        for name in ["cat", "const", "ord", "ui"]:
+            self.assertIsInstance(columns[name], np.ma.MaskedArray)
+            self.assertIs(columns[name].dtype.type, np.int64)
+
+        for i, dictionary in enumerate(cs.get_dictionaries(vectors)):
+            for name, column in columns.items():
+                if name not in dictionary:
+                    if name == "uf":
+                        self.assertTrue(np.isnan(column[i]))
+                    else:
+                        self.assertIs(column[i], np.ma.masked)
+                elif name in categories:
+                    self.assertEqual(categories[name][column[i]],
+                                     dictionary[name])
+                else:
+                    self.assertEqual(column[i], dictionary[name])
+
+        # Configurations give the same columns as their vectors
+        columns, _ = cs.to_columns(configurations[2:])
+        expected, _ = cs.to_columns(vectors[2:])
+        for name in columns:
+            np.testing.assert_array_equal(columns[name], expected[name])
+        empty, _ = cs.to_columns([])
+        self.assertEqual(len(empty["cat"]), 0)
+
+        array, _ = cs.to_columns(vectors, structured=True)
+        self.assertEqual(array.dtype.names, tuple(columns))
+        self.assertEqual(array.shape, (50, ))
+        for name, column in cs.to_columns(vectors)[0].items():
+            self.assertEqual(array[name].dtype, column.dtype)
+            np.testing.assert_array_equal(array[name].mask,
+                                          np.ma.getmaskarray(column) |
+                                          np.isnan(column.astype(float)))
+            np.testing.assert_array_equal(array[name].compressed(),
+                                          column[~array[name].mask])
+
+    def test_fingerprint(self):
+        hp1 = CategoricalHyperparameter("parent", [0, 1])
+        hp2 = UniformIntegerHyperparameter("child", 0, 10)
+        hp3 = CategoricalHyperparameter("friend", ["0", "1"])
+        cs1 = ConfigurationSpace()
+        cs1.add_hyperparameters([hp1, hp2])
+        cs1.add_condition(EqualsCondition(hp2, hp1, 0))
+        cs2 = ConfigurationSpace(seed=1)
+        cs2.add_hyperparameters([hp2, hp1])
+        cs2.add_condition(EqualsCondition(hp2, hp1, 0))
+
+        fingerprint = cs1.get_fingerprint()
+        self.assertEqual(len(fingerprint), 64)
+        self.assertEqual(fingerprint, cs2.get_fingerprint())
+        self.assertEqual(hash(cs1), hash(cs2))
+        self.assertEqual(fingerprint,
+                         pickle.loads(pickle.dumps(cs1)).get_fingerprint())
+
+        cs1.add_hyperparameter(hp3)
+        self.assertNotEqual(fingerprint, cs1.get_fingerprint())
+        self.assertNotEqual(cs1, cs2)
+        # Only differs in the type of the choices
+        cs2.add_hyperparameter(CategoricalHyperparameter("friend", [0, 1]))
+        self.assertEqual(str(cs1), str(cs2))
+        self.assertNotEqual(cs1, cs2)
+
+        cs1.add_forbidden_clause(ForbiddenEqualsClause(hp1, 1))
+        fingerprint = cs1.get_fingerprint()
+        cs1.optimize_forbiddens()
+        self.assertEqual(fingerprint, cs1.get_fingerprint())
+
+    def test_pickle(self):
+        cs = ConfigurationSpace(seed=1, validation_cache_size=10)
+        hp1 = CategoricalHyperparameter("parent", [0, 1])
+        hp2 = CategoricalHyperparameter("friend", ["a", "b", "c"])
+        hp3 = UniformIntegerHyperparameter("child", 0, 10)
+        hp4 = UniformFloatHyperparameter("grandchild", 0, 1)
+        cs.add_hyperparameters([hp4, hp3, hp2, hp1])
+        cs.add_condition(AndConjunction(EqualsCondition(hp3, hp1, 0),
+                                        InCondition(hp3, hp2, ["a", "b"])))
+        cs.add_condition(EqualsCondition(hp4, hp3, 5))
+        cs.add_forbidden_clause(ForbiddenAndConjunction(
+            ForbiddenEqualsClause(hp1, 1), ForbiddenEqualsClause(hp2, "c")))
+        cs.sample_configuration()
+
+        restored = pickle.loads(pickle.dumps(cs))
+        self.assertEqual(restored, cs)
+        self.assertEqual(restored._hyperparameter_idx, cs._hyperparameter_idx)
+        self.assertEqual(restored._idx_to_hyperparameter,
+                         cs._idx_to_hyperparameter)
+        self.assertEqual(restored._conditionals, cs._conditionals)
+        self.assertEqual(restored._parent_conditions_of,
+                         cs._parent_conditions_of)
+        self.assertEqual(restored._child_conditions_of,
+                         cs._child_conditions_of)
+        self.assertEqual(restored._children, cs._children)
+        self.assertEqual(restored._parents, cs._parents)
+        self.assertEqual(restored._parents_of, cs._parents_of)
+        self.assertEqual(restored._children_of, cs._children_of)
+        self.assertEqual(restored._forbidden_clauses_of_idx,
+                         cs._forbidden_clauses_of_idx)
+        self.assertEqual(restored.get_validation_cache_info().maxsize, 10)
+        # The random state is restored as well
+        for original, copied in zip(cs.sample_configuration(10),
+                                    restored.sample_configuration(10)):
+            self.assertEqual(original, copied)
+        vector = np.array([2, 1, np.nan, np.nan])
+        self.assertRaises(ForbiddenValueError, restored._check_forbidden,
+                          vector)
+
+    def test_pickle_old_format(self):
+        # Pickled by an earlier version, which stored the whole __dict__ of
+        # the configuration space and of the configuration
+        cs = ConfigurationSpace(seed=1)
+        hp1 = CategoricalHyperparameter("parent", [0, 1])
+        hp2 = CategoricalHyperparameter("friend", ["a", "b", "c"])
+        hp3 = UniformIntegerHyperparameter("child", 0, 10)
+        hp4 = UniformFloatHyperparameter("grandchild", 0, 1)
+        cs.add_hyperparameters([hp4, hp3, hp2, hp1])
+        cs.add_condition(AndConjunction(EqualsCondition(hp3, hp1, 0),
+                                        InCondition(hp3, hp2, ["a", "b"])))
+        cs.add_condition(EqualsCondition(hp4, hp3, 5))
+        cs.add_forbidden_clause(ForbiddenAndConjunction(
+            ForbiddenEqualsClause(hp1, 1), ForbiddenEqualsClause(hp2, "c")))
+
+        path = os.path.join(os.path.dirname(__file__), 'test_searchspaces',
+                            'old_pickle_format.pkl')
+        with open(path, 'rb') as fh:
+            restored, configuration = pickle.load(fh)
+        self.assertEqual(restored, cs)
+        self.assertEqual(restored._forbidden_clauses_of_idx,
+                         cs._forbidden_clauses_of_idx)
+        self.assertEqual(restored._children, cs._children)
+        self.assertEqual(restored._parents_of, cs._parents_of)
+        self.assertIs(configuration.configuration_space, restored)
+        self.assertEqual(configuration,
+                         Configuration(cs, {"parent": 0, "friend": "a",
+                                            "child": 5, "grandchild": 0.5}))
+        self.assertEqual(configuration["grandchild"], 0.5)
+        restored.sample_configuration(10)
+        vector = np.array([2, 1, np.nan, np.nan])
+        self.assertRaises(ForbiddenValueError, restored._check_forbidden,
+                          vector)
+
+        # And pickled again in the current format
+        copied = pickle.loads(pickle.dumps(configuration))
+        self.assertEqual(copied, configuration)
+
     def test_neq(self):
         cs1 = ConfigurationSpace()
         self.assertNotEqual(cs1, "ConfigurationSpace")
@@ -599,6 +1040,12 @@ class TestConfigurationSpace(unittest.TestCase):
                 for j in range(100):
                     self.assertEqual(samples[-1][j], samples[-2][j])
 
+        # Sampled configurations own their vector instead of keeping the
+        # whole sampled matrix alive
+        for sample in cs.sample_configuration(10):
+            self.assertIsNone(sample.get_array().base)
+            self.assertTrue(sample.get_array().flags['OWNDATA'])
+
     def test_sample_wrong_argument(self):
         cs = ConfigurationSpace()
         self.assertRaisesRegex(TypeError,
@@ -647,6 +1094,167 @@ class ConfigurationTest(unittest.TestCase):
         # b) that the dictionary representation of both are the same
         self.assertEqual(c1, c2)
 
+    def test_slots(self):
+        vector = np.array([
+            self.cs.get_hyperparameter('child')._inverse_transform(5),
+            self.cs.get_hyperparameter('friend')._inverse_transform(3), 1])
+        c1 = Configuration(self.cs, vector=vector)
+        c2 = Configuration(self.cs, values={'parent': 1, 'child': 5,
+                                            'friend': 3})
+        self.assertFalse(hasattr(c1, '__dict__'))
+        self.assertRaises(AttributeError, setattr, c1, 'attribute', 1)
+        self.assertIsNone(c1._values)
+        self.assertEqual(c1._num_hyperparameters, 3)
+        # The keys are shared by all configurations
+        self.assertEqual(c1.keys(), ['child', 'friend', 'parent'])
+        self.assertIs(c1.keys(), c2.keys())
+
+        self.assertEqual(c1['child'], 5)
+        self.assertEqual(c1._values, {'child': 5})
+        self.assertEqual(c1, c2)
+        c3 = pickle.loads(pickle.dumps(c1))
+        self.assertEqual(c1, c3)
+        self.assertEqual(c3.configuration_space, self.cs)
+
+    def test_eq_and_hash(self):
+        cs = ConfigurationSpace()
+        a = cs.add_hyperparameter(CategoricalHyperparameter("a", [0, 1]))
+        b = cs.add_hyperparameter(UniformFloatHyperparameter("b", 1, 100,
+                                                              log=True))
+        cs.add_condition(EqualsCondition(b, a, 1))
+        cs2 = ConfigurationSpace()
+        cs2.add_hyperparameters([a, b])
+        cs2.add_condition(EqualsCondition(b, a, 1))
+
+        c1 = Configuration(cs, vector=np.array([1, 0.123456789012345]))
+        # Created from the decoded values, the vector differs slightly
+        c2 = Configuration(cs, values=c1.get_dictionary())
+        c3 = Configuration(cs2, values=c1.get_dictionary())
+        self.assertEqual(c1, c2)
+        self.assertEqual(c1, c3)
+        self.assertEqual(hash(c1), hash(c2))
+        self.assertEqual(hash(c1), hash(c3))
+        self.assertEqual(len({c1, c2, c3}), 1)
+
+        # Inactive hyperparameters with differently encoded NaNs
+        c4 = Configuration(cs, vector=np.array([0, np.NaN]))
+        c5 = Configuration(cs, vector=np.array([0, -np.NaN]))
+        self.assertEqual(c4, c5)
+        self.assertEqual(hash(c4), hash(c5))
+        self.assertNotEqual(c1, c4)
+
+        c2['b'] = 50.0
+        self.assertNotEqual(c1, c2)
+        self.assertNotEqual(hash(c1), hash(c2))
+
+        cs2.add_hyperparameter(UniformIntegerHyperparameter("c", 0, 10))
+        self.assertNotEqual(c1, c3)
+
+        # The cached hash does not depend on the configuration space, which
+        # can still be modified
+        cs.add_forbidden_clause(ForbiddenEqualsClause(b, 50.0))
+        c6 = Configuration(cs, vector=c1.get_array())
+        self.assertEqual(c1, c6)
+        self.assertEqual(hash(c1), hash(c6))
+        self.assertEqual(len({c1, c6}), 1)
+
+    def test_with_values(self):
+        cs = ConfigurationSpace()
+        a = CategoricalHyperparameter("a", ["x", "y"])
+        b = CategoricalHyperparameter("b", ["u", "v"])
+        c = UniformFloatHyperparameter("c", 0, 1, default=0.25)
+        d = UniformIntegerHyperparameter("d", 0, 5, default=1)
+        cs.add_hyperparameters([a, b, c, d])
+        cs.add_condition(EqualsCondition(b, a, "x"))
+        cs.add_condition(EqualsCondition(c, b, "u"))
+        cs.add_forbidden_clause(ForbiddenAndConjunction(
+            ForbiddenEqualsClause(a, "y"), ForbiddenEqualsClause(d, 3)))
+        default = cs.get_default_configuration()
+        vector = default.get_array().copy()
+
+        # Descendants which become inactive are removed
+        config = default.with_values(a="y")
+        self.assertEqual(config.get_dictionary(), {"a": "y", "d": 1})
+        self.assertEqual(config, Configuration(cs, {"a": "y", "d": 1}))
+        np.testing.assert_array_equal(default.get_array(), vector)
+        # The changed vector is not copied again on the first modification
+        changed = config.get_array()
+        config["d"] = 2
+        self.assertIs(config.get_array(), changed)
+        config["d"] = 1
+
+        # Children which become active get their default value
+        config = config.with_values(a="x", d=2)
+        self.assertEqual(config.get_dictionary(),
+                         {"a": "x", "b": "u", "c": 0.25, "d": 2})
+        config = config.with_values(b="v")
+        self.assertEqual(config.get_dictionary(), {"a": "x", "b": "v", "d": 2})
+        self.assertEqual(config.with_values(**{"c": 0.5, "b": "u"})["c"], 0.5)
+
+        self.assertRaisesRegex(ForbiddenValueError,
+                               "Given vector violates forbidden clause",
+                               default.with_values, a="y", d=3)
+        self.assertRaisesRegex(ValueError,
+                               "Inactive hyperparameter 'c' must not be "
+                               "specified", config.with_values, c=0.5)
+        self.assertRaisesRegex(ValueError, "Illegal value z for "
+                               "hyperparameter a", config.with_values, a="z")
+        self.assertRaises(KeyError, config.with_values, e=1)
+
+        # Nothing changed, the vector is shared until it is modified
+        same = default.with_values(a="x")
+        self.assertIs(same.get_array(), default.get_array())
+        same["d"] = 4
+        self.assertIsNot(same.get_array(), default.get_array())
+        np.testing.assert_array_equal(default.get_array(), vector)
+        self.assertEqual(same["d"], 4)
+
+        # Modifying the source does not change a configuration sharing its
+        # vector
+        for source in [cs.get_default_configuration(),
+                       Configuration(cs, {"a": "x", "b": "u", "c": 0.25,
+                                          "d": 1})]:
+            same = source.with_values(a="x")
+            self.assertEqual(hash(same), hash(source))
+            source["d"] = 4
+            self.assertEqual(same["d"], 1)
+            np.testing.assert_array_equal(same.get_array(), vector)
+            self.assertEqual(same, default)
+            self.assertEqual(hash(same), hash(default))
+            self.assertNotEqual(same, source)
+
+    def test_pickle_registered_configuration_space(self):
+        cs = ConfigurationSpace(seed=1)
+        a = cs.add_hyperparameter(CategoricalHyperparameter("a", [0, 1]))
+        b = cs.add_hyperparameter(UniformFloatHyperparameter("b", 0, 1))
+        cs.add_condition(EqualsCondition(b, a, 1))
+        configurations = cs.sample_configuration(20)
+        full = [pickle.dumps(configuration)
+                for configuration in configurations]
+
+        fingerprint = register_configuration_space(cs)
+        self.addCleanup(unregister_configuration_space, cs)
+        self.assertEqual(fingerprint, cs.get_fingerprint())
+        for configuration, full_pickle in zip(configurations, full):
+            compact = pickle.dumps(configuration)
+            self.assertLess(len(compact), len(full_pickle))
+            restored = pickle.loads(compact)
+            self.assertIs(restored.configuration_space, cs)
+            self.assertEqual(restored, configuration)
+            np.testing.assert_array_equal(restored.get_array(),
+                                          configuration.get_array())
+
+            # The full pickle can still be loaded
+            restored = pickle.loads(full_pickle)
+            self.assertIsNot(restored.configuration_space, cs)
+            self.assertEqual(restored, configuration)
+
+        unregister_configuration_space(cs)
+        self.assertRaisesRegex(ValueError, "Cannot unpickle a configuration "
+                               "of the configuration space with fingerprint "
+                               "%s" % fingerprint, pickle.loads, compact)
+        self.assertEqual(pickle.dumps(configurations[0]), full[0])
+
     def test_uniformfloat_transform(self):
         """This checks whether a value sampled through the configuration
         space (it does not happend when the variable is sampled alone) stays
@@ -738,3 +1346,76 @@ class ConfigurationTest(unittest.TestCase):
 
 
 
+
+
+class ConfigurationSetTest(unittest.TestCase):
+    def setUp(self):
+        self.cs = ConfigurationSpace(seed=1)
+        hp1 = CategoricalHyperparameter("parent", [0, 1])
+        hp2 = UniformFloatHyperparameter("child", 0, 1)
+        self.cs.add_hyperparameters([hp1, hp2])
+        self.cs.add_condition(EqualsCondition(hp2, hp1, 0))
+
+    def test_add_and_intern(self):
+        configurations = self.cs.sample_configuration(20)
+        configuration_set = ConfigurationSet(self.cs, configurations[:10])
+        self.assertEqual(len(configuration_set), len(set(configurations[:10])))
+
+        for configuration in configurations[:10]:
+            duplicate = Configuration(self.cs,
+                                      vector=configuration.get_array().copy())
+            self.assertIn(duplicate, configuration_set)
+            self.assertIs(configuration_set.add(duplicate),
+                          configuration_set.get(configuration))
+        self.assertEqual(len(configuration_set), len(set(configurations[:10])))
+
+        new = [c for c in configurations[10:] if c not in configuration_set]
+        self.assertIsNone(configuration_set.get(new[0]))
+        self.assertIs(configuration_set.add(new[0]), new[0])
+        self.assertIn(new[0], configuration_set)
+        configuration_set.remove(new[0])
+        self.assertNotIn(new[0], configuration_set)
+        self.assertRaises(KeyError, configuration_set.remove, new[0])
+        configuration_set.discard(new[0])
+
+        self.assertNotIn("not a configuration", configuration_set)
+        other_cs = ConfigurationSpace()
+        other_cs.add_hyperparameter(UniformFloatHyperparameter("x", 0, 1))
+        other = other_cs.get_default_configuration()
+        self.assertNotIn(other, configuration_set)
+        self.assertRaisesRegex(ValueError, "Configuration belongs to a "
+                               "different configuration space.",
+                               configuration_set.add, other)
+
+    def test_set_algebra(self):
+        configurations = list(ConfigurationSet(
+            self.cs, self.cs.sample_configuration(30)))[:12]
+        first = ConfigurationSet(self.cs, configurations[:8])
+        second = ConfigurationSet(self.cs, configurations[4:])
+
+        self.assertEqual(list(first | second), configurations)
+        self.assertEqual(list(first & second), configurations[4:8])
+        self.assertEqual(list(first - second), configurations[:4])
+        self.assertEqual(first.union(second), second.union(first))
+        self.assertNotEqual(first, second)
+        # Configurations in both sets are taken from the left operand
+        copies = ConfigurationSet(self.cs, [
+            Configuration(self.cs, vector=c.get_array().copy())
+            for c in configurations[4:8]])
+        for configuration, expected in zip(first & copies,
+                                           configurations[4:8]):
+            self.assertIs(configuration, expected)
+
+        other_cs = ConfigurationSpace()
+        other_cs.add_hyperparameter(UniformFloatHyperparameter("x", 0, 1))
+        self.assertRaises(ValueError, first.union,
+                          ConfigurationSet(other_cs))
+
+    def test_get_array(self):
+        configurations = self.cs.sample_configuration(10)
+        configuration_set = ConfigurationSet(self.cs, configurations)
+        array = configuration_set.get_array()
+        self.assertEqual(array.shape, (len(configuration_set), 2))
+        for row, configuration in zip(array, configuration_set):
+            np.testing.assert_array_equal(row, configuration.get_array())
+        self.assertEqual(ConfigurationSet(self.cs).get_array().shape, (0, 2))
@@ -33,9 +33,10 @@ import warnings
 import numpy as np
 
 from ConfigSpace.hyperparameters import \
-    UniformIntegerHyperparameter, CategoricalHyperparameter
+    UniformIntegerHyperparameter, CategoricalHyperparameter, \
+    OrdinalHyperparameter
 from ConfigSpace.forbidden import ForbiddenEqualsClause, \
-    ForbiddenInClause, ForbiddenAndConjunction
+    ForbiddenInClause, ForbiddenAndConjunction, CompiledForbiddenClauses
 
 
 class TestForbidden(unittest.TestCase):
@@ -183,3 +184,78 @@ class TestForbidden(unittest.TestCase):
             self.assertEqual(results[i], is_forbidden)
 
             self.assertFalse(total_and.is_forbidden({}, strict=False))
+
+    def test_and_conjunction_vector(self):
+        hp1 = CategoricalHyperparameter("parent", [0, 1])
+        hp2 = UniformIntegerHyperparameter("child", 0, 2)
+        hp3 = UniformIntegerHyperparameter("child2", 0, 2)
+
+        and1 = ForbiddenAndConjunction(ForbiddenEqualsClause(hp1, 1),
+                                       ForbiddenInClause(hp2, [2]))
+        total_and = ForbiddenAndConjunction(and1, ForbiddenEqualsClause(hp3, 0))
+        self.assertEqual(len(total_and.dlcs), 3)
+        self.assertIsNone(total_and.vector_ids)
+        self.assertFalse(total_and.is_forbidden_vector([1, 1, 0], strict=False))
+
+        total_and.set_vector_idx({'parent': 0, 'child': 1, 'child2': 2})
+        self.assertEqual(total_and.vector_ids, (0, 1, 2))
+        self.assertEqual(and1.vector_ids, (0, 1))
+        self.assertTrue(total_and.is_forbidden_vector(
+            [1, hp2._inverse_transform(2), hp3._inverse_transform(0)]))
+        self.assertFalse(total_and.is_forbidden_vector(
+            [1, hp2._inverse_transform(2), np.NaN], strict=False))
+        self.assertFalse(total_and.is_forbidden_vector([1, 1], strict=False))
+        self.assertRaisesRegexp(ValueError, "you are \(at least\) missing '2'",
+                                total_and.is_forbidden_vector, [1, 1])
+
+    def test_compiled_forbidden_clauses(self):
+        hp1 = CategoricalHyperparameter("parent", ["a", "b", "c"])
+        hp2 = OrdinalHyperparameter("child", ["low", "medium", "high"])
+        hp3 = CategoricalHyperparameter("child2", [0, 1])
+        hp4 = UniformIntegerHyperparameter("child3", 0, 2)
+        hyperparameter_to_idx = {'parent': 0, 'child': 1, 'child2': 2,
+                                 'child3': 3}
+
+        clauses = [
+            ForbiddenAndConjunction(ForbiddenEqualsClause(hp1, "a"),
+                                    ForbiddenEqualsClause(hp2, "high")),
+            ForbiddenAndConjunction(ForbiddenInClause(hp1, ["b", "c"]),
+                                    ForbiddenEqualsClause(hp2, "low")),
+            ForbiddenAndConjunction(ForbiddenEqualsClause(hp1, "c"),
+                                    ForbiddenEqualsClause(hp3, 1),
+                                    ForbiddenEqualsClause(hp2, "medium")),
+            ForbiddenEqualsClause(hp3, 0),
+            # Not compiled, involves an integer hyperparameter
+            ForbiddenAndConjunction(ForbiddenEqualsClause(hp1, "b"),
+                                    ForbiddenEqualsClause(hp4, 1)),
+            # Not compiled, two literals for the same hyperparameter
+            ForbiddenAndConjunction(ForbiddenEqualsClause(hp1, "b"),
+                                    ForbiddenInClause(hp1, ["a", "b"])),
+        ]
+        for clause in clauses:
+            clause.set_vector_idx(hyperparameter_to_idx)
+
+        compiled = CompiledForbiddenClauses(clauses)
+        self.assertEqual(compiled.compiled_positions, [0, 1, 2, 3])
+        self.assertEqual(compiled.residual_positions, [4, 5])
+
+        values = [[np.NaN, 0, 1, 2, 0.5]] * 3 + [[np.NaN, 0, 0.5, 1]]
+        vectors = np.array(list(product(*values)))
+        mask = compiled.get_forbidden_mask(vectors)
+        for vector, forbidden in zip(vectors, mask):
+            expected = any(clauses[position].is_forbidden_vector(
+                vector, strict=False)
+                for position in compiled.compiled_positions)
+            self.assertEqual(forbidden, expected)
+
+            position = compiled.get_violated_clause(vector)
+            if expected:
+                self.assertTrue(clauses[position].is_forbidden_vector(vector))
+            else:
+                self.assertIsNone(position)
+
+        compiled = CompiledForbiddenClauses(clauses, max_keys_per_clause=1)
+        self.assertEqual(compiled.compiled_positions, [0, 2, 3])
+        compiled = CompiledForbiddenClauses([])
+        self.assertFalse(np.any(compiled.get_forbidden_mask(vectors)))
+        self.assertIsNone(compiled.get_violated_clause(vectors[0]))
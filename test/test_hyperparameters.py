@@ -656,6 +656,165 @@ class TestHyperparameters(unittest.TestCase):
         self.assertEqual(f1.get_neighbors(3, rs=None), [2])
         self.assertEqual(f1.get_neighbors("hot", transform =True, rs=None), ["warm"])
         self.assertEqual(f1.get_neighbors("cold", transform =True, rs=None), ["freezing", "warm"])
+        neighbors, owners = f1.get_neighbors_vectors(np.array([0, 1, 3]))
+        np.testing.assert_array_equal(neighbors, [1, 0, 2, 2])
+        np.testing.assert_array_equal(owners, [0, 1, 1, 2])
+
+    def test_uniformfloat_get_neighbors(self):
+        hp = UniformFloatHyperparameter("param", 10, 20)
+        for value in [0, 0.01, 0.5, 0.99, 1]:
+            # Same neighbors as drawing one sample after the other
+            rs = np.random.RandomState(1)
+            expected = []
+            while len(expected) < 7:
+                sample = rs.normal(value, 0.2)
+                if 0 <= sample <= 1:
+                    expected.append(sample)
+            neighbors = hp.get_neighbors(value, np.random.RandomState(1), 7)
+            self.assertEqual(neighbors, expected)
+
+            neighbors = hp.get_neighbors(value, np.random.RandomState(1), 7,
+                                         transform=True)
+            self.assertEqual(neighbors,
+                             [hp._transform(sample) for sample in expected])
+            for neighbor in neighbors:
+                self.assertTrue(10 <= neighbor <= 20)
+
+            neighbors, owners = hp.get_neighbors_vectors(
+                np.array([value]), np.random.RandomState(1), 7)
+            np.testing.assert_array_equal(neighbors, expected)
+            np.testing.assert_array_equal(owners, [0] * 7)
+
+        # Neighbors of many values, grouped by value
+        values = np.array([0, 0.5, 1, 0.2])
+        neighbors, owners = hp.get_neighbors_vectors(
+            values, np.random.RandomState(1), np.array([4, 0, 2, 3]))
+        np.testing.assert_array_equal(owners, [0, 0, 0, 0, 2, 2, 3, 3, 3])
+        self.assertTrue(np.all((neighbors >= 0) & (neighbors <= 1)))
+        self.assertTrue(np.all(neighbors[:4] < 0.8))
+        self.assertTrue(np.all(neighbors[4:6] > 0.2))
+
+    def test_normalfloat_get_neighbors(self):
+        hp = NormalFloatHyperparameter("param", 5, 2)
+        rs = np.random.RandomState(1)
+        expected = [rs.normal(5, 2) for _ in range(4)]
+        self.assertEqual(hp.get_neighbors(5, np.random.RandomState(1)),
+                         expected)
+        rs = np.random.RandomState(1)
+        expected = [rs.normal(value, 2) for value in [5, 5, 1, 1]]
+        neighbors, owners = hp.get_neighbors_vectors(
+            np.array([5, 1]), np.random.RandomState(1), 2)
+        np.testing.assert_array_equal(neighbors, expected)
+        np.testing.assert_array_equal(owners, [0, 0, 1, 1])
+
+    def test_uniforminteger_get_neighbors(self):
+        # Only one other value
+        hp = UniformIntegerHyperparameter("param", 1, 2)
+        rs = np.random.RandomState(1)
+        value = hp._inverse_transform(1)
+        self.assertEqual(hp.get_neighbors(value, rs, 100, transform=True),
+                         [2] * 100)
+        self.assertEqual(hp.get_neighbors(value, rs, 3),
+                         [hp._inverse_transform(2)] * 3)
+
+        hp = UniformIntegerHyperparameter("param", 1, 3)
+        value = hp._inverse_transform(2)
+        neighbors = hp.get_neighbors(value, rs, 10000, transform=True)
+        self.assertEqual(set(neighbors), {1, 3})
+        self.assertAlmostEqual(neighbors.count(1) / 10000, 0.5, places=1)
+
+        # Wide ranges are rejection sampled
+        hp = UniformIntegerHyperparameter("param", 1, 1000000, log=True)
+        for number in [1, 2, 3, 1000, 1000000]:
+            value = hp._inverse_transform(number)
+            neighbors = hp.get_neighbors(value, rs, 100, transform=True)
+            self.assertEqual(len(neighbors), 100)
+            self.assertNotIn(number, neighbors)
+            for neighbor in neighbors:
+                self.assertTrue(hp.is_legal(neighbor))
+
+        # The largest random number does not draw past the last integer,
+        # although the masses sum up to slightly more than their cumulative
+        # sum
+        class LargestRandomState(object):
+            def random_sample(self, size):
+                return np.full(size, np.nextafter(1, 0))
+
+        hp = UniformIntegerHyperparameter("param", 1, 10)
+        for value in [0.3, 0.49, 0.56, 0.57]:
+            neighbors = hp.get_neighbors(value, LargestRandomState(), 3,
+                                         transform=True)
+            self.assertEqual(len(neighbors), 3)
+            self.assertNotIn(hp._transform(value), neighbors)
+
+    def test_integer_get_neighbors_vectors(self):
+        for hp, numbers in [
+                (UniformIntegerHyperparameter("param", 1, 10), [1, 6]),
+                (UniformIntegerHyperparameter("param", 1, 1000, log=True),
+                 [1, 500]),
+                (UniformIntegerHyperparameter("param", 0, 100, q=5), [0, 45]),
+                (NormalIntegerHyperparameter("param", 5, 2), [5, -3])]:
+            values = np.array([hp._inverse_transform(number)
+                               for number in numbers], dtype=float)
+            # Same neighbors as drawing them value by value
+            for value in values:
+                neighbors, owners = hp.get_neighbors_vectors(
+                    np.array([value]), np.random.RandomState(1), 5)
+                self.assertEqual(
+                    neighbors.tolist(),
+                    hp.get_neighbors(value, np.random.RandomState(1), 5))
+                np.testing.assert_array_equal(owners, [0] * 5)
+
+            neighbors, owners = hp.get_neighbors_vectors(
+                values, np.random.RandomState(1), np.array([2, 3]))
+            np.testing.assert_array_equal(owners, [0, 0, 1, 1, 1])
+            for neighbor, owner in zip(neighbors, owners):
+                self.assertTrue(hp.is_legal_vector(neighbor))
+                self.assertNotEqual(hp._transform(neighbor),
+                                    hp._transform(values[owner]))
+
+    def test_normalint_get_neighbors(self):
+        hp = NormalIntegerHyperparameter("param", 5, 0.3)
+        rs = np.random.RandomState(1)
+        neighbors = hp.get_neighbors(5, rs, 1000, transform=True)
+        self.assertEqual(set(neighbors), {4, 6})
+        neighbors = hp.get_neighbors(5, np.random.RandomState(2), 10,
+                                     transform=True)
+        self.assertEqual(hp.get_neighbors(5, np.random.RandomState(2), 10),
+                         [hp._inverse_transform(neighbor)
+                          for neighbor in neighbors])
+
+        hp = NormalIntegerHyperparameter("param", 5, 20)
+        neighbors = hp.get_neighbors(5, rs, 1000, transform=True)
+        self.assertEqual(len(neighbors), 1000)
+        self.assertNotIn(5, neighbors)
+
+    def test_categorical_get_neighbors(self):
+        hp = CategoricalHyperparameter("param", list(range(100)))
+        rs = np.random.RandomState(1)
+        for number in [1, 4, 50, 99]:
+            neighbors = hp.get_neighbors(17, rs, number)
+            self.assertEqual(len(neighbors), number)
+            self.assertEqual(len(set(neighbors)), number)
+            self.assertNotIn(17., neighbors)
+            for neighbor in neighbors:
+                self.assertIsInstance(neighbor, float)
+                self.assertTrue(hp.is_legal_vector(neighbor))
+
+        # All other choices in order
+        self.assertEqual(hp.get_neighbors(0, rs), list(range(1, 100)))
+        hp = CategoricalHyperparameter("param", ["a", "b", "c"])
+        self.assertEqual(hp.get_neighbors(1, rs, transform=True), ["a", "c"])
+        self.assertIn(hp.get_neighbors(1, rs, 1, transform=True), [["a"], ["c"]])
+
+        # All other choices of many values at once
+        neighbors, owners = hp.get_neighbors_vectors(np.array([1, 0]), rs)
+        np.testing.assert_array_equal(neighbors, [0, 2, 1, 2])
+        np.testing.assert_array_equal(owners, [0, 0, 1, 1])
+        neighbors, owners = hp.get_neighbors_vectors(np.array([1, 0, 2]),
+                                                     rs, 1)
+        np.testing.assert_array_equal(owners, [0, 1, 2])
+        self.assertTrue(np.all(neighbors != [1, 0, 2]))
 
     def test_get_num_neighbors(self):
         f1 = OrdinalHyperparameter("temp", 
@@ -35,9 +35,14 @@ from ConfigSpace import Configuration, ConfigurationSpace, UniformIntegerHyperpa
     UniformFloatHyperparameter, CategoricalHyperparameter, Constant, \
     EqualsCondition, AndConjunction, OrConjunction
 from ConfigSpace.io.pcs import read
+from ConfigSpace.forbidden import ForbiddenAndConjunction, \
+    ForbiddenEqualsClause
+from ConfigSpace.hyperparameters import OrdinalHyperparameter
 from ConfigSpace.util import impute_inactive_values, get_random_neighbor, \
-    get_one_exchange_neighbourhood, deactivate_inactive_hyperparameters, \
-    check_neighbouring_config_vector
+    get_one_exchange_neighbourhood, get_one_exchange_neighbourhood_array, \
+    deactivate_inactive_hyperparameters, check_neighbouring_config_vector, \
+    check_neighbouring_config_vectors, NeighbourhoodGenerator, \
+    get_random_neighbors, set_neighbourhood_cache_size, get_neighbourhood_cache_info
 
 
 class UtilTest(unittest.TestCase):
@@ -121,14 +126,14 @@ class UtilTest(unittest.TestCase):
         hp = UniformIntegerHyperparameter('a', 1, 10)
         all_neighbors = self._test_get_one_exchange_neighbourhood(hp)
         all_neighbors = [neighbor['a'] for neighbor in all_neighbors]
-        self.assertAlmostEqual(5.79, np.mean(all_neighbors), places=2)
-        self.assertAlmostEqual(4.99, np.var(all_neighbors), places=2)
+        self.assertAlmostEqual(6.03, np.mean(all_neighbors), places=2)
+        self.assertAlmostEqual(4.76, np.var(all_neighbors), places=2)
         hp = UniformIntegerHyperparameter('a', 1, 10, log=True)
         all_neighbors = self._test_get_one_exchange_neighbourhood(hp)
         all_neighbors = [neighbor['a'] for neighbor in all_neighbors]
         # Default value is 3.16
-        self.assertAlmostEqual(3.55, np.mean(all_neighbors), places=2)
-        self.assertAlmostEqual(5.91, np.var(all_neighbors), places=2)
+        self.assertAlmostEqual(3.715, np.mean(all_neighbors), places=2)
+        self.assertAlmostEqual(5.49, np.var(all_neighbors), places=2)
 
     def test_random_neighbor_cat(self):
         hp = CategoricalHyperparameter('a', [5, 6, 7, 8])
@@ -164,6 +169,37 @@ class UtilTest(unittest.TestCase):
             new_config = get_random_neighbor(configuration, i)
             self.assertNotEqual(configuration, new_config)
 
+    def test_random_neighbors(self):
+        mini_autosklearn_config_space_path = os.path.join(
+            os.path.dirname(__file__), 'test_searchspaces',
+            'mini_autosklearn_original.pcs')
+        with open(mini_autosklearn_config_space_path) as fh:
+            cs = read(fh)
+
+        cs.seed(1)
+        for i in range(10):
+            configuration = cs.sample_configuration()
+            neighbors = get_random_neighbors(configuration, i, 20)
+            self.assertEqual(len(neighbors), 20)
+            for neighbor in neighbors:
+                self.assertNotEqual(configuration, neighbor)
+                cs.check_configuration(neighbor)
+            self.assertEqual(get_random_neighbors(configuration, i, 20),
+                             neighbors)
+            self.assertEqual(get_random_neighbor(configuration, i),
+                             get_random_neighbors(configuration, i, 1)[0])
+
+        # Neighbors which violate a forbidden clause are drawn again
+        cs = ConfigurationSpace()
+        a = cs.add_hyperparameter(CategoricalHyperparameter('a', ['x', 'y']))
+        b = cs.add_hyperparameter(CategoricalHyperparameter('b', ['x', 'y']))
+        cs.add_forbidden_clause(ForbiddenAndConjunction(
+            ForbiddenEqualsClause(a, 'y'), ForbiddenEqualsClause(b, 'y')))
+        configuration = Configuration(cs, {'a': 'x', 'b': 'y'})
+        neighbors = get_random_neighbors(configuration, 1, 10)
+        self.assertEqual(neighbors,
+                         [Configuration(cs, {'a': 'x', 'b': 'x'})] * 10)
+
     def test_random_neigborhood_conditional(self):
         mini_autosklearn_config_space_path = os.path.join(
             os.path.dirname(__file__), 'test_searchspaces',
@@ -178,6 +214,183 @@ class UtilTest(unittest.TestCase):
             for new_config in neighborhood:
                 self.assertNotEqual(configuration, new_config)
 
+    def test_neighbourhood_generator(self):
+        mini_autosklearn_config_space_path = os.path.join(
+            os.path.dirname(__file__), 'test_searchspaces',
+            'mini_autosklearn_original.pcs')
+        with open(mini_autosklearn_config_space_path) as fh:
+            cs = read(fh)
+
+        cs.seed(1)
+        generator = NeighbourhoodGenerator(cs)
+        for i, configuration in enumerate(cs.sample_configuration(10)):
+            neighbourhood = list(generator.neighbours(
+                configuration, np.random.RandomState(i)))
+            self.assertEqual(
+                neighbourhood,
+                list(get_one_exchange_neighbourhood(configuration, i)))
+            np.testing.assert_array_equal(
+                generator.neighbourhood_array(configuration, i),
+                get_one_exchange_neighbourhood_array(configuration, i))
+
+        # Does not depend on the global random state
+        configuration = cs.sample_configuration()
+        np.random.seed(1)
+        neighbourhood = list(generator.neighbours(configuration, 1))
+        np.random.seed(2)
+        self.assertEqual(list(generator.neighbours(configuration, 1)),
+                         neighbourhood)
+
+        other_cs = ConfigurationSpace()
+        other_cs.add_hyperparameter(UniformFloatHyperparameter('a', 0, 1))
+        self.assertRaisesRegex(
+            ValueError, "Configuration belongs to a different configuration "
+                        "space.", generator.neighbours,
+            other_cs.get_default_configuration(), 1)
+
+    def test_neighbourhood_cache(self):
+        mini_autosklearn_config_space_path = os.path.join(
+            os.path.dirname(__file__), 'test_searchspaces',
+            'mini_autosklearn_original.pcs')
+        with open(mini_autosklearn_config_space_path) as fh:
+            cs = read(fh)
+
+        cs.seed(1)
+        configurations = [cs.sample_configuration() for _ in range(5)]
+        expected_arrays = [get_one_exchange_neighbourhood_array(c, i)
+                           for i, c in enumerate(configurations)]
+        expected = [list(get_one_exchange_neighbourhood(c, i))
+                    for i, c in enumerate(configurations)]
+        self.assertIsNone(get_neighbourhood_cache_info())
+
+        set_neighbourhood_cache_size(3)
+        self.addCleanup(set_neighbourhood_cache_size, 0)
+        for repetition in range(2):
+            for i, configuration in enumerate(configurations):
+                np.testing.assert_array_equal(
+                    get_one_exchange_neighbourhood_array(configuration, i),
+                    expected_arrays[i])
+                self.assertEqual(
+                    list(get_one_exchange_neighbourhood(configuration, i)),
+                    expected[i])
+        # The array is a miss and the generator a hit, also in the second
+        # round because only three of the five configurations fit into the
+        # cache
+        self.assertEqual(get_neighbourhood_cache_info(), (10, 10, 3, 3))
+
+        # Equal configuration spaces share entries
+        with open(mini_autosklearn_config_space_path) as fh:
+            cs2 = read(fh)
+        configuration = Configuration(
+            cs2, configurations[-1].get_dictionary())
+        np.testing.assert_array_equal(
+            get_one_exchange_neighbourhood_array(configuration, 4),
+            expected_arrays[-1])
+        self.assertEqual(get_neighbourhood_cache_info().hits, 11)
+
+        set_neighbourhood_cache_size(0)
+        self.assertIsNone(get_neighbourhood_cache_info())
+
+    def test_neighbourhood_forbidden(self):
+        cs = ConfigurationSpace()
+        a = cs.add_hyperparameter(CategoricalHyperparameter('a', ['x', 'y']))
+        b = cs.add_hyperparameter(CategoricalHyperparameter('b', ['u', 'v']))
+        c = cs.add_hyperparameter(UniformIntegerHyperparameter('c', 1, 5))
+        # Compiled into a lookup table
+        cs.add_forbidden_clause(ForbiddenAndConjunction(
+            ForbiddenEqualsClause(a, 'y'), ForbiddenEqualsClause(b, 'v')))
+        # Involves an integer and is checked neighbor by neighbor
+        cs.add_forbidden_clause(ForbiddenAndConjunction(
+            ForbiddenEqualsClause(a, 'y'), ForbiddenEqualsClause(c, 3)))
+        generator = NeighbourhoodGenerator(cs)
+
+        configuration = Configuration(cs, {'a': 'x', 'b': 'u', 'c': 3})
+        neighbors = generator.neighbourhood_array(configuration, 1)
+        names = [hp.name for hp in cs.get_hyperparameters()]
+        changed = [names[np.nonzero(neighbor != configuration.get_array())[0][0]]
+                   for neighbor in neighbors]
+        self.assertEqual(changed, ['b', 'c', 'c', 'c', 'c'])
+
+        configuration = Configuration(cs, {'a': 'x', 'b': 'v', 'c': 2})
+        neighbors = generator.neighbourhood_array(configuration, 1)
+        for neighbor in neighbors:
+            cs._check_forbidden(neighbor)
+            self.assertNotEqual(neighbor[0], 1)
+
+    def test_neighbourhood_arrays(self):
+        mini_autosklearn_config_space_path = os.path.join(
+            os.path.dirname(__file__), 'test_searchspaces',
+            'mini_autosklearn_original.pcs')
+        with open(mini_autosklearn_config_space_path) as fh:
+            cs = read(fh)
+
+        cs.seed(1)
+        generator = NeighbourhoodGenerator(cs)
+        configurations = [cs.sample_configuration() for _ in range(10)]
+        vectors = np.array([configuration.get_array()
+                            for configuration in configurations])
+
+        neighbors, owners = generator.neighbourhood_arrays(vectors, 1)
+        self.assertEqual(len(neighbors), len(owners))
+        np.testing.assert_array_equal(owners, np.sort(owners))
+        for neighbor, owner in zip(neighbors, owners):
+            new_configuration = Configuration(cs, vector=neighbor)
+            new_configuration.is_valid_configuration()
+            self.assertNotEqual(new_configuration, configurations[owner])
+
+        # With a single configuration, the same random numbers are drawn in
+        # the same order as for neighbourhood_array()
+        for i, configuration in enumerate(configurations):
+            neighbors, owners = generator.neighbourhood_arrays(
+                vectors[i:i + 1], i)
+            np.testing.assert_array_equal(
+                neighbors, generator.neighbourhood_array(configuration, i))
+            np.testing.assert_array_equal(owners, np.zeros(len(owners)))
+
+        self.assertRaisesRegex(
+            ValueError, "Expected a matrix with 11 columns, but got an array "
+                        "of shape \\(11,\\).", generator.neighbourhood_arrays,
+            vectors[0], 1)
+
+    def test_one_exchange_neighbourhood_array(self):
+        cs = ConfigurationSpace()
+        a = CategoricalHyperparameter('a', [0, 1, 2, 3])
+        b = UniformFloatHyperparameter('b', 0, 10)
+        c = OrdinalHyperparameter('c', ['low', 'medium', 'high'])
+        cs.add_hyperparameters([a, b, c])
+        cs.add_condition(EqualsCondition(b, a, 0))
+        cs.add_forbidden_clause(ForbiddenAndConjunction(
+            ForbiddenEqualsClause(a, 1), ForbiddenEqualsClause(c, 'low')))
+        configuration = cs.get_default_configuration()
+
+        neighbourhood = get_one_exchange_neighbourhood_array(configuration, 1)
+        # Grouped by hyperparameter index: two values of a, one value of c
+        # and four values of b
+        self.assertEqual(neighbourhood.shape, (7, 3))
+        neighbors = [Configuration(cs, vector=vector)
+                     for vector in neighbourhood]
+        for neighbor in neighbors:
+            neighbor.is_valid_configuration()
+            self.assertNotEqual(neighbor, configuration)
+        self.assertEqual([neighbor['a'] for neighbor in neighbors[:2]], [2, 3])
+        self.assertEqual([neighbor.get('b') for neighbor in neighbors[:2]],
+                         [None, None])
+        self.assertEqual(neighbors[2]['c'], 'medium')
+        self.assertEqual(len(set(neighbor['b'] for neighbor in neighbors[3:])),
+                         4)
+        np.testing.assert_array_equal(
+            get_one_exchange_neighbourhood_array(configuration, 1),
+            neighbourhood)
+
+        # Without the infinite neighbourhood of b, both generators agree
+        configuration = Configuration(cs, {'a': 3, 'c': 'high'})
+        neighbourhood = get_one_exchange_neighbourhood_array(configuration, 1)
+        self.assertEqual(neighbourhood.shape, (4, 3))
+        expected = {neighbor.get_array().tobytes() for neighbor
+                    in get_one_exchange_neighbourhood(configuration, 1)}
+        self.assertEqual({vector.tobytes() for vector in neighbourhood},
+                         expected)
+
     def test_deactivate_inactive_hyperparameters(self):
         diamond = ConfigurationSpace()
         head = CategoricalHyperparameter('head', [0, 1])
@@ -281,4 +494,41 @@ class UtilTest(unittest.TestCase):
         new_array = check_neighbouring_config_vector(config, array, neighbor_value, hp_name)
         expected_array = np.array([1, np.nan, np.nan, np.nan])
 
-        np.testing.assert_almost_equal(new_array, expected_array)
\ No newline at end of file
+        np.testing.assert_almost_equal(new_array, expected_array)
+
+    def test_check_neighbouring_config_vector_or_conjunction(self):
+        cs = ConfigurationSpace()
+        top = CategoricalHyperparameter('top', [0, 1])
+        left = CategoricalHyperparameter('left', [0, 1])
+        right = CategoricalHyperparameter('right', [0, 1])
+        bottom = UniformFloatHyperparameter('bottom', 0, 1)
+        cs.add_hyperparameters([top, left, right, bottom])
+        cs.add_condition(EqualsCondition(left, top, 0))
+        cs.add_condition(OrConjunction(EqualsCondition(bottom, left, 1),
+                                       EqualsCondition(bottom, right, 1)))
+
+        config = Configuration(cs, {'top': 0, 'left': 1, 'right': 1,
+                                    'bottom': 0.25})
+        # Deactivating left keeps bottom, which is still active through right
+        array = config.get_array().copy()
+        top_idx = cs.get_idx_by_hyperparameter_name('top')
+        array[top_idx] = 1
+        new_array = check_neighbouring_config_vector(config, array, 1, 'top')
+        new_config = Configuration(cs, vector=new_array)
+        new_config.is_valid_configuration()
+        self.assertEqual(new_config.get_dictionary(),
+                         {'top': 1, 'right': 1, 'bottom': 0.25})
+
+        # The batch form gives the same result for every row
+        arrays = np.tile(config.get_array(), (3, 1))
+        right_idx = cs.get_idx_by_hyperparameter_name('right')
+        arrays[:, right_idx] = [0, 1, 0]
+        arrays[2, cs.get_idx_by_hyperparameter_name('left')] = 0
+        expected = [check_neighbouring_config_vector(
+            config, array.copy(), None, 'right') for array in arrays]
+        new_arrays = check_neighbouring_config_vectors(config, arrays,
+                                                       'right')
+        np.testing.assert_array_equal(new_arrays, expected)
+        bottom_idx = cs.get_idx_by_hyperparameter_name('bottom')
+        self.assertEqual(new_arrays[0, bottom_idx], 0.25)
+        self.assertTrue(np.isnan(new_arrays[2, bottom_idx]))